@@ -72,10 +72,17 @@ login_manager.init_app(app)
 from utils.rate_limiter import init_limiter
 from utils.security_headers import add_security_headers
 from utils.sentry_config import init_sentry
+from utils.catalog_version import init_catalog_version
+from utils.catalog_cache import init_catalog_cache, get_catalog_snapshot
+from utils.cart_count import contador_carrito
+from utils.fragment_cache import init_fragment_cache
 
 limiter = init_limiter(app)
 add_security_headers(app)
 init_sentry(app)
+init_catalog_version(app)
+init_catalog_cache(app)
+init_fragment_cache(app)
 
 @login_manager.user_loader
 def load_user(user_id):
@@ -83,7 +90,7 @@ def load_user(user_id):
     return User.query.get(int(user_id))
 
 # Importar modelos
-from models.database_models import Game, Hardware, User
+from models.database_models import Game, User
 from models.compatibility import Compatibility
 
 # Importar controladores
@@ -122,12 +129,11 @@ if not app.debug:
 @app.route('/')
 def index():
     """Página principal de la tienda"""
-    juegos = Game.get_all_games()
-    hardware = Hardware.get_all_hardware()
+    catalogo = get_catalog_snapshot()
 
     # Obtener algunos productos destacados
-    juegos_destacados = juegos[:3]
-    hardware_destacado = hardware[:3]
+    juegos_destacados = catalogo.juegos[:3]
+    hardware_destacado = catalogo.hardware[:3]
 
     return render_template('index.html', 
                          juegos_destacados=juegos_destacados, 
@@ -160,11 +166,8 @@ def forbidden(error):
 @app.context_processor
 def inject_user():
     """Inyectar información del usuario en todos los templates"""
-    cart_count = 0
-    if current_user.is_authenticated:
-        from models.database_models import CartItem
-        cart_count = CartItem.query.filter_by(user_id=current_user.id).count()
-    return {"cart_count": cart_count}
+    # Guardado en la sesión: sin consulta en cada render
+    return {"cart_count": contador_carrito()}
 
 if __name__ == '__main__':
     # Inicializar la base de datos
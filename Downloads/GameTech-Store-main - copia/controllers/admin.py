@@ -1,11 +1,14 @@
 """
 Controlador del panel de administración
 """
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
 from flask_login import login_required, current_user
 from functools import wraps
 from database import db
 from models.database_models import User, Game, Hardware, Order, OrderItem
+from utils.catalog_version import get_catalog_version
+from utils.related_products import actualizar_relacionados
+from utils.result_cache import get_cache_stats
 from werkzeug.utils import secure_filename
 import os
 from datetime import datetime
@@ -42,6 +45,16 @@ def dashboard():
     }
     return render_template('admin/dashboard.html', stats=stats)
 
+@admin_bp.route('/admin/cache-stats')
+@login_required
+@admin_required
+def cache_stats():
+    """Estadísticas de aciertos/fallos de las cachés en memoria de este worker"""
+    return jsonify({
+        'catalog_version': get_catalog_version(),
+        'caches': get_cache_stats()
+    })
+
 @admin_bp.route('/admin/usuarios')
 @login_required
 @admin_required
@@ -100,8 +113,10 @@ def nuevo_juego():
                 stock=int(request.form['stock']),
                 imagen=imagen_path
             )
+            juego.actualizar_scores_requisitos()
             db.session.add(juego)
             db.session.commit()
+            actualizar_relacionados('game', juego.id)
             flash('Juego creado exitosamente', 'success')
             return redirect(url_for(ADMIN_JUEGOS))
         except Exception as e:
@@ -135,8 +150,10 @@ def editar_juego(game_id):
             game.requisitos_minimos = request.form['requisitos_minimos']
             game.requisitos_recomendados = request.form['requisitos_recomendados']
             game.stock = int(request.form['stock'])
+            game.actualizar_scores_requisitos()
             
             db.session.commit()
+            actualizar_relacionados('game', game.id)
             flash('Juego actualizado exitosamente', 'success')
             return redirect(url_for(ADMIN_JUEGOS))
         except Exception as e:
@@ -180,6 +197,7 @@ def nuevo_hardware():
             )
             db.session.add(hardware)
             db.session.commit()
+            actualizar_relacionados('hardware', hardware.id)
             flash('Componente creado exitosamente', 'success')
             return redirect(url_for(ADMIN_HARDWARE))
         except Exception as e:
@@ -213,6 +231,7 @@ def editar_hardware(hardware_id):
             component.stock = int(request.form['stock'])
             
             db.session.commit()
+            actualizar_relacionados('hardware', component.id)
             flash('Componente actualizado exitosamente', 'success')
             return redirect(url_for(ADMIN_HARDWARE))
         except Exception as e:
@@ -267,6 +286,7 @@ def eliminar_juego(game_id):
         
         db.session.delete(game)
         db.session.commit()
+        actualizar_relacionados('game', game_id)
         flash('Juego eliminado exitosamente', 'success')
     except Exception as e:
         flash(f'Error al eliminar juego: {str(e)}', 'danger')
@@ -288,6 +308,7 @@ def eliminar_hardware(hardware_id):
         
         db.session.delete(component)
         db.session.commit()
+        actualizar_relacionados('hardware', hardware_id)
         flash('Componente eliminado exitosamente', 'success')
     except Exception as e:
         flash(f'Error al eliminar componente: {str(e)}', 'danger')
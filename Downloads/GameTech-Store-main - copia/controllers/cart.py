@@ -5,8 +5,13 @@ Controlador del carrito de compras
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
 from flask_wtf.csrf import CSRFProtect
+from sqlalchemy.exc import OperationalError
 from database import db
-from models.database_models import CartItem, Game, Hardware, Order, OrderItem
+from models.database_models import CartItem, Order
+from utils.cart_count import contador_carrito, guardar_contador_carrito, invalidar_contador_carrito
+from utils.cart_view import CarritoVista
+from utils.checkout import StockInsuficiente, crear_orden
+from utils.product_loader import get_product_loader
 
 PRODUCTO_ELIMINADO = 'Producto eliminado del carrito'
 STOCK_INSUFICIENTE = 'Stock insuficiente'
@@ -18,12 +23,10 @@ cart_bp = Blueprint('cart', __name__)
 @login_required
 def ver_carrito():
     """Ver el carrito de compras"""
-    cart_items = CartItem.query.filter_by(user_id=current_user.id).all()
+    # Líneas, productos y total en un máximo de tres consultas
+    carrito = CarritoVista.de_usuario(current_user.id)
     
-    # Calcular total
-    total = sum(item.get_subtotal() for item in cart_items)
-    
-    return render_template('cart/carrito.html', cart_items=cart_items, total=total)
+    return render_template('cart/carrito.html', cart_items=carrito.lineas, total=carrito.total)
 
 @cart_bp.route('/carrito/agregar', methods=['POST'])
 @login_required
@@ -55,6 +58,7 @@ def agregar_al_carrito():
     try:
         message = actualizar_carrito(product_type, product_id, quantity)
         db.session.commit()
+        invalidar_contador_carrito()
         return responder_exito(message)
     except Exception as e:
         db.session.rollback()
@@ -69,11 +73,7 @@ def validar_tipo_producto(product_type):
 
 def obtener_producto(product_type, product_id):
     """Obtiene el producto desde la base de datos según su tipo."""
-    if product_type == 'game':
-        return Game.query.get(product_id)
-    elif product_type == 'hardware':
-        return Hardware.query.get(product_id)
-    return None
+    return get_product_loader().get(product_type, product_id)
 
 def actualizar_carrito(product_type, product_id, quantity):
     """Agrega o actualiza un producto en el carrito del usuario."""
@@ -106,8 +106,7 @@ def responder_error(mensaje, codigo_http):
 def responder_exito(mensaje):
     """Devuelve respuesta de éxito en JSON o HTML según el tipo de petición"""
     if request.is_json:
-        cart_count = CartItem.query.filter_by(user_id=current_user.id).count()
-        return jsonify({'success': True, 'message': mensaje, 'cart_count': cart_count})
+        return jsonify({'success': True, 'message': mensaje, 'cart_count': contador_carrito()})
     flash(mensaje, 'success')
     return redirect(request.referrer or url_for('index'))
 
@@ -126,6 +125,7 @@ def actualizar_cantidad(item_id):
     
     if quantity <= 0:
         db.session.delete(cart_item)
+        invalidar_contador_carrito()
         flash(PRODUCTO_ELIMINADO, 'info')
     else:
         # Verificar stock
@@ -154,12 +154,13 @@ def eliminar_del_carrito(item_id):
     
     db.session.delete(cart_item)
     db.session.commit()
+    invalidar_contador_carrito()
     
     if request.is_json:
         return jsonify({
             'success': True,
             'message': PRODUCTO_ELIMINADO,
-            'cart_count': CartItem.query.filter_by(user_id=current_user.id).count()
+            'cart_count': contador_carrito()
         })
     
     flash(PRODUCTO_ELIMINADO, 'success')
@@ -171,6 +172,7 @@ def vaciar_carrito():
     """Vaciar todo el carrito"""
     CartItem.query.filter_by(user_id=current_user.id).delete()
     db.session.commit()
+    guardar_contador_carrito(0)
     
     flash('Carrito vaciado', 'info')
     return redirect(url_for(VER_CARRITO))
@@ -179,60 +181,34 @@ def vaciar_carrito():
 @login_required
 def checkout():
     """Proceso de checkout"""
-    cart_items = CartItem.query.filter_by(user_id=current_user.id).all()
+    # La misma vista sirve para mostrar el resumen y para crear la orden
+    carrito = CarritoVista.de_usuario(current_user.id)
     
-    if not cart_items:
+    if not carrito:
         flash('Tu carrito está vacío', 'warning')
         return redirect(url_for(VER_CARRITO))
     
     if request.method == 'POST':
-        # Calcular total
-        total = sum(item.get_subtotal() for item in cart_items)
-        
-        # Crear orden
-        order = Order(
-            user_id=current_user.id,
-            total=total,
-            status='completed'
-        )
-        db.session.add(order)
-        db.session.flush()  # Para obtener el ID de la orden
-        
-        # Crear items de la orden y actualizar stock
-        for cart_item in cart_items:
-            product = cart_item.get_product()
-            
-            if not product or product.stock < cart_item.quantity:
-                db.session.rollback()
-                flash(f'Stock insuficiente para {product.nombre if hasattr(product, "nombre") else product.modelo}', 'danger')
-                return redirect(url_for(VER_CARRITO))
-            
-            # Crear item de orden
-            order_item = OrderItem(
-                order_id=order.id,
-                product_type=cart_item.product_type,
-                product_id=cart_item.product_id,
-                product_name=product.nombre if hasattr(product, 'nombre') else f"{product.marca} {product.modelo}",
-                quantity=cart_item.quantity,
-                price=product.precio
-            )
-            db.session.add(order_item)
-            
-            # Actualizar stock
-            product.stock -= cart_item.quantity
+        if carrito.huerfanos:
+            flash('Algunos productos de tu carrito ya no están disponibles', 'danger')
+            return redirect(url_for(VER_CARRITO))
         
-        # Vaciar carrito
-        CartItem.query.filter_by(user_id=current_user.id).delete()
-        
-        db.session.commit()
+        # Stock descontado con UPDATE condicionales: sin sobreventa con compras simultáneas
+        try:
+            order = crear_orden(current_user.id, carrito)
+        except StockInsuficiente as e:
+            flash(str(e), 'danger')
+            return redirect(url_for(VER_CARRITO))
+        except OperationalError:
+            # Base de datos ocupada (p. ej. bloqueo de SQLite agotado)
+            flash('No se pudo completar la compra, inténtalo de nuevo', 'danger')
+            return redirect(url_for(VER_CARRITO))
+        guardar_contador_carrito(0)
         
         flash(f'¡Compra realizada con éxito! Orden #{order.id}', 'success')
         return redirect(url_for('cart.orden_confirmada', order_id=order.id))
     
-    # Calcular total para mostrar
-    total = sum(item.get_subtotal() for item in cart_items)
-    
-    return render_template('cart/checkout.html', cart_items=cart_items, total=total)
+    return render_template('cart/checkout.html', cart_items=carrito.lineas, total=carrito.total)
 
 @cart_bp.route('/orden/<int:order_id>')
 @login_required
@@ -258,5 +234,5 @@ def mis_ordenes():
 @login_required
 def cart_count():
     """API para obtener la cantidad de items en el carrito"""
-    count = CartItem.query.filter_by(user_id=current_user.id).count()
+    count = guardar_contador_carrito(CartItem.query.filter_by(user_id=current_user.id).count())
     return jsonify({'count': count})
@@ -1,26 +1,31 @@
+import math
+
 from flask import Blueprint, render_template, request, jsonify
-from models.database_models import Hardware, Game
+from models.database_models import Hardware, Game, GameRequirements
+from utils.build_optimizer import BuildOptimizer, CALIDADES, MAX_TOP_K
+from utils.catalog_cache import get_catalog_snapshot
+from utils.catalog_version import get_catalog_version
+from utils.http_cache import condicional
+from utils.product_loader import get_product_loader
+from utils.product_payloads import CampoInvalido, campos_solicitados, serializar_productos, respuesta_json
 
 hardware_bp = Blueprint('hardware', __name__)
 
+# Campos de /api/hardware/buscar si no se pide ?fields=
+CAMPOS_BUSQUEDA = ('id', 'tipo', 'marca', 'modelo', 'precio', 'descripcion', 'imagen')
+
 @hardware_bp.route('/hardware')
 def lista_hardware():
     """Página que muestra todo el hardware disponible"""
-    hardware = Hardware.get_all_hardware()
-
-    # Organizar por categorías
-    categorias = {}
-    for componente in hardware:
-        if componente.tipo not in categorias:
-            categorias[componente.tipo] = []
-        categorias[componente.tipo].append(componente)
+    # Agrupado por categorías en la caché del catálogo
+    categorias = get_catalog_snapshot().hardware_por_tipo
 
     return render_template('hardware.html', categorias=categorias)
 
 @hardware_bp.route('/hardware/categoria/<categoria>')
 def hardware_por_categoria(categoria):
     """Página que muestra hardware por categoría específica"""
-    componentes = Hardware.get_hardware_by_tipo(categoria)
+    componentes = get_catalog_snapshot().hardware_de_tipo(categoria)
 
     if not componentes:
         return render_template('404.html'), 404
@@ -30,45 +35,45 @@ def hardware_por_categoria(categoria):
 @hardware_bp.route('/configurador-pc')
 def configurador_pc():
     """Página del configurador de PC interactivo"""
-    hardware = Hardware.get_all_hardware()
+    catalogo = get_catalog_snapshot()
 
     # Organizar por categorías para el configurador
     categorias = {
-        'CPU': [h for h in hardware if h.tipo == 'CPU'],
-        'GPU': [h for h in hardware if h.tipo == 'GPU'],
-        'RAM': [h for h in hardware if h.tipo == 'RAM'],
-        'Motherboard': [h for h in hardware if h.tipo == 'Motherboard']
+        tipo: catalogo.hardware_de_tipo(tipo)
+        for tipo in ('CPU', 'GPU', 'RAM', 'Motherboard')
     }
 
     return render_template('pc_builder.html', categorias=categorias)
 
 @hardware_bp.route('/api/hardware/tipos')
+@condicional(lambda: (('tipos', get_catalog_version()), None), publico=True)
 def api_tipos_hardware():
     """API para obtener tipos de hardware disponibles"""
-    hardware = Hardware.get_all_hardware()
-    tipos = {componente.tipo for componente in hardware}
+    return jsonify({'tipos': get_catalog_snapshot().tipos_hardware})
 
-    return jsonify({'tipos': sorted(tipos)})
+def _validador_busqueda():
+    """ETag de /api/hardware/buscar (con ?fields=...stock, también la última modificación de los resultados)"""
+    query = request.args.get('q', '')
+    fields = request.args.get('fields', '')
+    partes = ('buscar', query, fields, get_catalog_version())
+    # El sello del catálogo no cambia con el stock: si se expone, el validador depende de las filas
+    if 'stock' in (campo.strip() for campo in fields.split(',')):
+        modificado = max((c.updated_at for c in Hardware.buscar_hardware(query) if c.updated_at), default=None)
+        return partes + (modificado,), modificado
+    return partes, None
 
 @hardware_bp.route('/api/hardware/buscar')
+@condicional(lambda: _validador_busqueda(), publico=True)
 def api_buscar_hardware():
-    """API para buscar hardware"""
+    """API para buscar hardware (?fields=id,marca,modelo,... para limitar los campos)"""
+    try:
+        campos = campos_solicitados('hardware', CAMPOS_BUSQUEDA)
+    except CampoInvalido as e:
+        return jsonify({'error': str(e)}), 400
     query = request.args.get('q', '')
     resultados = Hardware.buscar_hardware(query)
 
-    hardware_data = []
-    for componente in resultados:
-        hardware_data.append({
-            'id': componente.id,
-            'tipo': componente.tipo,
-            'marca': componente.marca,
-            'modelo': componente.modelo,
-            'precio': componente.precio,
-            'descripcion': componente.descripcion,
-            'imagen': componente.imagen
-        })
-
-    return jsonify({'resultados': hardware_data})
+    return respuesta_json({'resultados': serializar_productos('hardware', resultados, campos)})
 
 @hardware_bp.route('/comparar-hardware', methods=['POST'])
 def comparar_hardware():
@@ -76,11 +81,7 @@ def comparar_hardware():
     data = request.get_json()
     componentes_ids = data.get('componentes', [])
 
-    componentes = []
-    for cid in componentes_ids:
-        componente = Hardware.get_hardware_by_id(cid)
-        if componente:
-            componentes.append(componente)
+    componentes = get_product_loader().get_many('hardware', componentes_ids)
 
     if not componentes:
         return jsonify({'error': 'No se encontraron componentes para comparar'}), 400
@@ -116,3 +117,58 @@ def comparar_hardware():
             comparacion['caracteristicas'][caracteristica][componente.id] = valor
 
     return jsonify(comparacion)
+
+@hardware_bp.route('/api/optimizar-build', methods=['POST'])
+def optimizar_build():
+    """API que propone los mejores builds para un presupuesto (y opcionalmente un juego)"""
+    data = request.get_json(silent=True) or {}
+
+    try:
+        presupuesto = float(data.get('presupuesto', 0))
+        top_k = min(max(int(data.get('top_k', 5)), 1), MAX_TOP_K)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Presupuesto o top_k inválidos'}), 400
+
+    # float() acepta "nan" e "inf": sin esta comprobación se ignoraría el presupuesto
+    if not math.isfinite(presupuesto) or presupuesto <= 0:
+        return jsonify({'error': 'El presupuesto debe ser un número mayor que 0'}), 400
+
+    umbrales = None
+    game_id = data.get('game_id')
+    calidad = data.get('calidad', 'high')
+    if game_id:
+        if calidad not in CALIDADES:
+            return jsonify({'error': f'Calidad inválida. Opciones: {", ".join(CALIDADES)}'}), 400
+
+        requisitos = GameRequirements.get_by_game_id(game_id)
+        if not requisitos:
+            return jsonify({'error': 'El juego no tiene requisitos de rendimiento registrados'}), 404
+        umbrales = BuildOptimizer.umbrales(requisitos, calidad)
+
+    builds = BuildOptimizer.optimize(presupuesto, top_k=top_k, umbrales=umbrales)
+
+    def pieza_data(pieza):
+        return {
+            'id': pieza.id,
+            'marca': pieza.marca,
+            'modelo': pieza.modelo,
+            'precio': pieza.precio
+        }
+
+    return jsonify({
+        'success': True,
+        'presupuesto': presupuesto,
+        'game_id': game_id,
+        'calidad': calidad if game_id else None,
+        'builds': [
+            {
+                'cpu': pieza_data(build['cpu']),
+                'gpu': pieza_data(build['gpu']),
+                'ram': pieza_data(build['ram']),
+                'motherboard': pieza_data(build['motherboard']),
+                'precio_total': build['precio'],
+                'system_score': int(build['rendimiento'])
+            }
+            for build in builds
+        ]
+    })
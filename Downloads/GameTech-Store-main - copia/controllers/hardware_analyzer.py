@@ -2,20 +2,38 @@
 Controlador para el analizador de hardware
 Permite a los usuarios analizar su configuración y ver compatibilidad con juegos
 """
-from flask import Blueprint, render_template, request, jsonify
-from models.database_models import Hardware, Game, GameRequirements
+from flask import Blueprint, render_template, request, jsonify, current_app, stream_with_context
+from sqlalchemy.exc import SQLAlchemyError
+from extensions import db
+from models.database_models import Hardware, AnalyzerResult
 from utils.bottleneck_detector import BottleneckDetector
+from utils.bottleneck_matrix import get_bottleneck_matrix
+from utils.catalog_cache import get_catalog_snapshot
+from utils.catalog_version import get_catalog_version
 from utils.performance_calculator import PerformanceCalculator
+from utils.requirements_snapshot import get_requirements_snapshot
+from utils.result_cache import ResultCache
+from utils.upgrade_planner import UpgradePlanner, MAX_OPCIONES
 
 analyzer_bp = Blueprint('analyzer', __name__)
 
+# Respuestas serializadas por (cpu_id, gpu_id, ram_id, catalog_version)
+analyzer_cache = ResultCache('analizador', maxsize=2048, ttl=3600)
+
+# Se desactiva si la tabla analyzer_results no existe (sin warm-up)
+_precalculados = {'disponible': True}
+
+# Juegos por línea en la respuesta NDJSON de /api/analizar-hardware/stream
+STREAM_CHUNK_SIZE = 100
+
 @analyzer_bp.route('/analizador-hardware')
 def hardware_analyzer_page():
     """Página principal del analizador de hardware"""
     # Cargar componentes para los selectores
-    cpus = Hardware.get_hardware_by_tipo('CPU')
-    gpus = Hardware.get_hardware_by_tipo('GPU')
-    rams = Hardware.get_hardware_by_tipo('RAM')
+    catalogo = get_catalog_snapshot()
+    cpus = catalogo.hardware_de_tipo('CPU')
+    gpus = catalogo.hardware_de_tipo('GPU')
+    rams = catalogo.hardware_de_tipo('RAM')
     
     return render_template('hardware_checker.html',
                          cpus=cpus,
@@ -36,36 +54,154 @@ def analyze_hardware():
         if not all([cpu_id, gpu_id, ram_id]):
             return jsonify({'error': 'Faltan componentes'}), 400
         
-        # Obtener componentes
-        cpu = Hardware.get_hardware_by_id(cpu_id)
-        gpu = Hardware.get_hardware_by_id(gpu_id)
-        ram = Hardware.get_hardware_by_id(ram_id)
-        
-        if not all([cpu, gpu, ram]):
+        try:
+            cache_key = (int(cpu_id), int(gpu_id), int(ram_id), get_catalog_version())
+        except (TypeError, ValueError):
             return jsonify({'error': 'Componentes no encontrados'}), 404
         
-        # 1. Calcular puntuación del sistema
-        system_score = calculate_system_score(cpu, gpu, ram)
+        # El análisis es función pura de los tres ids y del catálogo
+        payload = analyzer_cache.get(cache_key) or _get_precalculado(cache_key)
+        if payload is None:
+            # Obtener componentes
+            cpu = Hardware.get_hardware_by_id(cache_key[0])
+            gpu = Hardware.get_hardware_by_id(cache_key[1])
+            ram = Hardware.get_hardware_by_id(cache_key[2])
+            
+            if not all([cpu, gpu, ram]):
+                return jsonify({'error': 'Componentes no encontrados'}), 404
+            
+            payload = current_app.json.dumps(build_analysis(cpu, gpu, ram))
+        analyzer_cache.set(cache_key, payload)
         
-        # 2. Detectar cuellos de botella
+        return current_app.response_class(payload, mimetype='application/json')
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@analyzer_bp.route('/api/analizar-hardware/stream', methods=['POST'])
+def analyze_hardware_stream():
+    """
+    Variante en streaming (NDJSON) del análisis: primero una línea con la
+    puntuación, cuellos de botella y recomendaciones; después los juegos por
+    bloques a medida que se calculan, y una línea final con el total.
+    """
+    data = request.get_json(silent=True) or {}
+    
+    cpu_id = data.get('cpu_id')
+    gpu_id = data.get('gpu_id')
+    ram_id = data.get('ram_id')
+    
+    if not all([cpu_id, gpu_id, ram_id]):
+        return jsonify({'error': 'Faltan componentes'}), 400
+    
+    cpu = Hardware.get_hardware_by_id(cpu_id)
+    gpu = Hardware.get_hardware_by_id(gpu_id)
+    ram = Hardware.get_hardware_by_id(ram_id)
+    
+    if not all([cpu, gpu, ram]):
+        return jsonify({'error': 'Componentes no encontrados'}), 404
+    
+    def lineas():
+        dumps = current_app.json.dumps
+        system_score = calculate_system_score(cpu, gpu, ram)
         bottlenecks = BottleneckDetector.detect(cpu, gpu, ram)
-        
-        # 3. Analizar compatibilidad con juegos
-        games_analysis = analyze_game_compatibility(cpu, gpu, ram)
-        
-        # 4. Generar recomendaciones
-        recommendations = generate_recommendations(bottlenecks, system_score)
-        
-        return jsonify({
+        yield dumps({
+            'type': 'summary',
             'success': True,
             'system_score': system_score,
             'bottlenecks': bottlenecks,
-            'games': games_analysis,
-            'recommendations': recommendations
-        })
+            'recommendations': generate_recommendations(bottlenecks, system_score)
+        }) + '\n'
+        
+        total = 0
+        for games in iter_game_compatibility(cpu, gpu, ram, STREAM_CHUNK_SIZE):
+            total += sum(len(lista) for lista in games.values())
+            yield dumps({'type': 'games', 'games': games}) + '\n'
+        yield dumps({'type': 'end', 'total_games': total}) + '\n'
     
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    response = current_app.response_class(stream_with_context(lineas()), mimetype='application/x-ndjson')
+    # Evitar que proxies intermedios acumulen la respuesta completa
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@analyzer_bp.route('/api/planificar-mejora', methods=['POST'])
+def plan_upgrade():
+    """API que propone el cambio de 1 o 2 componentes que más juegos mejora"""
+    data = request.get_json(silent=True) or {}
+    
+    cpu_id = data.get('cpu_id')
+    gpu_id = data.get('gpu_id')
+    ram_id = data.get('ram_id')
+    
+    if not all([cpu_id, gpu_id, ram_id]):
+        return jsonify({'error': 'Faltan componentes'}), 400
+    
+    try:
+        limite = min(max(int(data.get('limite', 5)), 1), MAX_OPCIONES)
+        game_ids = [int(game_id) for game_id in data.get('game_ids') or []]
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Parámetros inválidos'}), 400
+    
+    cpu = Hardware.get_hardware_by_id(cpu_id)
+    gpu = Hardware.get_hardware_by_id(gpu_id)
+    ram = Hardware.get_hardware_by_id(ram_id)
+    
+    if not all([cpu, gpu, ram]):
+        return jsonify({'error': 'Componentes no encontrados'}), 404
+    
+    plan = UpgradePlanner.plan(cpu, gpu, ram, game_ids=game_ids, limite=limite)
+    return jsonify({'success': True, **plan})
+
+@analyzer_bp.route('/api/cuellos-botella/cpu/<int:cpu_id>')
+def bottleneck_row(cpu_id):
+    """Cuello de botella de una CPU con cada GPU del catálogo"""
+    fila = get_bottleneck_matrix().fila(cpu_id)
+    if fila is None:
+        return jsonify({'error': 'CPU no encontrada'}), 404
+    return jsonify({'cpu_id': cpu_id, **fila})
+
+@analyzer_bp.route('/api/cuellos-botella/gpu/<int:gpu_id>')
+def bottleneck_column(gpu_id):
+    """Cuello de botella de una GPU con cada CPU del catálogo"""
+    columna = get_bottleneck_matrix().columna(gpu_id)
+    if columna is None:
+        return jsonify({'error': 'GPU no encontrada'}), 404
+    return jsonify({'gpu_id': gpu_id, **columna})
+
+def _get_precalculado(cache_key):
+    """Buscar la respuesta generada por scripts/warm_analyzer_cache.py"""
+    if not _precalculados['disponible']:
+        return None
+    try:
+        return AnalyzerResult.get_payload(*cache_key)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        _precalculados['disponible'] = False
+        current_app.logger.warning(f'Resultados precalculados del analizador no disponibles: {e}')
+        return None
+
+def build_analysis(cpu, gpu, ram):
+    """Construir la respuesta completa del analizador para tres componentes"""
+    # 1. Calcular puntuación del sistema
+    system_score = calculate_system_score(cpu, gpu, ram)
+    
+    # 2. Detectar cuellos de botella
+    bottlenecks = BottleneckDetector.detect(cpu, gpu, ram)
+    
+    # 3. Analizar compatibilidad con juegos
+    games_analysis = analyze_game_compatibility(cpu, gpu, ram)
+    
+    # 4. Generar recomendaciones
+    recommendations = generate_recommendations(bottlenecks, system_score)
+    
+    return {
+        'success': True,
+        'system_score': system_score,
+        'bottlenecks': bottlenecks,
+        'games': games_analysis,
+        'recommendations': recommendations
+    }
 
 def calculate_system_score(cpu, gpu, ram):
     """Calcular puntuación general del sistema"""
@@ -106,46 +242,76 @@ def get_performance_tier(score):
 
 def analyze_game_compatibility(cpu, gpu, ram):
     """Analizar qué juegos puede correr el usuario"""
-    games = Game.get_all_games()
+    results = _resultados_vacios()
+    for games in iter_game_compatibility(cpu, gpu, ram):
+        for categoria, lista in games.items():
+            results[categoria].extend(lista)
+    return results
+
+def iter_game_compatibility(cpu, gpu, ram, chunk_size=None):
+    """
+    Clasificar los juegos por calidad en bloques de chunk_size juegos
+    (un único bloque si es None). Cada bloque tiene la forma de
+    analyze_game_compatibility con solo los juegos de ese bloque.
+    """
+    # Juegos con requisitos cargados de una sola vez (sin consulta por juego)
+    snapshot = get_requirements_snapshot()
+    total = len(snapshot)
+    # Sin juegos con requisitos (p. ej. base recién poblada) no hay bloques
+    chunk_size = chunk_size or max(total, 1)
     
-    results = {
+    for inicio in range(0, total, chunk_size):
+        fin = inicio + chunk_size
+        arrays = {campo: valores[inicio:fin] for campo, valores in snapshot.arrays.items()}
+        yield _clasificar_juegos(cpu, gpu, ram, snapshot.filas[inicio:fin], arrays)
+
+def _resultados_vacios():
+    return {
         'can_run_ultra': [],
         'can_run_high': [],
         'can_run_medium': [],
         'can_run_low': [],
         'cannot_run': []
     }
+
+def _clasificar_juegos(cpu, gpu, ram, filas, arrays):
+    """Clasificar un bloque de juegos de la instantánea de requisitos"""
+    results = _resultados_vacios()
     
-    for game in games:
-        requirements = GameRequirements.get_by_game_id(game.id)
-        
-        if not requirements:
-            continue  # Skip juegos sin requisitos
-        
-        # Calcular rendimiento
-        performance = PerformanceCalculator.calculate_game_performance(
-            cpu, gpu, ram, requirements
-        )
-        
+    # Calidad, FPS y componente limitante de todos los juegos en una pasada
+    batch = PerformanceCalculator.calculate_batch(cpu, gpu, ram, arrays)
+    cpu_score, gpu_score, ram_gb = PerformanceCalculator.component_scores(cpu, gpu, ram)
+    
+    columnas = zip(
+        filas,
+        batch['can_run'].tolist(),
+        batch['quality'].tolist(),
+        batch['fps_estimate'].tolist(),
+        batch['bottleneck'].tolist()
+    )
+    for game, can_run, quality, fps, bottleneck in columnas:
         game_data = {
-            'id': game.id,
+            'id': game.game_id,
             'nombre': game.nombre,
             'imagen': game.imagen,
             'precio': game.precio,
-            'expected_fps': performance['fps_estimate'],
-            'quality': performance['quality'],
-            'bottleneck': performance['bottleneck'],
-            'reason': performance.get('reason', '')
+            'expected_fps': fps,
+            'quality': quality,
+            'bottleneck': bottleneck,
+            # La razón en texto solo se construye para los juegos que no corren
+            'reason': '' if can_run else PerformanceCalculator._get_failure_reason(
+                cpu_score, gpu_score, ram_gb, game
+            )
         }
         
         # Clasificar por calidad
-        if not performance['can_run']:
+        if not can_run:
             results['cannot_run'].append(game_data)
-        elif performance['quality'] == 'ultra':
+        elif quality == 'ultra':
             results['can_run_ultra'].append(game_data)
-        elif performance['quality'] == 'high':
+        elif quality == 'high':
             results['can_run_high'].append(game_data)
-        elif performance['quality'] == 'medium':
+        elif quality == 'medium':
             results['can_run_medium'].append(game_data)
         else:  # low
             results['can_run_low'].append(game_data)
@@ -1,83 +1,208 @@
-from flask import Blueprint, render_template, request, jsonify
+from flask import Blueprint, render_template, request, jsonify, url_for
 from models.database_models import Game, Hardware
-from models.compatibility import Compatibility
+from models.compatibility import Compatibility, NIVELES_EXPLICACION
+from utils.catalog_cache import get_catalog_snapshot
+from utils.catalog_version import get_catalog_version
+from utils.http_cache import condicional, partes_de_usuario
+from utils.facet_index import get_facet_index, aplicar_filtros, parametros_facetas
+from utils.keyset_pagination import paginar, ORDENES_JUEGOS, ORDENES_HARDWARE
+from utils.product_loader import get_product_loader
+from utils.product_payloads import CampoInvalido, campos_solicitados, serializar_productos, respuesta_json
+from utils.related_products import productos_relacionados
+from utils.result_cache import ResultCache
+from utils.suggest_index import get_suggest_index, MAX_SUGERENCIAS
 
 store_bp = Blueprint('store', __name__)
 
+# Resultados de /verificar-setup-completo por selección y versión del catálogo
+setup_cache = ResultCache('verificar_setup', maxsize=512, ttl=600)
+
+# Campos de /api/tienda/hardware si no se pide ?fields= (los que usan los selects)
+CAMPOS_HARDWARE_PAGINADO = ('id', 'tipo', 'marca', 'modelo', 'precio', 'capacidad')
+
+def _ids_normalizados(valores):
+    """Ids enteros, únicos y ordenados (los valores inválidos se ignoran)"""
+    ids = set()
+    for valor in valores or []:
+        try:
+            ids.add(int(valor))
+        except (TypeError, ValueError):
+            continue
+    return tuple(sorted(ids))
+
+def _seleccion_facetas(catalogo):
+    """Valores seleccionados de cada faceta en la URL (?genero=RPG&genero=FPS)"""
+    seleccion = {}
+    for parametro in parametros_facetas(catalogo):
+        valores = [v for v in request.args.getlist(parametro) if v]
+        if valores:
+            seleccion[parametro] = list(dict.fromkeys(valores))
+    return seleccion
+
+def _urls_facetas(conteos):
+    """Añadir a cada valor la URL que lo activa o desactiva (volviendo a la página 1)"""
+    for parametro, valores in conteos['facetas'].items():
+        for valor in valores:
+            args = request.args.to_dict(flat=False)
+            for cursor in ('page', 'cursor', 'hw_cursor'):
+                args.pop(cursor, None)
+            if parametro == 'genero':
+                args.pop('categoria', None)
+            actuales = [v for v in args.get(parametro, []) if v]
+            if valor['activo']:
+                actuales = [v for v in actuales if v != valor['valor']]
+            else:
+                actuales.append(valor['valor'])
+            args[parametro] = actuales
+            valor['url'] = url_for('store.tienda', **args)
+    return conteos
+
+def _enlazar(pagina, parametro):
+    """URLs de la página anterior y siguiente conservando el resto de la URL"""
+    for atributo, cursor in (('url_siguiente', pagina.siguiente), ('url_anterior', pagina.anterior)):
+        url = None
+        if cursor is not None:
+            args = request.args.to_dict(flat=False)
+            args.pop('page', None)
+            args[parametro] = cursor
+            url = url_for('store.tienda', **args)
+        setattr(pagina, atributo, url)
+    return pagina
+
 @store_bp.route('/tienda')
 def tienda():
-    """Página principal de la tienda con paginación"""
-    # Obtener parámetros de paginación
-    page = request.args.get('page', 1, type=int)
+    """Página principal de la tienda con paginación por clave y navegación por facetas"""
+    # Obtener parámetros de paginación (cursores opacos, sin OFFSET)
+    cursor = request.args.get('cursor')
     per_page = request.args.get('per_page', 12, type=int)
+    hw_cursor = request.args.get('hw_cursor')
+    hw_per_page = request.args.get('hw_per_page', 12, type=int)
     
     # Obtener filtros
     categoria = request.args.get('categoria', '')
     precio_min = request.args.get('precio_min', type=float)
     precio_max = request.args.get('precio_max', type=float)
     ordenar = request.args.get('ordenar', 'nombre')
+    if ordenar not in ORDENES_JUEGOS:
+        ordenar = 'nombre'
+
+    seleccion_juegos = _seleccion_facetas('juegos')
+    if categoria and 'genero' not in seleccion_juegos:
+        # ?categoria= es el filtro de género anterior a las facetas
+        seleccion_juegos['genero'] = [categoria]
+    seleccion_hardware = _seleccion_facetas('hardware')
+
+    # Conteos por faceta a partir de los bitmaps en memoria; su total es
+    # también el total de resultados (sin COUNT(*) por página)
+    indice = get_facet_index()
+    facetas_juegos = _urls_facetas(
+        indice.contar('juegos', seleccion_juegos, precio_min or None, precio_max or None)
+    )
+    facetas_hardware = _urls_facetas(indice.contar('hardware', seleccion_hardware))
     
     # Query de juegos
-    juegos_query = Game.query
+    juegos_query = aplicar_filtros(Game.query, 'juegos', seleccion_juegos)
     
     # Aplicar filtros
-    if categoria:
-        juegos_query = juegos_query.filter_by(genero=categoria)
     if precio_min:
         juegos_query = juegos_query.filter(Game.precio >= precio_min)
     if precio_max:
         juegos_query = juegos_query.filter(Game.precio <= precio_max)
     
-    # Aplicar ordenamiento
-    if ordenar == 'precio_asc':
-        juegos_query = juegos_query.order_by(Game.precio.asc())
-    elif ordenar == 'precio_desc':
-        juegos_query = juegos_query.order_by(Game.precio.desc())
-    elif ordenar == 'nombre':
-        juegos_query = juegos_query.order_by(Game.nombre.asc())
+    # Paginar por (columna de orden, id)
+    columna, descendente = ORDENES_JUEGOS[ordenar]
+    juegos_paginados = _enlazar(paginar(
+        juegos_query, Game, columna, descendente, cursor, per_page, facetas_juegos['total']
+    ), 'cursor')
     
-    # Paginar
-    juegos_paginados = juegos_query.paginate(page=page, per_page=per_page, error_out=False)
-    
-    # Hardware (sin paginación por ahora)
-    hardware = Hardware.get_all_hardware()
+    # Hardware paginado de la misma forma
+    columna, descendente = ORDENES_HARDWARE['tipo']
+    hardware_paginado = _enlazar(paginar(
+        aplicar_filtros(Hardware.query, 'hardware', seleccion_hardware),
+        Hardware, columna, descendente, hw_cursor, hw_per_page, facetas_hardware['total']
+    ), 'hw_cursor')
     
     return render_template('store.html', 
                          juegos=juegos_paginados.items,
                          pagination=juegos_paginados,
-                         hardware=hardware,
+                         hardware=hardware_paginado.items,
+                         hardware_pagination=hardware_paginado,
+                         facetas_juegos=facetas_juegos,
+                         facetas_hardware=facetas_hardware,
                          categoria=categoria,
                          precio_min=precio_min,
                          precio_max=precio_max,
                          ordenar=ordenar)
 
+@store_bp.route('/api/tienda/hardware')
+def api_hardware_paginado():
+    """Hardware paginado por clave (?tipo=CPU&cursor=...) para cargar bajo demanda"""
+    try:
+        campos = campos_solicitados('hardware', CAMPOS_HARDWARE_PAGINADO)
+    except CampoInvalido as e:
+        return jsonify({'error': str(e)}), 400
+    columna, descendente = ORDENES_HARDWARE['tipo']
+    pagina = paginar(
+        aplicar_filtros(Hardware.query, 'hardware', _seleccion_facetas('hardware')),
+        Hardware, columna, descendente,
+        request.args.get('cursor'), request.args.get('per_page', 50, type=int)
+    )
+    return respuesta_json({
+        'hardware': serializar_productos('hardware', pagina.items, campos),
+        'siguiente': pagina.siguiente
+    })
+
+@store_bp.route('/api/tienda/facetas')
+def api_facetas():
+    """Conteos de facetas de juegos y hardware para los filtros de la URL"""
+    indice = get_facet_index()
+    precio_min = request.args.get('precio_min', type=float)
+    precio_max = request.args.get('precio_max', type=float)
+    return jsonify({
+        'juegos': indice.contar('juegos', _seleccion_facetas('juegos'), precio_min or None, precio_max or None),
+        'hardware': indice.contar('hardware', _seleccion_facetas('hardware'))
+    })
+
+def _validador_producto(tipo, producto):
+    """ETag de una página de detalle: producto, catálogo (relacionados) y usuario"""
+    if producto is None:
+        return None
+    partes = (tipo, producto.id, producto.updated_at, get_catalog_version(), partes_de_usuario())
+    return partes, producto.updated_at
+
 @store_bp.route('/juego/<int:juego_id>')
+@condicional(lambda juego_id: _validador_producto('juego', get_catalog_snapshot().juego(juego_id)))
 def juego_detalle(juego_id):
     """Página de detalle de un juego específico"""
-    juego = Game.get_game_by_id(juego_id)
+    juego = get_catalog_snapshot().juego(juego_id)
     if not juego:
         return render_template('404.html'), 404
 
-    # Obtener juegos relacionados (mismo género)
-    juegos_relacionados = [j for j in Game.get_all_games() if j.genero == juego.genero and j.id != juego.id][:3]
+    # Juegos relacionados precalculados (mismo género y precio parecido)
+    juegos_relacionados = productos_relacionados('game', juego)
 
     return render_template('game_detail.html', juego=juego, juegos_relacionados=juegos_relacionados)
 
 @store_bp.route('/hardware/<int:hardware_id>')
+@condicional(lambda hardware_id: _validador_producto('hardware', get_catalog_snapshot().componente(hardware_id)))
 def hardware_detalle(hardware_id):
     """Página de detalle de un componente de hardware"""
-    componente = Hardware.get_hardware_by_id(hardware_id)
+    componente = get_catalog_snapshot().componente(hardware_id)
     if not componente:
         return render_template('404.html'), 404
 
-    # Obtener hardware relacionado (mismo tipo)
-    hardware_relacionado = [h for h in Hardware.get_all_hardware() if h.tipo == componente.tipo and h.id != componente.id][:3]
+    # Hardware relacionado precalculado (mismo tipo, precio y rendimiento parecidos)
+    hardware_relacionado = productos_relacionados('hardware', componente)
 
     return render_template('hardware_detail.html', componente=componente, hardware_relacionado=hardware_relacionado)
 
 @store_bp.route('/consultar-compatibilidad', methods=['POST'])
 def consultar_compatibilidad():
-    """Consultar compatibilidad de juegos con hardware específico"""
+    """Consultar compatibilidad de juegos con hardware específico (?fields=id,nombre,...)"""
+    try:
+        campos = campos_solicitados('game')
+    except CampoInvalido as e:
+        return jsonify({'error': str(e)}), 400
     data = request.get_json()
 
     # Obtener especificaciones del hardware del usuario
@@ -91,13 +216,11 @@ def consultar_compatibilidad():
     # Obtener juegos compatibles
     juegos_compatibles = Game.get_games_by_hardware(hardware_usuario)
 
-    # Crear lista de juegos para enviar al frontend
-    juegos_data = [juego.to_dict() for juego in juegos_compatibles]
-
-    return jsonify({
+    # Fragmentos precodificados de cada juego
+    return respuesta_json({
         'success': True,
-        'juegos': juegos_data,
-        'total': len(juegos_data)
+        'juegos': serializar_productos('game', juegos_compatibles, campos),
+        'total': len(juegos_compatibles)
     })
 
 @store_bp.route('/verificar-setup-completo', methods=['POST'])
@@ -105,27 +228,45 @@ def verificar_setup_completo():
     """Verificar compatibilidad de un setup completo con juegos seleccionados"""
     data = request.get_json()
 
-    juegos_seleccionados_ids = data.get('juegos', [])
-    componentes_seleccionados_ids = data.get('componentes', [])
+    juegos_seleccionados_ids = _ids_normalizados(data.get('juegos', []))
+    componentes_seleccionados_ids = _ids_normalizados(data.get('componentes', []))
+    # 'todos', 'incompatibles' o 'ninguno' para las razones en texto
+    explicar = data.get('detalle', 'todos')
+    if not isinstance(explicar, str) or explicar not in NIVELES_EXPLICACION:
+        return jsonify({'error': f"'detalle' debe ser uno de: {', '.join(NIVELES_EXPLICACION)}"}), 400
 
-    # Obtener objetos de juegos y componentes
-    juegos = [Game.get_game_by_id(jid) for jid in juegos_seleccionados_ids if Game.get_game_by_id(jid)]
-    componentes = [Hardware.get_hardware_by_id(cid) for cid in componentes_seleccionados_ids if Hardware.get_hardware_by_id(cid)]
+    # Las mismas selecciones se repiten mucho en el configurador
+    cache_key = (juegos_seleccionados_ids, componentes_seleccionados_ids, explicar, get_catalog_version())
+    respuesta = setup_cache.get(cache_key)
+    if respuesta is None:
+        respuesta = _calcular_setup(juegos_seleccionados_ids, componentes_seleccionados_ids, explicar)
+        setup_cache.set(cache_key, respuesta)
+
+    return jsonify(respuesta)
+
+def _calcular_setup(juegos_seleccionados_ids, componentes_seleccionados_ids, explicar):
+    """Construir la respuesta de /verificar-setup-completo"""
+    # Obtener objetos de juegos y componentes (una consulta por tipo)
+    loader = get_product_loader()
+    loader.prime_many(('game', jid) for jid in juegos_seleccionados_ids)
+    loader.prime_many(('hardware', cid) for cid in componentes_seleccionados_ids)
+    juegos = loader.get_many('game', juegos_seleccionados_ids)
+    componentes = loader.get_many('hardware', componentes_seleccionados_ids)
 
     # Verificar compatibilidad
-    resultado = Compatibility.verificar_compatibility_completa(juegos, componentes)
+    resultado = Compatibility.verificar_compatibility_completa(juegos, componentes, explicar=explicar)
 
     # Calcular precio total
     precio_total = sum(componente.precio for componente in componentes) + sum(juego.precio for juego in juegos)
 
-    return jsonify({
+    return {
         'success': True,
         'compatible': resultado['compatible'],
         'detalles': resultado['detalles'],
         'precio_total': precio_total,
         'componentes_count': len(componentes),
         'juegos_count': len(juegos)
-    })
+    }
 
 @store_bp.route('/buscar')
 def buscar():
@@ -147,3 +288,18 @@ def buscar():
     }
 
     return render_template('search.html', resultados=resultados, query=query)
+
+@store_bp.route('/api/suggest')
+def suggest():
+    """Autocompletado de juegos y hardware (índice en memoria, sin consultar la base de datos)"""
+    consulta = request.args.get('q', '')
+    limite = min(max(request.args.get('limit', MAX_SUGERENCIAS, type=int), 1), MAX_SUGERENCIAS)
+
+    sugerencias = get_suggest_index().sugerir(consulta, limite)
+
+    return jsonify({
+        'sugerencias': [
+            {'tipo': s.tipo, 'id': s.id, 'label': s.label, 'url': s.url}
+            for s in sugerencias
+        ]
+    })
@@ -4,7 +4,8 @@ Controlador de Wishlist (Lista de Deseos)
 from flask import Blueprint, render_template, request, jsonify, redirect, url_for
 from flask_login import login_required, current_user
 from extensions import db
-from models.database_models import Wishlist, Game, Hardware
+from models.database_models import Wishlist
+from utils.product_loader import get_product_loader
 
 wishlist_bp = Blueprint('wishlist', __name__, url_prefix='/wishlist')
 
@@ -14,27 +15,20 @@ def index():
     """Página de wishlist del usuario"""
     wishlist_items = Wishlist.get_user_wishlist(current_user.id)
     
-    # Obtener detalles de los productos
+    # Obtener detalles de los productos (una consulta por tipo)
+    loader = get_product_loader()
+    loader.prime_many((item.product_type, item.product_id) for item in wishlist_items)
+    
     products = []
     for item in wishlist_items:
-        if item.product_type == 'game':
-            product = Game.query.get(item.product_id)
-            if product:
-                products.append({
-                    'wishlist_id': item.id,
-                    'type': 'game',
-                    'product': product,
-                    'added_at': item.created_at
-                })
-        elif item.product_type == 'hardware':
-            product = Hardware.query.get(item.product_id)
-            if product:
-                products.append({
-                    'wishlist_id': item.id,
-                    'type': 'hardware',
-                    'product': product,
-                    'added_at': item.created_at
-                })
+        product = loader.get(item.product_type, item.product_id)
+        if product:
+            products.append({
+                'wishlist_id': item.id,
+                'type': item.product_type,
+                'product': product,
+                'added_at': item.created_at
+            })
     
     return render_template('wishlist/index.html', products=products)
 
@@ -100,6 +100,7 @@ def seed_database():
     ]
     
     for juego in juegos:
+        juego.actualizar_scores_requisitos()
         db.session.add(juego)
     
     # Agregar hardware
@@ -0,0 +1,66 @@
+"""
+Migración: Agregar columnas de scores de requisitos a la tabla games
+Agrega: req_min_cpu_score, req_min_gpu_score, req_min_ram_gb,
+        req_rec_cpu_score, req_rec_gpu_score, req_rec_ram_gb (con índices)
+Compatible con SQLite y PostgreSQL
+"""
+import os
+import sys
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, db
+from sqlalchemy import text, inspect
+
+SCORE_COLUMNS = [
+    'req_min_cpu_score',
+    'req_min_gpu_score',
+    'req_min_ram_gb',
+    'req_rec_cpu_score',
+    'req_rec_gpu_score',
+    'req_rec_ram_gb'
+]
+
+def run_migration():
+    """Ejecutar migración para agregar columnas de scores de requisitos"""
+    with app.app_context():
+        try:
+            print("="*60)
+            print("MIGRACIÓN: Scores de Requisitos en Juegos")
+            print("="*60)
+            
+            existing_columns = [col['name'] for col in inspect(db.engine).get_columns('games')]
+            
+            print("\n📝 Agregando columnas a la tabla 'games'...")
+            for column_name in SCORE_COLUMNS:
+                if column_name in existing_columns:
+                    print(f"  ℹ️  Columna '{column_name}' ya existe")
+                    continue
+                db.session.execute(text(f'ALTER TABLE games ADD COLUMN {column_name} INTEGER'))
+                print(f"  ✓ Columna '{column_name}' agregada")
+            
+            print("\n📝 Creando índices...")
+            for column_name in SCORE_COLUMNS:
+                db.session.execute(text(
+                    f'CREATE INDEX IF NOT EXISTS ix_games_{column_name} ON games ({column_name})'
+                ))
+            print("  ✓ Índices creados")
+            
+            db.session.commit()
+            
+            print("\n" + "="*60)
+            print("✅ MIGRACIÓN COMPLETADA EXITOSAMENTE")
+            print("="*60)
+            print("\n📌 Próximo paso:")
+            print("  Ejecutar: python scripts/backfill_game_requirement_scores.py")
+            
+        except Exception as e:
+            db.session.rollback()
+            print(f"\n❌ ERROR durante la migración: {e}")
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
+
+if __name__ == '__main__':
+    run_migration()
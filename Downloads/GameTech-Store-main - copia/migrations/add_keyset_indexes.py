@@ -0,0 +1,47 @@
+"""
+Migración: Crear los índices compuestos de la paginación por clave
+- games(nombre, id) y games(precio, id) para los órdenes de /tienda
+- hardware(tipo, id) para la sección de hardware
+"""
+import os
+import sys
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, db
+from models.database_models import Game, Hardware
+
+INDICES = ('ix_games_nombre_id', 'ix_games_precio_id', 'ix_hardware_tipo_id')
+
+def run_migration():
+    """Ejecutar migración para crear los índices de paginación"""
+    with app.app_context():
+        try:
+            print("="*60)
+            print("MIGRACIÓN: Índices de Paginación por Clave")
+            print("="*60)
+            
+            print("\n📝 Creando índices compuestos...")
+            indices = [
+                indice
+                for modelo in (Game, Hardware)
+                for indice in modelo.__table__.indexes
+                if indice.name in INDICES
+            ]
+            for indice in indices:
+                indice.create(bind=db.engine, checkfirst=True)
+                print(f"  ✓ {indice.name}")
+            
+            print("\n" + "="*60)
+            print("✅ MIGRACIÓN COMPLETADA EXITOSAMENTE")
+            print("="*60)
+            
+        except Exception as e:
+            print(f"\n❌ ERROR durante la migración: {e}")
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
+
+if __name__ == '__main__':
+    run_migration()
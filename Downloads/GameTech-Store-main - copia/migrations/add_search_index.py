@@ -0,0 +1,44 @@
+"""
+Migración: Crear el índice de búsqueda de texto completo
+- SQLite: tablas FTS5 games_fts / hardware_fts con triggers de sincronización
+- PostgreSQL: columnas search_vector (tsvector generado) con índices GIN e
+  índices de trigramas (pg_trgm) sobre el nombre del juego y el modelo
+"""
+import os
+import sys
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, db
+from utils.search_index import crear_indice_busqueda
+
+def run_migration():
+    """Ejecutar migración para crear el índice de búsqueda"""
+    with app.app_context():
+        try:
+            print("="*60)
+            print("MIGRACIÓN: Índice de Búsqueda de Texto Completo")
+            print("="*60)
+            
+            print(f"\n📝 Creando estructuras de búsqueda ({db.engine.dialect.name})...")
+            with db.engine.begin() as conn:
+                motor = crear_indice_busqueda(conn)
+            
+            if motor is None:
+                print("  ⚠️  Motor de base de datos no compatible: se seguirá usando ILIKE")
+            else:
+                print(f"  ✓ Índice de búsqueda creado ({motor})")
+            
+            print("\n" + "="*60)
+            print("✅ MIGRACIÓN COMPLETADA EXITOSAMENTE")
+            print("="*60)
+            
+        except Exception as e:
+            print(f"\n❌ ERROR durante la migración: {e}")
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
+
+if __name__ == '__main__':
+    run_migration()
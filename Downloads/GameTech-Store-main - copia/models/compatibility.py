@@ -1,3 +1,70 @@
+import re
+from functools import lru_cache
+
+# Número máximo de textos de requisitos/modelos memorizados por tabla
+MATCHER_CACHE_SIZE = 4096
+SCORE_POR_DEFECTO = 50
+
+# Valores de `explicar` en verificar_compatibility_completa
+NIVELES_EXPLICACION = ('todos', 'incompatibles', 'ninguno')
+
+
+class _ModelMatcher:
+    """
+    Buscador de modelos de hardware dentro de un texto libre.
+
+    Se construye una sola vez a partir de una tabla de rendimiento
+    ({marca: {clave: score}}) y compila por marca una expresión regular con
+    todas las claves. Siempre gana la coincidencia más larga, de modo que el
+    orden del diccionario no decide el resultado. Los textos ya resueltos se
+    memorizan en una caché acotada.
+    """
+
+    def __init__(self, tabla, cache_size=MATCHER_CACHE_SIZE):
+        self._marcas = {}
+        for marca, series in tabla.items():
+            # A igual posición, la alternancia prueba primero las claves más largas
+            claves = sorted(series, key=len, reverse=True)
+            patron = re.compile('(?=(' + '|'.join(re.escape(c) for c in claves) + '))')
+            self._marcas[marca] = (patron, series)
+
+        self.score_modelo = lru_cache(maxsize=cache_size)(self._score_modelo)
+        self.score_texto = lru_cache(maxsize=cache_size)(self._score_texto)
+
+    @staticmethod
+    def _clave_mas_larga(patron, texto):
+        """Devolver la clave más larga de la tabla que aparece en el texto"""
+        mejor = None
+        for match in patron.finditer(texto):
+            clave = match.group(1)
+            if mejor is None or len(clave) > len(mejor):
+                mejor = clave
+        return mejor
+
+    def _score_modelo(self, marca, modelo):
+        """Score de un componente cuya marca se conoce"""
+        entrada = self._marcas.get(marca.lower())
+        if entrada is None:
+            return SCORE_POR_DEFECTO
+
+        patron, series = entrada
+        clave = self._clave_mas_larga(patron, modelo.lower())
+        return series[clave] if clave else SCORE_POR_DEFECTO
+
+    def _score_texto(self, texto):
+        """Score de un texto libre como 'NVIDIA GeForce GTX 1060'"""
+        texto_lower = texto.lower()
+        mejor = None
+        for marca, (patron, series) in self._marcas.items():
+            if marca not in texto_lower:
+                continue
+            clave = self._clave_mas_larga(patron, texto_lower)
+            if clave and (mejor is None or len(clave) > len(mejor[0])):
+                mejor = (clave, series[clave])
+
+        return mejor[1] if mejor else SCORE_POR_DEFECTO
+
+
 class Compatibility:
     """Modelo para manejar compatibilidad entre juegos y hardware con sistema de puntuación"""
 
@@ -30,7 +97,7 @@ class Compatibility:
     }
 
     @classmethod
-    def verificar_compatibility_completa(cls, juegos, componentes_seleccionados):
+    def verificar_compatibility_completa(cls, juegos, componentes_seleccionados, explicar='todos'):
         """
         Verificar compatibilidad completa entre juegos seleccionados y componentes de hardware
         con sistema de puntuación mejorado
@@ -38,10 +105,19 @@ class Compatibility:
         Args:
             juegos: Lista de juegos seleccionados
             componentes_seleccionados: Lista de componentes de hardware seleccionados
+            explicar: Celdas con razón en texto: 'todos', 'incompatibles' o 'ninguno'
 
         Returns:
             dict: Resultado de compatibilidad con detalles y puntuación
+
+        Raises:
+            ValueError: si explicar no es uno de NIVELES_EXPLICACION
         """
+        from models.compatibility_matrix import CompatibilityMatrix
+
+        if explicar not in NIVELES_EXPLICACION:
+            raise ValueError(f'explicar debe ser uno de {NIVELES_EXPLICACION}')
+
         resultado = {
             "compatible": True,
             "detalles": [],
@@ -50,30 +126,18 @@ class Compatibility:
             "nivel_rendimiento": ""  # Bajo, medio, alto, ultra
         }
 
-        puntuaciones = []
-
-        # Verificar cada juego contra cada componente
-        for juego in juegos:
-            for componente in componentes_seleccionados:
-                compatibilidad = cls._verificar_juego_componente(juego, componente)
-                resultado["detalles"].append({
-                    "juego": juego.nombre,
-                    "componente": f"{componente.marca} {componente.modelo}",
-                    "tipo_componente": componente.tipo,
-                    "compatible": compatibilidad["compatible"],
-                    "razon": compatibilidad["razon"],
-                    "puntuacion": compatibilidad.get("puntuacion", 0)
-                })
-
-                if not compatibilidad["compatible"]:
-                    resultado["compatible"] = False
-                
-                if "puntuacion" in compatibilidad:
-                    puntuaciones.append(compatibilidad["puntuacion"])
-        
+        # Todas las celdas juego × componente en una sola pasada vectorizada
+        matriz = CompatibilityMatrix(juegos, componentes_seleccionados)
+        resultado["compatible"] = matriz.compatible
+
+        if explicar == 'todos':
+            resultado["detalles"] = matriz.detalles()
+        elif explicar == 'incompatibles':
+            resultado["detalles"] = matriz.detalles(matriz.celdas_incompatibles())
+
         # Calcular puntuación general
-        if puntuaciones:
-            resultado["puntuacion_general"] = sum(puntuaciones) / len(puntuaciones)
+        if matriz.puntuaciones.size:
+            resultado["puntuacion_general"] = matriz.puntuacion_general
             
             # Determinar nivel de rendimiento
             if resultado["puntuacion_general"] >= 80:
@@ -220,10 +284,21 @@ class Compatibility:
             "puntuacion": min(puntuacion, 100)
         }
 
+    @classmethod
+    def scores_requisitos(cls, requisitos):
+        """
+        Convertir un dict de requisitos ({"CPU": ..., "GPU": ..., "RAM": ...})
+        en la tupla numérica (cpu_score, gpu_score, ram_gb)
+        """
+        return (
+            cls._calcular_cpu_score_from_string(requisitos.get("CPU", "")),
+            cls._calcular_gpu_score_from_string(requisitos.get("GPU", "")),
+            cls._extraer_gb_ram(requisitos.get("RAM", "0"))
+        )
+
     @classmethod
     def _extraer_gb_ram(cls, texto_ram):
         """Extraer cantidad en GB de texto como '16 GB'"""
-        import re
         numeros = re.findall(r'\d+', str(texto_ram))
         if numeros:
             cantidad = int(numeros[0])
@@ -237,58 +312,22 @@ class Compatibility:
     @classmethod
     def _calcular_cpu_score(cls, marca, modelo):
         """Calcular puntuación de CPU basada en marca y modelo"""
-        marca_lower = marca.lower()
-        modelo_lower = modelo.lower()
-        
-        if marca_lower not in cls.CPU_PERFORMANCE:
-            return 50  # Puntuación por defecto
-        
-        for key, score in cls.CPU_PERFORMANCE[marca_lower].items():
-            if key in modelo_lower:
-                return score
-        
-        return 50
+        return _CPU_MATCHER.score_modelo(marca, modelo)
     
     @classmethod
     def _calcular_cpu_score_from_string(cls, cpu_string):
         """Calcular puntuación requerida de CPU desde string"""
-        cpu_lower = cpu_string.lower()
-        
-        for marca, series in cls.CPU_PERFORMANCE.items():
-            if marca in cpu_lower:
-                for key, score in series.items():
-                    if key in cpu_lower:
-                        return score
-        
-        return 50
+        return _CPU_MATCHER.score_texto(cpu_string)
     
     @classmethod
     def _calcular_gpu_score(cls, marca, modelo):
         """Calcular puntuación de GPU basada en marca y modelo"""
-        marca_lower = marca.lower()
-        modelo_lower = modelo.lower()
-        
-        if marca_lower not in cls.GPU_PERFORMANCE:
-            return 50
-        
-        for key, score in cls.GPU_PERFORMANCE[marca_lower].items():
-            if key in modelo_lower:
-                return score
-        
-        return 50
+        return _GPU_MATCHER.score_modelo(marca, modelo)
     
     @classmethod
     def _calcular_gpu_score_from_string(cls, gpu_string):
         """Calcular puntuación requerida de GPU desde string"""
-        gpu_lower = gpu_string.lower()
-        
-        for marca, series in cls.GPU_PERFORMANCE.items():
-            if marca in gpu_lower:
-                for key, score in series.items():
-                    if key in gpu_lower:
-                        return score
-        
-        return 50
+        return _GPU_MATCHER.score_texto(gpu_string)
     
     @classmethod
     def _generar_recomendaciones(cls, componentes, puntuacion_general):
@@ -319,3 +358,8 @@ class Compatibility:
                     recomendaciones.append("Tu GPU es más potente que tu CPU. Considera actualizar el CPU para evitar cuellos de botella.")
         
         return recomendaciones
+
+
+# Buscadores compilados una sola vez a partir de las tablas de rendimiento
+_CPU_MATCHER = _ModelMatcher(Compatibility.CPU_PERFORMANCE)
+_GPU_MATCHER = _ModelMatcher(Compatibility.GPU_PERFORMANCE)
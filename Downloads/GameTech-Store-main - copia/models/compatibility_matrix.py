@@ -0,0 +1,183 @@
+"""
+Motor vectorizado de compatibilidad juegos × componentes
+
+Calcula en una sola pasada de NumPy la matriz de compatibilidad y puntuación
+entre N juegos y M componentes. Las razones en texto solo se construyen para
+las celdas que el llamador pide explicar.
+"""
+import numpy as np
+
+from models.compatibility import Compatibility
+
+TIPO_CPU = 0
+TIPO_GPU = 1
+TIPO_RAM = 2
+TIPO_OTRO = 3
+
+_TIPOS = {'CPU': TIPO_CPU, 'GPU': TIPO_GPU, 'RAM': TIPO_RAM}
+
+
+def _requisitos_minimos(juego):
+    """Obtener requisitos mínimos como dict (modelo SQLAlchemy o legado)"""
+    if hasattr(juego, 'get_requisitos_minimos'):
+        return juego.get_requisitos_minimos()
+    return juego.requisitos_minimos
+
+
+def _especificaciones(componente):
+    """Obtener especificaciones como dict (modelo SQLAlchemy o legado)"""
+    if hasattr(componente, 'get_especificaciones'):
+        return componente.get_especificaciones()
+    return componente.especificaciones
+
+
+class CompatibilityMatrix:
+    """Matriz de compatibilidad entre una lista de juegos y una de componentes"""
+
+    def __init__(self, juegos, componentes):
+        self.juegos = list(juegos)
+        self.componentes = list(componentes)
+        self._requisitos_texto = {}
+
+        requeridos = self._requisitos_juegos(self.juegos)
+        tipos, disponibles = self._scores_componentes(self.componentes)
+        self.tipos = tipos
+        self.requeridos, self.disponibles = self._alinear(requeridos, tipos, disponibles)
+        self.compatibles, self.puntuaciones = self._calcular(
+            self.requeridos, self.disponibles, tipos
+        )
+
+    # ------------------------------------------------------------------
+    # Construcción de arrays
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _requisitos_juegos(juegos):
+        """Array N×3 con el score requerido de CPU, GPU y los GB de RAM"""
+        requeridos = np.zeros((len(juegos), 3), dtype=np.float64)
+        for i, juego in enumerate(juegos):
+            if hasattr(juego, 'tiene_scores_requisitos') and juego.tiene_scores_requisitos():
+                # Scores persistidos al guardar el juego: sin JSON ni búsqueda de texto
+                requeridos[i] = (juego.req_min_cpu_score, juego.req_min_gpu_score, juego.req_min_ram_gb)
+            else:
+                requeridos[i] = Compatibility.scores_requisitos(_requisitos_minimos(juego))
+        return requeridos
+
+    @staticmethod
+    def _scores_componentes(componentes):
+        """Arrays M con el tipo de cada componente y su score disponible"""
+        tipos = np.full(len(componentes), TIPO_OTRO, dtype=np.int8)
+        disponibles = np.zeros(len(componentes), dtype=np.float64)
+        for j, componente in enumerate(componentes):
+            tipo = _TIPOS.get(componente.tipo, TIPO_OTRO)
+            tipos[j] = tipo
+            if tipo == TIPO_CPU:
+                disponibles[j] = Compatibility._calcular_cpu_score(componente.marca, componente.modelo)
+            elif tipo == TIPO_GPU:
+                disponibles[j] = Compatibility._calcular_gpu_score(componente.marca, componente.modelo)
+            elif tipo == TIPO_RAM:
+                disponibles[j] = Compatibility._extraer_gb_ram(
+                    _especificaciones(componente).get('capacidad', '0')
+                )
+        return tipos, disponibles
+
+    @staticmethod
+    def _alinear(requeridos, tipos, disponibles):
+        """Expandir requisitos y scores a matrices N×M alineadas por tipo"""
+        columnas = np.minimum(tipos, TIPO_RAM)
+        requerido = requeridos[:, columnas]
+        return requerido, np.broadcast_to(disponibles, requerido.shape)
+
+    @staticmethod
+    def _calcular(requerido, disponible, tipos):
+        """Compatibilidad y puntuación de todas las celdas en una pasada"""
+        con_requisito = requerido > 0
+        ratio = np.divide(disponible, requerido,
+                          out=np.zeros(requerido.shape), where=con_requisito)
+
+        # CPU / GPU: el score disponible debe alcanzar el requerido
+        cumple = disponible >= requerido
+        rendimiento = ratio * 100
+        puntuacion_cg = np.where(
+            cumple,
+            np.where(con_requisito, np.minimum(rendimiento, 100), 100),
+            np.where(con_requisito, rendimiento, 0)
+        )
+
+        # RAM: puntuación extra por exceso de memoria hasta el doble de lo requerido
+        cumple_ram = ~(requerido > disponible)
+        puntuacion_exceso = np.where(ratio >= 2, 100, 50 + (ratio - 1) * 50)
+        puntuacion_ram = np.where(
+            cumple_ram,
+            np.minimum(np.where(con_requisito, puntuacion_exceso, 100), 100),
+            np.where(con_requisito, rendimiento, 0)
+        )
+
+        es_ram = tipos == TIPO_RAM
+        es_otro = tipos == TIPO_OTRO
+        compatibles = np.where(es_ram, cumple_ram, cumple) | es_otro
+        puntuaciones = np.where(es_otro, 0.0, np.where(es_ram, puntuacion_ram, puntuacion_cg))
+        return compatibles, puntuaciones
+
+    # ------------------------------------------------------------------
+    # Resultados
+    # ------------------------------------------------------------------
+    @property
+    def compatible(self):
+        """True si todas las celdas son compatibles"""
+        return bool(self.compatibles.all())
+
+    @property
+    def puntuacion_general(self):
+        """Promedio de puntuaciones de todas las celdas (0 si no hay celdas)"""
+        if not self.puntuaciones.size:
+            return 0
+        return sum(self.puntuaciones.ravel().tolist()) / self.puntuaciones.size
+
+    def celdas_incompatibles(self):
+        """Lista de (i, j) de las celdas incompatibles"""
+        return [tuple(celda) for celda in np.argwhere(~self.compatibles).tolist()]
+
+    def explicar(self, i, j):
+        """Construir el detalle (con razón en texto) de la celda (i, j)"""
+        juego = self.juegos[i]
+        componente = self.componentes[j]
+        compatible = bool(self.compatibles[i, j])
+        puntuacion = float(self.puntuaciones[i, j])
+
+        return {
+            "juego": juego.nombre,
+            "componente": f"{componente.marca} {componente.modelo}",
+            "tipo_componente": componente.tipo,
+            "compatible": compatible,
+            "razon": self._razon(i, j, compatible, puntuacion),
+            "puntuacion": puntuacion
+        }
+
+    def detalles(self, celdas=None):
+        """Detalles de las celdas indicadas, o de todas en orden juego → componente"""
+        if celdas is None:
+            celdas = ((i, j) for i in range(len(self.juegos)) for j in range(len(self.componentes)))
+        return [self.explicar(i, j) for i, j in celdas]
+
+    def _razon(self, i, j, compatible, puntuacion):
+        tipo = self.tipos[j]
+        if tipo == TIPO_OTRO:
+            return "Compatible"
+
+        if tipo == TIPO_RAM:
+            requerida = int(self.requeridos[i, j])
+            disponible = int(self.disponibles[i, j])
+            if compatible:
+                return f"RAM suficiente ({disponible}GB disponible, requiere {requerida}GB)"
+            return f"RAM insuficiente. Requiere {requerida}GB, tienes {disponible}GB"
+
+        nombre = 'CPU' if tipo == TIPO_CPU else 'GPU'
+        if compatible:
+            return f"{nombre} compatible - Rendimiento: {puntuacion:.0f}%"
+        return f"{nombre} insuficiente. Requiere: {self._requisito_texto(i, nombre)}"
+
+    def _requisito_texto(self, i, clave):
+        """Texto original del requisito (solo se decodifica al explicar)"""
+        if i not in self._requisitos_texto:
+            self._requisitos_texto[i] = _requisitos_minimos(self.juegos[i])
+        return self._requisitos_texto[i].get(clave, "")
@@ -5,6 +5,7 @@ from database import db
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy import or_, and_
+from utils.search_index import buscar_ids, cargar_en_orden
 import json
 
 CASCADE = 'all, delete-orphan'
@@ -67,6 +68,11 @@ class User(db.Model):
 class Game(db.Model):
     """Modelo de juego con base de datos"""
     __tablename__ = 'games'
+    __table_args__ = (
+        # Paginación por clave de la tienda: (nombre, id) y (precio, id)
+        db.Index('ix_games_nombre_id', 'nombre', 'id'),
+        db.Index('ix_games_precio_id', 'precio', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     nombre = db.Column(db.String(200), nullable=False, index=True)
@@ -82,6 +88,14 @@ class Game(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Requisitos parseados a scores numéricos (se calculan al guardar el juego)
+    req_min_cpu_score = db.Column(db.Integer, index=True)
+    req_min_gpu_score = db.Column(db.Integer, index=True)
+    req_min_ram_gb = db.Column(db.Integer, index=True)
+    req_rec_cpu_score = db.Column(db.Integer, index=True)
+    req_rec_gpu_score = db.Column(db.Integer, index=True)
+    req_rec_ram_gb = db.Column(db.Integer, index=True)
+    
     def get_requisitos_minimos(self):
         """Obtener requisitos mínimos como dict"""
         return json.loads(self.requisitos_minimos) if self.requisitos_minimos else {}
@@ -90,6 +104,24 @@ class Game(db.Model):
         """Obtener requisitos recomendados como dict"""
         return json.loads(self.requisitos_recomendados) if self.requisitos_recomendados else {}
     
+    def actualizar_scores_requisitos(self):
+        """Parsear los requisitos JSON y guardar sus scores en las columnas numéricas"""
+        from models.compatibility import Compatibility
+
+        niveles = (
+            ('min', self.get_requisitos_minimos()),
+            ('rec', self.get_requisitos_recomendados())
+        )
+        for nivel, requisitos in niveles:
+            cpu_score, gpu_score, ram_gb = Compatibility.scores_requisitos(requisitos)
+            setattr(self, f'req_{nivel}_cpu_score', cpu_score)
+            setattr(self, f'req_{nivel}_gpu_score', gpu_score)
+            setattr(self, f'req_{nivel}_ram_gb', ram_gb)
+    
+    def tiene_scores_requisitos(self):
+        """True si los scores de requisitos mínimos ya están persistidos"""
+        return None not in (self.req_min_cpu_score, self.req_min_gpu_score, self.req_min_ram_gb)
+    
     @classmethod
     def get_all_games(cls):
         """Obtener todos los juegos"""
@@ -100,33 +132,81 @@ class Game(db.Model):
         """Obtener un juego por id"""
         return cls.query.get(game_id)
     
+    @classmethod
+    def search_games(cls, query, limite=50):
+        """Buscar juegos por nombre, descripción, género o desarrollador (por relevancia)"""
+        ids = buscar_ids('games', query, limite)
+        if ids is not None:
+            return cargar_en_orden(cls, ids)
+        
+        # Sin índice de texto completo: búsqueda secuencial
+        search = f"%{query}%"
+        consulta = cls.query.filter(
+            or_(
+                cls.nombre.ilike(search),
+                cls.descripcion.ilike(search),
+                cls.genero.ilike(search),
+                cls.desarrollador.ilike(search)
+            )
+        ).order_by(cls.nombre)
+        return consulta.limit(limite).all() if limite else consulta.all()
+    
     @classmethod
     def get_games_by_hardware(cls, hardware_specs):
-        """Obtener juegos compatibles con el hardware especificado usando el sistema de compatibilidad"""
+        """Obtener juegos compatibles con el hardware especificado (consulta por rangos)"""
+        cpu_score, gpu_score, ram_gb = cls._scores_hardware(hardware_specs)
+        query = cls._filtrar_por_requisitos(cls.query, cpu_score, gpu_score, ram_gb)
+        return query.order_by(cls.id).all()
+    
+    @classmethod
+    def get_compatible_game_ids(cls, cpu_score=None, gpu_score=None, ram_gb=None):
+        """Ids de los juegos cuyos requisitos mínimos cumple el hardware (None = sin restricción)"""
+        query = cls._filtrar_por_requisitos(db.session.query(cls.id), cpu_score, gpu_score, ram_gb)
+        return [row.id for row in query.order_by(cls.id)]
+    
+    @classmethod
+    def _filtrar_por_requisitos(cls, query, cpu_score, gpu_score, ram_gb):
+        """
+        Aplicar predicados de rango sobre las columnas indexadas req_min_*.
+        Los juegos sin scores persistidos no aparecen hasta ejecutar el backfill.
+        """
+        if cpu_score is not None:
+            query = query.filter(cls.req_min_cpu_score <= cpu_score)
+        if gpu_score is not None:
+            query = query.filter(cls.req_min_gpu_score <= gpu_score)
+        if ram_gb is not None:
+            query = query.filter(cls.req_min_ram_gb <= ram_gb)
+        return query
+    
+    @staticmethod
+    def _scores_hardware(hardware_specs):
+        """
+        Convertir las especificaciones del usuario en (cpu_score, gpu_score, ram_gb).
+        Cada componente puede ser un texto ('Intel Core i7-9700K') o un dict con
+        marca/modelo/capacidad; si falta, no restringe la búsqueda.
+        """
         from models.compatibility import Compatibility
 
-        juegos = cls.get_all_games()
-        juegos_compatibles = []
+        def score(specs, por_texto, por_modelo):
+            if not specs:
+                return None
+            if isinstance(specs, dict):
+                return por_modelo(specs.get('marca', ''), specs.get('modelo', ''))
+            return por_texto(str(specs))
 
-        for juego in juegos:
-            # Convertir hardware_specs a objetos Hardware para compatibilidad
-            componentes = []
-            for tipo, specs in hardware_specs.items():
-                # Crear un objeto Hardware temporal para la comparación
-                componente = Hardware(
-                    tipo=tipo.upper(),
-                    marca=specs.get('marca', ''),
-                    modelo=specs.get('modelo', ''),
-                    especificaciones=json.dumps(specs)
-                )
-                componentes.append(componente)
+        cpu_score = score(hardware_specs.get('cpu'),
+                          Compatibility._calcular_cpu_score_from_string,
+                          Compatibility._calcular_cpu_score)
+        gpu_score = score(hardware_specs.get('gpu'),
+                          Compatibility._calcular_gpu_score_from_string,
+                          Compatibility._calcular_gpu_score)
 
-            # Verificar compatibilidad usando el sistema existente
-            resultado = Compatibility.verificar_compatibility_completa([juego], componentes)
-            if resultado['compatible']:
-                juegos_compatibles.append(juego)
+        ram = hardware_specs.get('ram')
+        if isinstance(ram, dict):
+            ram = ram.get('capacidad')
+        ram_gb = Compatibility._extraer_gb_ram(ram) if ram else None
 
-        return juegos_compatibles
+        return cpu_score, gpu_score, ram_gb
     
     def to_dict(self):
         """Convertir a diccionario"""
@@ -151,6 +231,9 @@ class Game(db.Model):
 class Hardware(db.Model):
     """Modelo de hardware con base de datos"""
     __tablename__ = 'hardware'
+    __table_args__ = (
+        db.Index('ix_hardware_tipo_id', 'tipo', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     tipo = db.Column(db.String(50), nullable=False, index=True)
@@ -217,17 +300,23 @@ class Hardware(db.Model):
         return cls.query.get(hardware_id)
     
     @classmethod
-    def buscar_hardware(cls, query):
-        """Buscar hardware"""
+    def buscar_hardware(cls, query, limite=None):
+        """Buscar hardware por marca, modelo, descripción o tipo (por relevancia)"""
+        ids = buscar_ids('hardware', query, limite)
+        if ids is not None:
+            return cargar_en_orden(cls, ids)
+        
+        # Sin índice de texto completo: búsqueda secuencial
         search = f"%{query}%"
-        return cls.query.filter(
+        consulta = cls.query.filter(
             or_(
                 cls.marca.ilike(search),
                 cls.modelo.ilike(search),
                 cls.descripcion.ilike(search),
                 cls.tipo.ilike(search)
             )
-        ).all()
+        )
+        return consulta.limit(limite).all() if limite else consulta.all()
     
     def to_dict(self):
         """Convertir a diccionario"""
@@ -247,6 +336,18 @@ class Hardware(db.Model):
         return f'<Hardware {self.marca} {self.modelo}>'
 
 
+class CatalogVersion(db.Model):
+    """Sello de versión del catálogo (una sola fila, id = 1)"""
+    __tablename__ = 'catalog_version'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<CatalogVersion {self.version}>'
+
+
 class CartItem(db.Model):
     """Modelo de item en el carrito"""
     __tablename__ = 'cart_items'
@@ -259,12 +360,17 @@ class CartItem(db.Model):
     added_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def get_product(self):
-        """Obtener el producto asociado"""
-        if self.product_type == 'game':
-            return Game.query.get(self.product_id)
-        elif self.product_type == 'hardware':
-            return Hardware.query.get(self.product_id)
-        return None
+        """Obtener el producto asociado (por lotes con el resto de la petición)"""
+        from utils.product_loader import get_product_loader
+        return get_product_loader().get(self.product_type, self.product_id)
+    
+    @staticmethod
+    def prime_products(cart_items):
+        """Registrar los productos de varios items para cargarlos en un solo lote"""
+        from utils.product_loader import get_product_loader
+        get_product_loader().prime_many(
+            (item.product_type, item.product_id) for item in cart_items
+        )
     
     def get_subtotal(self):
         """Calcular subtotal"""
@@ -396,6 +502,53 @@ class GameRequirements(db.Model):
         return f'<GameRequirements for Game {self.game_id}>'
 
 
+class AnalyzerResult(db.Model):
+    """Respuesta serializada del analizador para una combinación CPU/GPU/RAM"""
+    __tablename__ = 'analyzer_results'
+    __table_args__ = (
+        db.UniqueConstraint('cpu_id', 'gpu_id', 'ram_id', 'catalog_version',
+                            name='uq_analyzer_results_combo'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    cpu_id = db.Column(db.Integer, nullable=False)
+    gpu_id = db.Column(db.Integer, nullable=False)
+    ram_id = db.Column(db.Integer, nullable=False)
+    catalog_version = db.Column(db.Integer, nullable=False, index=True)
+    payload = db.Column(db.Text, nullable=False)  # JSON string
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @classmethod
+    def get_payload(cls, cpu_id, gpu_id, ram_id, catalog_version):
+        """Obtener la respuesta precalculada de una combinación (o None)"""
+        row = db.session.query(cls.payload).filter_by(
+            cpu_id=cpu_id, gpu_id=gpu_id, ram_id=ram_id, catalog_version=catalog_version
+        ).first()
+        return row.payload if row else None
+    
+    def __repr__(self):
+        return f'<AnalyzerResult {self.cpu_id}/{self.gpu_id}/{self.ram_id} v{self.catalog_version}>'
+
+
+class RelatedProduct(db.Model):
+    """Vecino precalculado de un producto (productos relacionados)"""
+    __tablename__ = 'related_products'
+    __table_args__ = (
+        db.Index('ix_related_products_producto', 'product_type', 'product_id', 'posicion', unique=True),
+        db.Index('ix_related_products_relacionado', 'product_type', 'related_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    product_type = db.Column(db.String(20), nullable=False)  # 'game' o 'hardware'
+    product_id = db.Column(db.Integer, nullable=False)
+    related_id = db.Column(db.Integer, nullable=False)
+    posicion = db.Column(db.Integer, nullable=False)
+    distancia = db.Column(db.Float, nullable=False)
+    
+    def __repr__(self):
+        return f'<RelatedProduct {self.product_type} {self.product_id} -> {self.related_id}>'
+
+
 class Invoice(db.Model):
     """Modelo de factura electrónica"""
     __tablename__ = 'invoices'
@@ -0,0 +1,66 @@
+"""
+Script para calcular los scores numéricos de requisitos de los juegos existentes
+Rellena las columnas req_* de la tabla games a partir de los requisitos JSON
+Uso: python scripts/backfill_game_requirement_scores.py [--todos]
+"""
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db
+from models.database_models import Game
+
+BATCH_SIZE = 500
+
+def backfill_requirement_scores(todos=False):
+    """Calcular scores de requisitos para juegos sin ellos (o todos con --todos)"""
+    with app.app_context():
+        print("="*60)
+        print("BACKFILL DE SCORES DE REQUISITOS")
+        print("="*60)
+        print()
+        
+        query = Game.query.order_by(Game.id)
+        if not todos:
+            query = query.filter(Game.req_min_cpu_score.is_(None))
+        
+        updated_count = 0
+        errors = []
+        last_id = 0
+        
+        while True:
+            batch = query.filter(Game.id > last_id).limit(BATCH_SIZE).all()
+            if not batch:
+                break
+            
+            for game in batch:
+                try:
+                    game.actualizar_scores_requisitos()
+                    updated_count += 1
+                except ValueError as e:
+                    # Requisitos con JSON inválido: se reportan y se omiten
+                    errors.append(f"{game.id} - {game.nombre}: {e}")
+            
+            last_id = batch[-1].id
+            db.session.commit()
+            print(f"  ✅ Procesados hasta el juego #{last_id}")
+        
+        print("\n" + "="*60)
+        print(f"✅ Juegos actualizados: {updated_count}")
+        print("="*60)
+        
+        if errors:
+            print(f"\n⚠️  {len(errors)} juegos con requisitos inválidos:")
+            for error in errors[:10]:
+                print(f"  - {error}")
+
+if __name__ == '__main__':
+    try:
+        backfill_requirement_scores(todos='--todos' in sys.argv)
+    except Exception as e:
+        print(f"\n❌ Error fatal: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,336 @@
+"""
+Benchmark de los motores de compatibilidad y del analizador de hardware
+Construye catálogos sintéticos en SQLite (10 / 1.000 / 50.000 juegos y cientos
+de componentes), mide el tiempo por llamada y por lote de Compatibility,
+PerformanceCalculator, BottleneckDetector y analyze_game_compatibility, guarda
+los resultados en JSON y los compara con una línea base.
+
+Uso:
+    python scripts/benchmark_engines.py                      # comparar con la línea base
+    python scripts/benchmark_engines.py --guardar-base       # guardar nueva línea base
+    python scripts/benchmark_engines.py --tamanos 10,1000 --umbral 0.3
+
+Devuelve código 1 si alguna medición es más lenta que la línea base en más
+del umbral indicado (por defecto 20%).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Agregar el directorio raíz al path
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# La base de datos sintética se configura antes de importar la aplicación
+_db_file = os.path.join(tempfile.mkdtemp(prefix='gametech_bench_'), 'bench.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{_db_file}'
+
+import numpy as np
+from sqlalchemy import insert
+
+from app import app, db
+from controllers.hardware_analyzer import analyze_game_compatibility
+from models.compatibility import Compatibility
+from models.database_models import CatalogVersion, Game, GameRequirements, Hardware
+from utils.bottleneck_detector import BottleneckDetector
+from utils.catalog_version import bump_catalog_version
+from utils.performance_calculator import PerformanceCalculator
+from utils.requirements_snapshot import get_requirements_snapshot
+
+TAMANOS = (10, 1000, 50000)
+BASE_POR_DEFECTO = os.path.join(RAIZ, 'benchmarks', 'engines_baseline.json')
+UMBRAL_POR_DEFECTO = 0.20
+
+# Componentes del catálogo sintético
+N_CPUS = 200
+N_GPUS = 200
+N_RAMS = 60
+N_MOTHERBOARDS = 60
+
+# Juegos evaluados por Compatibility en modo lote (carga ORM aparte)
+MAX_JUEGOS_COMPATIBILIDAD = 5000
+# Llamadas individuales medidas por repetición
+LLAMADAS_INDIVIDUALES = 500
+
+MODELOS_CPU = [
+    ('Intel', 'Core i9-13900K'), ('Intel', 'Core i7-12700K'), ('Intel', 'Core i5-12400F'),
+    ('Intel', 'Core i3-12100'), ('AMD', 'Ryzen 9 7950X'), ('AMD', 'Ryzen 7 5800X3D'),
+    ('AMD', 'Ryzen 5 7600X'), ('AMD', 'Ryzen 3 4100')
+]
+MODELOS_GPU = [
+    ('NVIDIA', 'GeForce RTX 4090'), ('NVIDIA', 'GeForce RTX 4070'), ('NVIDIA', 'GeForce RTX 3060'),
+    ('NVIDIA', 'GeForce GTX 1660'), ('NVIDIA', 'GeForce GTX 1060'), ('AMD', 'Radeon RX 7900 XTX'),
+    ('AMD', 'Radeon RX 6700 XT'), ('AMD', 'Radeon RX 580')
+]
+REQUISITOS_TEXTO = [
+    '{"CPU": "Intel Core i3", "GPU": "NVIDIA GTX 1060", "RAM": "8 GB"}',
+    '{"CPU": "Intel Core i5", "GPU": "NVIDIA GTX 1660", "RAM": "8 GB"}',
+    '{"CPU": "AMD Ryzen 5", "GPU": "NVIDIA RTX 3060", "RAM": "16 GB"}',
+    '{"CPU": "Intel Core i7", "GPU": "NVIDIA RTX 4070", "RAM": "16 GB"}'
+]
+SOCKETS = ('AM4', 'AM5', 'LGA 1700')
+
+
+def poblar_catalogo(n_juegos, semilla=42):
+    """Reemplazar el catálogo por uno sintético de n_juegos y cientos de componentes"""
+    rng = random.Random(semilla)
+
+    db.session.execute(GameRequirements.__table__.delete())
+    db.session.execute(Game.__table__.delete())
+    db.session.execute(Hardware.__table__.delete())
+
+    hardware = []
+    for tipo, cantidad in (('CPU', N_CPUS), ('GPU', N_GPUS), ('RAM', N_RAMS), ('Motherboard', N_MOTHERBOARDS)):
+        for i in range(cantidad):
+            socket = rng.choice(SOCKETS)
+            if tipo == 'CPU':
+                marca, modelo = rng.choice(MODELOS_CPU)
+            elif tipo == 'GPU':
+                marca, modelo = rng.choice(MODELOS_GPU)
+            else:
+                marca, modelo = 'Genérica', tipo
+            especificaciones = {'socket': socket}
+            if tipo == 'RAM':
+                especificaciones = {'capacidad': f'{rng.choice((4, 8, 16, 32, 64))} GB'}
+            hardware.append({
+                'tipo': tipo,
+                'marca': marca,
+                'modelo': f'{modelo} #{i}',
+                'precio': round(rng.uniform(40, 1500), 2),
+                'descripcion': 'Componente sintético',
+                'especificaciones': json.dumps(especificaciones),
+                'stock': 10,
+                'benchmark_score': rng.randint(2000, 30000) if tipo in ('CPU', 'GPU') else 0,
+                'socket': socket if tipo in ('CPU', 'Motherboard') else None
+            })
+    db.session.execute(insert(Hardware.__table__), hardware)
+
+    juegos = []
+    for i in range(n_juegos):
+        texto = rng.choice(REQUISITOS_TEXTO)
+        cpu_score, gpu_score, ram_gb = Compatibility.scores_requisitos(json.loads(texto))
+        juegos.append({
+            'id': i + 1,
+            'nombre': f'Juego sintético {i}',
+            'descripcion': 'Juego sintético',
+            'precio': round(rng.uniform(0, 70), 2),
+            'genero': rng.choice(('RPG', 'FPS', 'Acción', 'Estrategia')),
+            'desarrollador': 'Bench',
+            'requisitos_minimos': texto,
+            'requisitos_recomendados': '{}',
+            'stock': 5,
+            'req_min_cpu_score': cpu_score,
+            'req_min_gpu_score': gpu_score,
+            'req_min_ram_gb': ram_gb
+        })
+    if juegos:
+        db.session.execute(insert(Game.__table__), juegos)
+
+    requisitos = []
+    for game_id in range(1, n_juegos + 1):
+        min_cpu, min_gpu = rng.randint(2000, 12000), rng.randint(2000, 12000)
+        requisitos.append({
+            'game_id': game_id,
+            'min_cpu_score': min_cpu, 'min_gpu_score': min_gpu, 'min_ram_gb': rng.choice((4, 8, 16)),
+            'rec_cpu_score': min_cpu + rng.randint(0, 6000), 'rec_gpu_score': min_gpu + rng.randint(0, 8000),
+            'rec_ram_gb': rng.choice((8, 16)),
+            'ultra_cpu_score': min_cpu + rng.randint(6000, 15000), 'ultra_gpu_score': min_gpu + rng.randint(8000, 18000),
+            'ultra_ram_gb': rng.choice((16, 32))
+        })
+    if requisitos:
+        db.session.execute(insert(GameRequirements.__table__), requisitos)
+
+    # Las inserciones masivas no pasan por el ORM: el sello se incrementa a mano
+    bump_catalog_version()
+    db.session.commit()
+    db.session.expunge_all()
+
+
+def medir(funcion, repeticiones, items=1):
+    """Ejecutar `funcion` varias veces y resumir los tiempos"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    mediana = statistics.median(tiempos)
+    return {
+        'mediana_s': mediana,
+        'min_s': min(tiempos),
+        'items': items,
+        'us_por_item': mediana / items * 1e6 if items else None,
+        'items_por_s': items / mediana if mediana else None
+    }
+
+
+def benchmark_tamano(n_juegos, repeticiones):
+    """Mediciones de todos los motores sobre un catálogo de n_juegos"""
+    rng = random.Random(n_juegos)
+    poblar_catalogo(n_juegos)
+
+    cpus = Hardware.get_hardware_by_tipo('CPU')
+    gpus = Hardware.get_hardware_by_tipo('GPU')
+    rams = Hardware.get_hardware_by_tipo('RAM')
+    ternas = [(rng.choice(cpus), rng.choice(gpus), rng.choice(rams)) for _ in range(LLAMADAS_INDIVIDUALES)]
+    cpu, gpu, ram = ternas[0]
+    for ram_obj in rams:
+        ram_obj.get_especificaciones()  # calentar atributos cargados
+
+    resultados = {}
+
+    # Compatibility: un juego × 3 componentes, y un lote de juegos × 3 componentes
+    juegos = Game.query.order_by(Game.id).limit(MAX_JUEGOS_COMPATIBILIDAD).all()
+    muestra = [rng.choice(juegos) for _ in range(LLAMADAS_INDIVIDUALES)] if juegos else []
+    if juegos:
+        resultados['compatibility/llamada'] = medir(
+            lambda: [Compatibility.verificar_compatibility_completa([j], [c, g, r])
+                     for j, (c, g, r) in zip(muestra, ternas)],
+            repeticiones, len(muestra)
+        )
+        resultados['compatibility/lote'] = medir(
+            lambda: Compatibility.verificar_compatibility_completa(juegos, [cpu, gpu, ram], explicar='incompatibles'),
+            repeticiones, len(juegos) * 3
+        )
+
+    # PerformanceCalculator: cálculo escalar por juego y por lotes sobre la instantánea
+    snapshot = get_requirements_snapshot()
+    filas = snapshot.filas[:LLAMADAS_INDIVIDUALES]
+    if filas:
+        resultados['performance/llamada'] = medir(
+            lambda: [PerformanceCalculator.calculate_game_performance(cpu, gpu, ram, fila) for fila in filas],
+            repeticiones, len(filas)
+        )
+        resultados['performance/lote'] = medir(
+            lambda: PerformanceCalculator.calculate_batch(cpu, gpu, ram, snapshot.arrays),
+            repeticiones, len(snapshot)
+        )
+
+    # BottleneckDetector: una terna por llamada y la matriz CPU × GPU completa
+    resultados['bottleneck/llamada'] = medir(
+        lambda: [BottleneckDetector.detect(c, g, r) for c, g, r in ternas],
+        repeticiones, len(ternas)
+    )
+    cpu_scores = np.array([h.benchmark_score for h in cpus], dtype=np.float64)
+    gpu_scores = np.array([h.benchmark_score for h in gpus], dtype=np.float64)
+    resultados['bottleneck/lote'] = medir(
+        lambda: BottleneckDetector.detect_batch(cpu_scores[:, None], gpu_scores[None, :]),
+        repeticiones, len(cpus) * len(gpus)
+    )
+
+    # Analizador: análisis completo con la instantánea caliente, y la carga en frío
+    resultados['analyzer/llamada'] = medir(
+        lambda: analyze_game_compatibility(cpu, gpu, ram),
+        repeticiones, max(len(snapshot), 1)
+    )
+
+    def carga_en_frio():
+        bump_catalog_version()
+        db.session.commit()
+        return get_requirements_snapshot().arrays
+
+    resultados['analyzer/instantanea_fria'] = medir(carga_en_frio, repeticiones, max(len(snapshot), 1))
+
+    return {f'{n_juegos}/{nombre}': medicion for nombre, medicion in resultados.items()}
+
+
+def comparar(actual, base, umbral):
+    """Lista de (clave, ratio) de las mediciones más lentas que la base en más del umbral"""
+    regresiones = []
+    for clave, medicion in actual.items():
+        anterior = base.get(clave)
+        if not anterior or not anterior.get('mediana_s'):
+            continue
+        ratio = medicion['mediana_s'] / anterior['mediana_s']
+        medicion['ratio_base'] = round(ratio, 3)
+        if ratio > 1 + umbral:
+            regresiones.append((clave, ratio))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de los motores de compatibilidad y del analizador')
+    parser.add_argument('--tamanos', default=','.join(str(t) for t in TAMANOS),
+                        help='número de juegos de cada catálogo, separados por comas')
+    parser.add_argument('--repeticiones', type=int, default=5, help='repeticiones por medición (se usa la mediana)')
+    parser.add_argument('--base', default=BASE_POR_DEFECTO, help='archivo JSON de la línea base')
+    parser.add_argument('--salida', help='archivo JSON donde guardar los resultados de esta ejecución')
+    parser.add_argument('--umbral', type=float, default=UMBRAL_POR_DEFECTO,
+                        help='fracción de empeoramiento tolerada antes de marcar regresión (0.2 = 20%%)')
+    parser.add_argument('--guardar-base', action='store_true', help='guardar los resultados como nueva línea base')
+    args = parser.parse_args()
+
+    tamanos = [int(t) for t in args.tamanos.split(',') if t.strip()]
+
+    print("="*60)
+    print("BENCHMARK DE MOTORES DE COMPATIBILIDAD Y ANALIZADOR")
+    print("="*60)
+
+    resultados = {}
+    with app.app_context():
+        db.create_all()
+        if not db.session.get(CatalogVersion, 1):
+            db.session.add(CatalogVersion(id=1, version=1))
+            db.session.commit()
+
+        for n_juegos in tamanos:
+            print(f"\n📦 Catálogo sintético: {n_juegos} juegos, "
+                  f"{N_CPUS + N_GPUS + N_RAMS + N_MOTHERBOARDS} componentes")
+            medidas = benchmark_tamano(n_juegos, args.repeticiones)
+            for clave, medicion in medidas.items():
+                print(f"  {clave:<40} {medicion['mediana_s'] * 1000:>10.2f} ms "
+                      f"{medicion['us_por_item']:>10.2f} µs/item")
+            resultados.update(medidas)
+
+    informe = {
+        'meta': {
+            'fecha': datetime.utcnow().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'repeticiones': args.repeticiones
+        },
+        'resultados': resultados
+    }
+
+    regresiones = []
+    if os.path.exists(args.base) and not args.guardar_base:
+        with open(args.base, encoding='utf-8') as f:
+            base = json.load(f).get('resultados', {})
+        regresiones = comparar(resultados, base, args.umbral)
+        print("\n" + "="*60)
+        if regresiones:
+            print(f"❌ {len(regresiones)} regresiones (umbral {args.umbral:.0%}):")
+            for clave, ratio in regresiones:
+                print(f"  - {clave}: {ratio:.2f}x la línea base")
+        else:
+            print(f"✅ Sin regresiones respecto a {args.base} (umbral {args.umbral:.0%})")
+    elif not args.guardar_base:
+        print(f"\n⚠️  No hay línea base en {args.base}; ejecuta con --guardar-base para crearla")
+
+    destinos = [args.salida] if args.salida else []
+    if args.guardar_base:
+        destinos.append(args.base)
+    for destino in destinos:
+        os.makedirs(os.path.dirname(os.path.abspath(destino)), exist_ok=True)
+        with open(destino, 'w', encoding='utf-8') as f:
+            json.dump(informe, f, indent=2, ensure_ascii=False)
+        print(f"💾 Resultados guardados en {destino}")
+
+    return 1 if regresiones else 0
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    except Exception as e:
+        print(f"\n❌ Error fatal: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,42 @@
+"""
+Script para reconstruir la tabla de productos relacionados
+Crea la tabla related_products si no existe y recalcula los vecinos de todos
+los juegos y componentes. Tras la carga inicial, el panel de administración
+la mantiene al día de forma incremental.
+Uso: python scripts/build_related_products.py [--tipo game|hardware]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db
+from models.database_models import RelatedProduct
+from utils.related_products import reconstruir_relacionados, K_RELACIONADOS, TIPOS
+
+def build_related_products(tipos):
+    """Recalcular los vecinos de los tipos indicados"""
+    with app.app_context():
+        print("="*60)
+        print("PRODUCTOS RELACIONADOS")
+        print("="*60)
+        print()
+
+        RelatedProduct.__table__.create(bind=db.engine, checkfirst=True)
+
+        for tipo in tipos:
+            inicio = time.perf_counter()
+            total = reconstruir_relacionados(tipo)
+            duracion = time.perf_counter() - inicio
+            print(f"✓ {tipo}: {total} productos, {K_RELACIONADOS} vecinos cada uno ({duracion:.2f} s)")
+
+        print("\n✅ Productos relacionados actualizados")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Reconstruir la tabla de productos relacionados')
+    parser.add_argument('--tipo', choices=sorted(TIPOS), help='solo un tipo de producto')
+    args = parser.parse_args()
+    build_related_products([args.tipo] if args.tipo else list(TIPOS))
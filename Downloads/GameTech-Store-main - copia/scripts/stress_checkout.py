@@ -0,0 +1,167 @@
+"""
+Prueba de carga del checkout con compras simultáneas sobre los mismos productos
+Crea una base de datos SQLite temporal con unos pocos productos "calientes" de
+stock limitado y muchos compradores cuyo carrito los incluye, lanza los
+checkouts desde varios hilos con utils.checkout.crear_orden y comprueba que
+no hay sobreventa: el stock nunca baja de cero y lo vendido en las órdenes
+coincide exactamente con lo descontado. Informa de órdenes por segundo.
+
+Uso:
+    python scripts/stress_checkout.py
+    python scripts/stress_checkout.py --hilos 32 --compradores 2000 --stock 150
+
+Devuelve código 1 si detecta sobreventa o inconsistencias.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Agregar el directorio raíz al path
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# La base de datos temporal se configura antes de importar la aplicación;
+# cada conexión espera hasta 30 s al bloqueo de escritura de SQLite
+_db_file = os.path.join(tempfile.mkdtemp(prefix='gametech_stress_'), 'stress.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{_db_file}?timeout=30'
+
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
+
+from app import app, db
+from models.database_models import CartItem, Game, Hardware, Order, OrderItem, User
+from utils.cart_view import CarritoVista
+from utils.checkout import StockInsuficiente, crear_orden
+
+# Reintentos cuando SQLite sigue bloqueada tras el timeout de la conexión
+REINTENTOS = 5
+
+
+def preparar(compradores, productos, stock, max_cantidad, semilla):
+    """Productos calientes y un carrito por comprador; devuelve los ids de usuario"""
+    rng = random.Random(semilla)
+    db.create_all()
+
+    calientes = []
+    for i in range(productos):
+        if i % 2 == 0:
+            producto = Game(nombre=f'Juego caliente {i}', descripcion='-', precio=59.99, genero='Acción', stock=stock)
+        else:
+            producto = Hardware(tipo='GPU', marca='Stress', modelo=f'GPU {i}', precio=499.99, stock=stock)
+        db.session.add(producto)
+        calientes.append(producto)
+
+    usuarios = [
+        User(username=f'comprador{i}', email=f'comprador{i}@stress.local', password_hash='-')
+        for i in range(compradores)
+    ]
+    db.session.add_all(usuarios)
+    db.session.flush()
+
+    for usuario in usuarios:
+        # Cada carrito toma 1-3 productos calientes en orden aleatorio
+        for producto in rng.sample(calientes, rng.randint(1, min(3, len(calientes)))):
+            db.session.add(CartItem(
+                user_id=usuario.id,
+                product_type='game' if isinstance(producto, Game) else 'hardware',
+                product_id=producto.id,
+                quantity=rng.randint(1, max_cantidad)
+            ))
+    db.session.commit()
+    return [usuario.id for usuario in usuarios]
+
+
+def comprar(user_id, contadores, lock):
+    """Checkout de un comprador en su propio contexto de aplicación"""
+    with app.app_context():
+        for _ in range(REINTENTOS):
+            carrito = CarritoVista.de_usuario(user_id)
+            try:
+                crear_orden(user_id, carrito)
+                resultado = 'ordenes'
+            except StockInsuficiente:
+                resultado = 'sin_stock'
+            except OperationalError:
+                with lock:
+                    contadores['reintentos'] += 1
+                continue
+            break
+        else:
+            resultado = 'fallidas'
+        with lock:
+            contadores[resultado] += 1
+
+
+def verificar(stock):
+    """Lista de errores: stock negativo o vendido != descontado"""
+    errores = []
+    for modelo, product_type in ((Game, 'game'), (Hardware, 'hardware')):
+        for producto in modelo.query.all():
+            vendido = db.session.query(func.coalesce(func.sum(OrderItem.quantity), 0)).filter(
+                OrderItem.product_type == product_type, OrderItem.product_id == producto.id
+            ).scalar()
+            print(f"  {product_type} {producto.id}: vendidos {vendido:>5}, stock final {producto.stock:>4}")
+            if producto.stock < 0:
+                errores.append(f'{product_type} {producto.id} con stock negativo ({producto.stock})')
+            if vendido != stock - producto.stock:
+                errores.append(f'{product_type} {producto.id}: vendidos {vendido} pero descontados {stock - producto.stock}')
+    return errores
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prueba de carga del checkout (sobreventa y órdenes/s)')
+    parser.add_argument('--hilos', type=int, default=16, help='checkouts simultáneos')
+    parser.add_argument('--compradores', type=int, default=500, help='número de carritos')
+    parser.add_argument('--productos', type=int, default=4, help='productos calientes')
+    parser.add_argument('--stock', type=int, default=200, help='stock inicial de cada producto')
+    parser.add_argument('--max-cantidad', type=int, default=3, help='unidades máximas por línea')
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    with app.app_context():
+        usuarios = preparar(args.compradores, args.productos, args.stock, args.max_cantidad, args.semilla)
+
+    print("="*60)
+    print("PRUEBA DE CARGA DEL CHECKOUT")
+    print("="*60)
+    print(f"Base de datos: {_db_file}")
+    print(f"{args.compradores} compradores, {args.hilos} hilos, "
+          f"{args.productos} productos con stock {args.stock}\n")
+
+    contadores = {'ordenes': 0, 'sin_stock': 0, 'fallidas': 0, 'reintentos': 0}
+    lock = threading.Lock()
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.hilos) as pool:
+        for futuro in [pool.submit(comprar, uid, contadores, lock) for uid in usuarios]:
+            futuro.result()
+    duracion = time.perf_counter() - inicio
+
+    with app.app_context():
+        errores = verificar(args.stock)
+        ordenes = Order.query.count()
+
+    print()
+    print(f"Órdenes creadas:      {contadores['ordenes']} (en la base de datos: {ordenes})")
+    print(f"Rechazadas sin stock: {contadores['sin_stock']}")
+    print(f"Fallidas por bloqueo: {contadores['fallidas']} ({contadores['reintentos']} reintentos)")
+    print(f"Tiempo: {duracion:.2f} s -> {contadores['ordenes'] / duracion:.1f} órdenes/s, "
+          f"{args.compradores / duracion:.1f} checkouts/s")
+
+    if ordenes != contadores['ordenes']:
+        errores.append(f'{ordenes} órdenes en la base de datos y {contadores["ordenes"]} confirmadas')
+    if errores:
+        print("\n❌ Inconsistencias:")
+        for error in errores:
+            print(f"  - {error}")
+        return 1
+    print("\n✅ Sin sobreventa")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
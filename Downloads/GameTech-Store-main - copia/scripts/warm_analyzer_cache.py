@@ -0,0 +1,94 @@
+"""
+Script para precalcular las respuestas del analizador de hardware
+Calcula todas las combinaciones CPU × GPU × RAM del catálogo en varios procesos
+y las guarda en la tabla analyzer_results para la versión actual del catálogo
+Uso: python scripts/warm_analyzer_cache.py [--workers N]
+"""
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db
+from controllers.hardware_analyzer import build_analysis
+from models.database_models import Hardware, AnalyzerResult
+from utils.catalog_version import get_catalog_version
+
+def _init_worker():
+    """Cada proceso abre sus propias conexiones (no se comparten tras el fork)"""
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+def _analizar_cpu(cpu_id, gpu_ids, ram_ids):
+    """Calcular todas las combinaciones de una CPU (unidad de trabajo de un proceso)"""
+    with app.app_context():
+        cpu = Hardware.get_hardware_by_id(cpu_id)
+        gpus = Hardware.query.filter(Hardware.id.in_(gpu_ids)).all()
+        rams = Hardware.query.filter(Hardware.id.in_(ram_ids)).all()
+
+        filas = []
+        for gpu in gpus:
+            for ram in rams:
+                payload = app.json.dumps(build_analysis(cpu, gpu, ram))
+                filas.append((cpu.id, gpu.id, ram.id, payload))
+        return filas
+
+def warm_analyzer_cache(workers=None):
+    """Precalcular y guardar las respuestas del analizador"""
+    with app.app_context():
+        print("="*60)
+        print("PRECÁLCULO DEL ANALIZADOR DE HARDWARE")
+        print("="*60)
+        print()
+
+        AnalyzerResult.__table__.create(bind=db.engine, checkfirst=True)
+
+        version = get_catalog_version()
+        cpu_ids = [h.id for h in Hardware.get_hardware_by_tipo('CPU')]
+        gpu_ids = [h.id for h in Hardware.get_hardware_by_tipo('GPU')]
+        ram_ids = [h.id for h in Hardware.get_hardware_by_tipo('RAM')]
+        total = len(cpu_ids) * len(gpu_ids) * len(ram_ids)
+        print(f"📦 Versión del catálogo: {version}")
+        print(f"🔢 Combinaciones: {len(cpu_ids)} CPU × {len(gpu_ids)} GPU × {len(ram_ids)} RAM = {total}")
+
+        # Las respuestas de la versión actual se regeneran completas
+        AnalyzerResult.query.filter_by(catalog_version=version).delete()
+        db.session.commit()
+        db.engine.dispose()
+
+        guardadas = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futuros = [pool.submit(_analizar_cpu, cpu_id, gpu_ids, ram_ids) for cpu_id in cpu_ids]
+            for futuro in futuros:
+                filas = futuro.result()
+                db.session.bulk_insert_mappings(AnalyzerResult, [
+                    {'cpu_id': cpu_id, 'gpu_id': gpu_id, 'ram_id': ram_id,
+                     'catalog_version': version, 'payload': payload}
+                    for cpu_id, gpu_id, ram_id, payload in filas
+                ])
+                db.session.commit()
+                guardadas += len(filas)
+                print(f"  ✅ {guardadas}/{total} combinaciones guardadas")
+
+        # Las versiones anteriores ya no se consultan
+        eliminadas = AnalyzerResult.query.filter(AnalyzerResult.catalog_version != version).delete()
+        db.session.commit()
+
+        print("\n" + "="*60)
+        print(f"✅ Respuestas precalculadas: {guardadas}")
+        print(f"🗑️  Respuestas de versiones anteriores eliminadas: {eliminadas}")
+        print("="*60)
+
+if __name__ == '__main__':
+    try:
+        workers = None
+        if '--workers' in sys.argv:
+            workers = int(sys.argv[sys.argv.index('--workers') + 1])
+        warm_analyzer_cache(workers)
+    except Exception as e:
+        print(f"\n❌ Error fatal: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -32,17 +32,25 @@ async function analyzeHardware() {
     showLoading(true);
     hideResults();
     
+    const payload = {
+        cpu_id: Number.parseInt(cpuId),
+        gpu_id: Number.parseInt(gpuId),
+        ram_id: Number.parseInt(ramId)
+    };
+    
     try {
+        // Con streams disponibles se muestra cada bloque en cuanto llega
+        if (globalThis.ReadableStream && globalThis.TextDecoder) {
+            await analyzeHardwareStream(payload);
+            return;
+        }
+        
         const response = await fetch('/api/analizar-hardware', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({
-                cpu_id: Number.parseInt(cpuId),
-                gpu_id: Number.parseInt(gpuId),
-                ram_id: Number.parseInt(ramId)
-            })
+            body: JSON.stringify(payload)
         });
         
         if (!response.ok) {
@@ -66,6 +74,76 @@ async function analyzeHardware() {
     }
 }
 
+/**
+ * Análisis en streaming (NDJSON): una línea de resumen y luego bloques de juegos
+ */
+async function analyzeHardwareStream(payload) {
+    const response = await fetch('/api/analizar-hardware/stream', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(payload)
+    });
+    
+    if (!response.ok || !response.body) {
+        throw new Error('Error en la respuesta del servidor');
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { done, value } = await reader.read();
+        buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+        
+        // Procesar todas las líneas completas; el resto queda para la siguiente lectura
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        for (const line of lines) {
+            if (line.trim()) {
+                handleStreamMessage(JSON.parse(line));
+            }
+        }
+        
+        if (done) {
+            break;
+        }
+    }
+}
+
+/**
+ * Procesar un mensaje del stream del analizador
+ */
+function handleStreamMessage(message) {
+    if (message.type === 'summary') {
+        currentAnalysis = {
+            success: true,
+            system_score: message.system_score,
+            bottlenecks: message.bottlenecks,
+            recommendations: message.recommendations,
+            games: emptyGameCategories()
+        };
+        displaySystemScore(message.system_score);
+        displayBottlenecks(message.bottlenecks);
+        displayRecommendations(message.recommendations);
+        resetGameCompatibility();
+        
+        // Los resultados se muestran sin esperar a los juegos
+        showLoading(false);
+        document.getElementById('results-container').classList.remove('d-none');
+        document.getElementById('results-container').scrollIntoView({ 
+            behavior: 'smooth', 
+            block: 'start' 
+        });
+    } else if (message.type === 'games') {
+        appendGameCompatibility(message.games);
+    } else if (message.type === 'end') {
+        finishGameCompatibility();
+    }
+}
+
 /**
  * Mostrar todos los resultados
  */
@@ -240,6 +318,59 @@ function displayGameCompatibility(games) {
     renderGameCategory('cannot-games', games.cannot_run, 'cannot', 'danger');
 }
 
+// Categorías de juegos: clave de la respuesta, contenedor, contador, calidad y color
+const GAME_CATEGORIES = [
+    ['can_run_ultra', 'ultra-games', 'ultra-count', 'ultra', 'success'],
+    ['can_run_high', 'high-games', 'high-count', 'high', 'primary'],
+    ['can_run_medium', 'medium-games', 'medium-count', 'medium', 'warning'],
+    ['can_run_low', 'low-games', 'low-count', 'low', 'secondary'],
+    ['cannot_run', 'cannot-games', 'cannot-count', 'cannot', 'danger']
+];
+
+function emptyGameCategories() {
+    return Object.fromEntries(GAME_CATEGORIES.map(([key]) => [key, []]));
+}
+
+/**
+ * Vaciar las categorías antes de recibir juegos en streaming
+ */
+function resetGameCompatibility() {
+    for (const [, containerId, counterId] of GAME_CATEGORIES) {
+        document.getElementById(containerId).innerHTML = '';
+        document.getElementById(counterId).textContent = '0';
+    }
+}
+
+/**
+ * Añadir un bloque de juegos a las categorías ya mostradas
+ */
+function appendGameCompatibility(games) {
+    for (const [key, containerId, counterId, quality, badgeColor] of GAME_CATEGORIES) {
+        const block = games[key] || [];
+        if (block.length === 0) {
+            continue;
+        }
+        
+        currentAnalysis.games[key].push(...block);
+        document.getElementById(counterId).textContent = currentAnalysis.games[key].length;
+        document.getElementById(containerId).insertAdjacentHTML(
+            'beforeend',
+            block.map(game => renderGameCard(game, quality, badgeColor)).join('')
+        );
+    }
+}
+
+/**
+ * Mostrar el mensaje de categoría vacía al terminar el stream
+ */
+function finishGameCompatibility() {
+    for (const [key, containerId, , quality, badgeColor] of GAME_CATEGORIES) {
+        if (currentAnalysis.games[key].length === 0) {
+            renderGameCategory(containerId, [], quality, badgeColor);
+        }
+    }
+}
+
 /**
  * Renderizar categoría de juegos
  */
@@ -256,7 +387,14 @@ function renderGameCategory(containerId, games, quality, badgeColor) {
         return;
     }
     
-    const html = games.map(game => `
+    container.innerHTML = games.map(game => renderGameCard(game, quality, badgeColor)).join('');
+}
+
+/**
+ * HTML de la tarjeta de un juego
+ */
+function renderGameCard(game, quality, badgeColor) {
+    return `
         <div class="card game-card ${quality} mb-3">
             <div class="card-body">
                 <div class="row align-items-center">
@@ -297,9 +435,7 @@ function renderGameCategory(containerId, games, quality, badgeColor) {
                 </div>
             </div>
         </div>
-    `).join('');
-    
-    container.innerHTML = html;
+    `;
 }
 
 /**
@@ -35,6 +35,9 @@ function initializeCommonFeatures() {
     // Inicializar carrito de compras
     initializeShoppingCart();
 
+    // Autocompletado del buscador
+    initializeSearchSuggest();
+
     // Tooltips
     const tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'));
     tooltipTriggerList.map(function (tooltipTriggerEl) {
@@ -56,6 +59,72 @@ function initializeCommonFeatures() {
     }
 }
 
+/**
+ * Autocompletado del buscador de la barra de navegación (/api/suggest)
+ */
+function initializeSearchSuggest() {
+    const input = document.querySelector('form[action="/buscar"] input[name="q"]');
+    if (!input) {
+        return;
+    }
+
+    const form = input.closest('form');
+    form.classList.add('position-relative');
+    input.setAttribute('autocomplete', 'off');
+
+    const list = document.createElement('div');
+    list.className = 'list-group position-absolute top-100 start-0 shadow d-none';
+    list.style.zIndex = '1050';
+    list.style.minWidth = '100%';
+    form.appendChild(list);
+
+    let lastQuery = '';
+    const showSuggestions = GameTechUtils.debounce(async function() {
+        const query = input.value.trim();
+        if (query === lastQuery) {
+            return;
+        }
+        lastQuery = query;
+
+        if (!query) {
+            list.classList.add('d-none');
+            return;
+        }
+
+        try {
+            const response = await fetch(`/api/suggest?q=${encodeURIComponent(query)}`);
+            const data = await response.json();
+
+            // Descartar respuestas de consultas anteriores
+            if (query !== lastQuery) {
+                return;
+            }
+
+            list.innerHTML = '';
+            for (const sugerencia of data.sugerencias) {
+                const item = document.createElement('a');
+                item.className = 'list-group-item list-group-item-action';
+                item.href = sugerencia.url;
+                const icon = sugerencia.tipo === 'game' ? 'fa-gamepad' : 'fa-microchip';
+                item.innerHTML = `<i class="fas ${icon} me-2 text-muted"></i>`;
+                item.appendChild(document.createTextNode(sugerencia.label));
+                list.appendChild(item);
+            }
+            list.classList.toggle('d-none', data.sugerencias.length === 0);
+        } catch (error) {
+            console.error('Error cargando sugerencias:', error);
+        }
+    }, 150);
+
+    input.addEventListener('input', showSuggestions);
+    input.addEventListener('blur', () => setTimeout(() => list.classList.add('d-none'), 200));
+    input.addEventListener('focus', () => {
+        if (list.children.length > 0 && input.value.trim()) {
+            list.classList.remove('d-none');
+        }
+    });
+}
+
 /**
  * Inicializar funcionalidades de la página principal
  */
@@ -233,12 +302,18 @@ function initializeImageGallery() {
     const galleryImages = document.querySelectorAll('.gallery-image');
     const mainImage = document.querySelector('.main-image');
 
-    for (const t of galleryImages) {
-            t.classList.remove('active');
-        }
+    for (const image of galleryImages) {
+        image.addEventListener('click', function() {
+            if (mainImage) {
+                mainImage.src = this.src;
+            }
+            for (const t of galleryImages) {
+                t.classList.remove('active');
+            }
 
-        this.classList.add('active');
-    };
+            this.classList.add('active');
+        });
+    }
 }
 
 /**
@@ -4,6 +4,13 @@ Analiza el balance entre CPU, GPU y RAM
 """
 import re
 
+import numpy as np
+
+# Códigos del modo por lotes (índice -> valor de 'type' / 'severity')
+BOTTLENECK_TYPES = ('balanced', 'cpu', 'gpu', 'unknown')
+TYPE_BALANCED, TYPE_CPU, TYPE_GPU, TYPE_UNKNOWN = range(4)
+SEVERITY_LEVELS = ('none', 'mild', 'moderate', 'severe')
+
 class BottleneckDetector:
     """Detecta y analiza cuellos de botella en hardware"""
     
@@ -12,6 +19,47 @@ class BottleneckDetector:
     MODERATE_RATIO = 2.0 # 2x diferencia = moderado
     MILD_RATIO = 1.5     # 1.5x diferencia = leve
     
+    @staticmethod
+    def detect_batch(cpu_scores, gpu_scores):
+        """
+        Cuello de botella CPU/GPU de muchos pares a la vez (sin RAM).
+        Los scores se propagan (broadcast); p. ej. una columna de CPUs contra
+        una fila de GPUs da la matriz completa del catálogo.
+        
+        Returns:
+            dict de arrays: type (códigos de BOTTLENECK_TYPES), severity
+            (códigos de SEVERITY_LEVELS) y percentage_loss
+        """
+        c, g = np.broadcast_arrays(
+            np.asarray(cpu_scores, dtype=np.float64),
+            np.asarray(gpu_scores, dtype=np.float64)
+        )
+        validos = (c != 0) & (g != 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gpu_cpu_ratio = np.where(validos, g / c, 0)
+            cpu_gpu_ratio = np.where(validos, c / g, 0)
+        
+        es_cpu = validos & (gpu_cpu_ratio >= BottleneckDetector.MILD_RATIO)
+        es_gpu = validos & ~es_cpu & (cpu_gpu_ratio >= BottleneckDetector.MILD_RATIO)
+        
+        tipo = np.where(validos, TYPE_BALANCED, TYPE_UNKNOWN).astype(np.int8)
+        severidad = np.zeros(c.shape, dtype=np.int8)
+        perdida = np.zeros(c.shape, dtype=np.uint8)
+        
+        # Mismo recorrido de umbrales que _apply_thresholds: gana el primero que se cumple
+        for ratio, pendiente, umbrales, codigo in (
+            (gpu_cpu_ratio, es_cpu, BottleneckDetector._cpu_thresholds(), TYPE_CPU),
+            (cpu_gpu_ratio, es_gpu, BottleneckDetector._gpu_thresholds(), TYPE_GPU)
+        ):
+            for threshold, severity, percent, *_ in umbrales:
+                aplica = pendiente & (ratio >= threshold)
+                tipo[aplica] = codigo
+                severidad[aplica] = SEVERITY_LEVELS.index(severity)
+                perdida[aplica] = percent
+                pendiente = pendiente & ~aplica
+        
+        return {'type': tipo, 'severity': severidad, 'percentage_loss': perdida}
+    
     @staticmethod
     def detect(cpu, gpu, ram):
         """
@@ -77,9 +125,9 @@ class BottleneckDetector:
                 result,
                 threshold_data[1],       # severity
                 threshold_data[2],       # percent
-                threshold_data[3],       # multiplier
                 threshold_data[4],       # desc
                 threshold_data[5],       # rec
+                threshold_data[3],       # multiplier
                 cpu_score,
                 gpu_score,
                 kind
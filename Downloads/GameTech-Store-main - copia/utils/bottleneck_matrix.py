@@ -0,0 +1,135 @@
+"""
+Matriz de cuellos de botella CPU × GPU de todo el catálogo
+Guarda por cada par el tipo, la severidad y el porcentaje de pérdida en
+arrays compactos (int8/uint8). Cuando cambia el catálogo solo se recalculan
+las filas o columnas de los componentes cuyo benchmark_score cambió; si
+aparecen o desaparecen componentes se reconstruye completa.
+"""
+import threading
+
+import numpy as np
+
+from extensions import db
+from models.database_models import Hardware
+from utils.bottleneck_detector import BottleneckDetector, BOTTLENECK_TYPES, SEVERITY_LEVELS
+from utils.catalog_version import get_catalog_version
+
+
+class BottleneckMatrix:
+    """Severidad y pérdida de rendimiento para cada par (CPU, GPU)"""
+
+    def __init__(self, version, cpus, gpus):
+        """
+        Args:
+            version: sello del catálogo con el que se construyó
+            cpus, gpus: listas de (id, benchmark_score) ordenadas por id
+        """
+        self.version = version
+        self.cpu_ids = np.array([h[0] for h in cpus], dtype=np.int64)
+        self.gpu_ids = np.array([h[0] for h in gpus], dtype=np.int64)
+        self.cpu_scores = np.array([h[1] or 0 for h in cpus], dtype=np.float64)
+        self.gpu_scores = np.array([h[1] or 0 for h in gpus], dtype=np.float64)
+        self._filas = {cpu_id: i for i, cpu_id in enumerate(self.cpu_ids.tolist())}
+        self._columnas = {gpu_id: j for j, gpu_id in enumerate(self.gpu_ids.tolist())}
+
+        resultado = BottleneckDetector.detect_batch(self.cpu_scores[:, None], self.gpu_scores[None, :])
+        self.tipo = resultado['type']
+        self.severidad = resultado['severity']
+        self.perdida = resultado['percentage_loss']
+
+    def mismos_componentes(self, cpus, gpus):
+        """True si el catálogo tiene exactamente las mismas CPUs y GPUs"""
+        return (
+            [h[0] for h in cpus] == self.cpu_ids.tolist() and
+            [h[0] for h in gpus] == self.gpu_ids.tolist()
+        )
+
+    def actualizar_score(self, hardware_id, score):
+        """Recalcular solo la fila (CPU) o la columna (GPU) de un componente"""
+        score = score or 0
+        if hardware_id in self._filas:
+            i = self._filas[hardware_id]
+            self.cpu_scores[i] = score
+            resultado = BottleneckDetector.detect_batch(score, self.gpu_scores)
+            self.tipo[i], self.severidad[i], self.perdida[i] = (
+                resultado['type'], resultado['severity'], resultado['percentage_loss']
+            )
+        elif hardware_id in self._columnas:
+            j = self._columnas[hardware_id]
+            self.gpu_scores[j] = score
+            resultado = BottleneckDetector.detect_batch(self.cpu_scores, score)
+            self.tipo[:, j], self.severidad[:, j], self.perdida[:, j] = (
+                resultado['type'], resultado['severity'], resultado['percentage_loss']
+            )
+
+    def fila(self, cpu_id):
+        """Pares de una CPU con todas las GPUs (None si la CPU no existe)"""
+        if cpu_id not in self._filas:
+            return None
+        i = self._filas[cpu_id]
+        return self._serializar('gpu_ids', self.gpu_ids, self.tipo[i], self.severidad[i], self.perdida[i])
+
+    def columna(self, gpu_id):
+        """Pares de una GPU con todas las CPUs (None si la GPU no existe)"""
+        if gpu_id not in self._columnas:
+            return None
+        j = self._columnas[gpu_id]
+        return self._serializar(
+            'cpu_ids', self.cpu_ids, self.tipo[:, j], self.severidad[:, j], self.perdida[:, j]
+        )
+
+    @staticmethod
+    def _serializar(clave_ids, ids, tipo, severidad, perdida):
+        """Listas paralelas: compactas en JSON y fáciles de indexar en el cliente"""
+        tipos = np.asarray(BOTTLENECK_TYPES, dtype=object)
+        severidades = np.asarray(SEVERITY_LEVELS, dtype=object)
+        return {
+            clave_ids: ids.tolist(),
+            'type': tipos[tipo].tolist(),
+            'severity': severidades[severidad].tolist(),
+            'percentage_loss': perdida.tolist()
+        }
+
+
+_lock = threading.Lock()
+_actual = {'matriz': None}
+
+
+def get_bottleneck_matrix():
+    """Matriz vigente; se actualiza de forma incremental si cambió el catálogo"""
+    version = get_catalog_version()
+    matriz = _actual['matriz']
+    if matriz is not None and matriz.version == version:
+        return matriz
+
+    with _lock:
+        matriz = _actual['matriz']
+        if matriz is not None and matriz.version == version:
+            return matriz
+
+        cpus, gpus = _cargar_scores()
+        if matriz is not None and matriz.mismos_componentes(cpus, gpus):
+            # Mismos componentes: solo se recalculan las filas/columnas con otro score
+            for ids, scores, nuevos in ((matriz.cpu_ids, matriz.cpu_scores, cpus),
+                                        (matriz.gpu_ids, matriz.gpu_scores, gpus)):
+                for hardware_id, anterior, (_, score) in zip(ids.tolist(), scores.tolist(), nuevos):
+                    if (score or 0) != anterior:
+                        matriz.actualizar_score(hardware_id, score)
+            matriz.version = version
+        else:
+            matriz = BottleneckMatrix(version, cpus, gpus)
+            _actual['matriz'] = matriz
+    return matriz
+
+
+def _cargar_scores():
+    """(id, benchmark_score) de CPUs y GPUs en una sola consulta ligera"""
+    query = (
+        db.session.query(Hardware.id, Hardware.tipo, Hardware.benchmark_score)
+        .filter(Hardware.tipo.in_(('CPU', 'GPU')))
+        .order_by(Hardware.id)
+    )
+    cpus, gpus = [], []
+    for hardware_id, tipo, score in query:
+        (cpus if tipo == 'CPU' else gpus).append((hardware_id, score))
+    return cpus, gpus
@@ -0,0 +1,221 @@
+"""
+Optimizador de builds de PC con presupuesto
+Busca las mejores combinaciones CPU + GPU + RAM + Motherboard sin recorrer el
+producto cartesiano completo: cada categoría se reduce a su frontera
+precio/rendimiento y la búsqueda final es un branch-and-bound que descarta
+ramas cuya cota superior no alcanza al k-ésimo mejor build encontrado.
+"""
+import heapq
+from bisect import bisect_right
+from collections import namedtuple
+from itertools import accumulate
+
+from models.database_models import Hardware
+from utils.catalog_version import get_catalog_version
+from utils.result_cache import ResultCache
+
+# Ponderación de la puntuación del sistema (igual que el analizador de hardware)
+PESO_GPU = 0.5
+PESO_CPU = 0.35
+PESO_RAM = 0.15
+PUNTOS_POR_GB_RAM = 100
+
+# Niveles de calidad objetivo (mismos umbrales que PerformanceCalculator)
+CALIDADES = ('low', 'medium', 'high', 'ultra')
+
+MAX_TOP_K = 20
+
+Pieza = namedtuple('Pieza', ['id', 'marca', 'modelo', 'precio', 'score', 'socket', 'rendimiento'])
+
+# Piezas candidatas por versión de catálogo (evita cargar el hardware en cada petición)
+piezas_cache = ResultCache('optimizador_piezas', maxsize=4, ttl=600)
+
+
+def _normalizar_socket(socket):
+    """'lga1700 ' / 'LGA 1700' -> 'LGA1700' (None si no se conoce)"""
+    if not socket:
+        return None
+    return ''.join(str(socket).split()).upper() or None
+
+
+def _socket(componente):
+    """Socket de la columna o, si falta, de las especificaciones"""
+    return _normalizar_socket(componente.socket or componente.get_especificaciones().get('socket'))
+
+
+class BuildOptimizer:
+    """Busca los mejores builds dentro de un presupuesto"""
+
+    @staticmethod
+    def cargar_piezas():
+        """Piezas por categoría como tuplas inmutables, cacheadas por versión de catálogo"""
+        return piezas_cache.get_or_set(get_catalog_version(), BuildOptimizer._leer_piezas)
+
+    @staticmethod
+    def _leer_piezas():
+        piezas = {'CPU': [], 'GPU': [], 'RAM': [], 'Motherboard': []}
+        componentes = Hardware.query.filter(Hardware.tipo.in_(list(piezas))).all()
+        for h in componentes:
+            if h.tipo == 'RAM':
+                score = h.get_ram_capacity_gb()
+                rendimiento = score * PUNTOS_POR_GB_RAM * PESO_RAM
+            else:
+                score = h.benchmark_score or 0
+                rendimiento = score * (PESO_CPU if h.tipo == 'CPU' else PESO_GPU)
+            socket = _socket(h) if h.tipo in ('CPU', 'Motherboard') else None
+            piezas[h.tipo].append(Pieza(h.id, h.marca, h.modelo, h.precio, score, socket, rendimiento))
+        return piezas
+
+    @staticmethod
+    def umbrales(requisitos, calidad):
+        """
+        Scores mínimos (cpu, gpu, ram_gb) para alcanzar una calidad en un juego
+
+        Args:
+            requisitos: GameRequirements del juego
+            calidad: 'low', 'medium', 'high' o 'ultra'
+        """
+        if calidad == 'ultra':
+            return requisitos.ultra_cpu_score, requisitos.ultra_gpu_score, requisitos.ultra_ram_gb
+        if calidad == 'high':
+            return requisitos.rec_cpu_score, requisitos.rec_gpu_score, requisitos.rec_ram_gb
+        if calidad == 'medium':
+            return requisitos.min_cpu_score * 1.2, requisitos.min_gpu_score * 1.2, requisitos.min_ram_gb
+        return requisitos.min_cpu_score, requisitos.min_gpu_score, requisitos.min_ram_gb
+
+    @staticmethod
+    def optimize(presupuesto, top_k=5, umbrales=None, piezas=None):
+        """
+        Mejores builds (mayor puntuación del sistema) que no superan el presupuesto
+
+        Args:
+            presupuesto: precio total máximo
+            top_k: número de builds a devolver
+            umbrales: (cpu_score, gpu_score, ram_gb) mínimos o None
+            piezas: dict tipo -> lista de Pieza (por defecto, el catálogo)
+
+        Returns:
+            lista de dicts {cpu, gpu, ram, motherboard, precio, rendimiento}
+            ordenada de mejor a peor
+        """
+        if piezas is None:
+            piezas = BuildOptimizer.cargar_piezas()
+        min_cpu, min_gpu, min_ram = umbrales or (0, 0, 0)
+
+        cpus = [p for p in piezas['CPU'] if p.score >= min_cpu]
+        gpus = [p for p in piezas['GPU'] if p.score >= min_gpu]
+        rams = [p for p in piezas['RAM'] if p.score >= min_ram]
+
+        plataformas = BuildOptimizer._plataformas(cpus, piezas['Motherboard'])
+        plataformas = BuildOptimizer._frontera(plataformas, top_k)
+        gpus = BuildOptimizer._frontera([(p.precio, p.rendimiento, p) for p in gpus], top_k)
+        rams = BuildOptimizer._frontera([(p.precio, p.rendimiento, p) for p in rams], top_k)
+        if not (plataformas and gpus and rams):
+            return []
+
+        return BuildOptimizer._branch_and_bound(presupuesto, top_k, plataformas, gpus, rams)
+
+    @staticmethod
+    def _plataformas(cpus, motherboards):
+        """
+        Pares (CPU, Motherboard) compatibles como piezas combinadas. La placa
+        no suma rendimiento, así que para cada CPU solo interesa la placa más
+        barata de su socket (las de socket desconocido valen para cualquiera).
+        """
+        mas_barata = {}
+        for placa in motherboards:
+            if placa.socket not in mas_barata or placa.precio < mas_barata[placa.socket].precio:
+                mas_barata[placa.socket] = placa
+        comodin = mas_barata.get(None)
+        mas_barata_global = min(motherboards, key=lambda p: p.precio, default=None)
+
+        plataformas = []
+        for cpu in cpus:
+            if cpu.socket is None:
+                placa = mas_barata_global
+            else:
+                opciones = [p for p in (mas_barata.get(cpu.socket), comodin) if p is not None]
+                placa = min(opciones, key=lambda p: p.precio, default=None)
+            if placa is not None:
+                plataformas.append((cpu.precio + placa.precio, cpu.rendimiento, cpu, placa))
+        return plataformas
+
+    @staticmethod
+    def _frontera(items, k):
+        """
+        Frontera precio/rendimiento de orden k (k-skyband): se descartan las
+        piezas para las que ya hay k alternativas igual de baratas y al menos
+        igual de rápidas, porque nunca pueden entrar en el top-k.
+
+        Recibe y devuelve tuplas (precio, rendimiento, ...), ordenadas por precio.
+        """
+        items = sorted(items, key=lambda item: (item[0], -item[1]))
+
+        mejores = []  # min-heap con los k mejores rendimientos vistos
+        frontera = []
+        for item in items:
+            if len(mejores) < k:
+                heapq.heappush(mejores, item[1])
+            elif mejores[0] < item[1]:
+                heapq.heapreplace(mejores, item[1])
+            else:
+                continue
+            frontera.append(item)
+        return frontera
+
+    @staticmethod
+    def _branch_and_bound(presupuesto, top_k, plataformas, gpus, rams):
+        """Top-k builds: plataforma → GPU → RAM, podando por cota superior"""
+        precios_gpu = [g[0] for g in gpus]
+        precios_ram = [r[0] for r in rams]
+        # Mejor rendimiento alcanzable con un precio <= p (prefijos sobre la lista ordenada)
+        mejor_gpu = list(accumulate((g[1] for g in gpus), max))
+        mejor_ram = list(accumulate((r[1] for r in rams), max))
+        precio_min_gpu, precio_min_ram = precios_gpu[0], precios_ram[0]
+
+        def mejor_hasta(precios, mejores, limite):
+            i = bisect_right(precios, limite)
+            return mejores[i - 1] if i else None
+
+        top = []  # min-heap de (rendimiento, -precio, contador, build)
+        contador = 0
+        # Las plataformas más rápidas primero: el umbral de poda sube antes
+        for precio_p, rend_p, cpu, placa in sorted(plataformas, key=lambda p: -p[1]):
+            resto = presupuesto - precio_p
+            if resto < precio_min_gpu + precio_min_ram:
+                continue
+            cota_gpu = mejor_hasta(precios_gpu, mejor_gpu, resto - precio_min_ram)
+            cota_ram = mejor_hasta(precios_ram, mejor_ram, resto - precio_min_gpu)
+            if len(top) == top_k and rend_p + cota_gpu + cota_ram <= top[0][0]:
+                continue
+
+            for precio_g, rend_g, gpu in gpus[:bisect_right(precios_gpu, resto - precio_min_ram)]:
+                resto_ram = resto - precio_g
+                cota = mejor_hasta(precios_ram, mejor_ram, resto_ram)
+                if len(top) == top_k and rend_p + rend_g + cota <= top[0][0]:
+                    continue
+
+                for precio_r, rend_r, ram in rams[:bisect_right(precios_ram, resto_ram)]:
+                    rendimiento = rend_p + rend_g + rend_r
+                    precio = precio_p + precio_g + precio_r
+                    clave = (rendimiento, -precio)
+                    if len(top) == top_k and clave <= top[0][:2]:
+                        continue
+                    contador += 1
+                    entrada = (rendimiento, -precio, contador, (cpu, gpu, ram, placa))
+                    if len(top) < top_k:
+                        heapq.heappush(top, entrada)
+                    else:
+                        heapq.heapreplace(top, entrada)
+
+        return [
+            {
+                'cpu': cpu,
+                'gpu': gpu,
+                'ram': ram,
+                'motherboard': placa,
+                'precio': round(-precio_negativo, 2),
+                'rendimiento': rendimiento
+            }
+            for rendimiento, precio_negativo, _, (cpu, gpu, ram, placa) in sorted(top, reverse=True)
+        ]
@@ -0,0 +1,36 @@
+"""
+Contador de productos del carrito guardado en la sesión
+La barra de navegación lo muestra en cada página; en lugar de un COUNT por
+render se guarda en la sesión junto al id del usuario. Las rutas del carrito
+lo actualizan o descartan al modificarlo y, por si el carrito cambia desde
+otra sesión del mismo usuario, caduca a los CONTADOR_TTL segundos.
+"""
+import time
+
+from flask import session
+from flask_login import current_user
+
+from models.database_models import CartItem
+
+CONTADOR_TTL = 300
+
+
+def contador_carrito():
+    """Número de productos distintos en el carrito del usuario actual"""
+    if not current_user.is_authenticated:
+        return 0
+    guardado = session.get('cart_count')
+    if guardado and guardado[0] == current_user.id and time.time() - guardado[2] < CONTADOR_TTL:
+        return guardado[1]
+    return guardar_contador_carrito(CartItem.query.filter_by(user_id=current_user.id).count())
+
+
+def guardar_contador_carrito(count):
+    """Guardar un contador ya conocido (p. ej. 0 tras vaciar el carrito)"""
+    session['cart_count'] = [current_user.id, count, time.time()]
+    return count
+
+
+def invalidar_contador_carrito():
+    """Forzar que el próximo render vuelva a contar"""
+    session.pop('cart_count', None)
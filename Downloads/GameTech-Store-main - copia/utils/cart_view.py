@@ -0,0 +1,71 @@
+"""
+Vista del carrito para el carrito, el checkout y la creación de órdenes
+Carga las líneas del usuario y sus juegos/hardware en un máximo de tres
+consultas (líneas + una IN (...) por tipo) y calcula subtotales y total una
+sola vez; las plantillas leen los valores ya calculados.
+"""
+from models.database_models import CartItem
+from utils.product_loader import get_product_loader
+
+
+class LineaCarrito:
+    """Item del carrito con su producto y subtotal"""
+
+    __slots__ = ('item', 'producto', 'subtotal')
+
+    def __init__(self, item, producto):
+        self.item = item
+        self.producto = producto
+        self.subtotal = producto.precio * item.quantity
+
+    @property
+    def id(self):
+        return self.item.id
+
+    @property
+    def product_type(self):
+        return self.item.product_type
+
+    @property
+    def product_id(self):
+        return self.item.product_id
+
+    @property
+    def quantity(self):
+        return self.item.quantity
+
+    @property
+    def nombre(self):
+        """Nombre para mostrar y para la línea de la orden"""
+        if self.item.product_type == 'game':
+            return self.producto.nombre
+        return f'{self.producto.marca} {self.producto.modelo}'
+
+
+class CarritoVista:
+    """Líneas del carrito de un usuario con los productos ya cargados"""
+
+    def __init__(self, items):
+        loader = get_product_loader()
+        loader.prime_many((item.product_type, item.product_id) for item in items)
+        self.lineas = []
+        # Items cuyo producto ya no existe (se omiten del total)
+        self.huerfanos = []
+        for item in items:
+            producto = loader.get(item.product_type, item.product_id)
+            if producto is None:
+                self.huerfanos.append(item)
+            else:
+                self.lineas.append(LineaCarrito(item, producto))
+        self.total = sum(linea.subtotal for linea in self.lineas)
+
+    @classmethod
+    def de_usuario(cls, user_id):
+        """Carrito del usuario (los items en orden de inserción)"""
+        return cls(CartItem.query.filter_by(user_id=user_id).order_by(CartItem.id).all())
+
+    def __iter__(self):
+        return iter(self.lineas)
+
+    def __len__(self):
+        return len(self.lineas)
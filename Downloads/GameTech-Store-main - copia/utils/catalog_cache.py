@@ -0,0 +1,224 @@
+"""
+Caché de lectura del catálogo compartida por las rutas de listado
+Guarda una instantánea inmutable de juegos y hardware (tuplas con las mismas
+columnas y métodos de lectura que los modelos), vistas agrupadas por tipo y
+por género y búsquedas por id. Se reconstruye cuando cambia el sello de
+versión del catálogo, que los workers comprueban con una lectura barata.
+Los cambios de stock no mueven el sello ni recargan las tablas: el worker que
+los confirma relee solo esas filas y las sustituye en la instantánea, y cada
+STOCK_TTL segundos se releen las columnas de stock para ver los de otros workers.
+"""
+import threading
+import time
+from collections import namedtuple
+from functools import cached_property
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models.database_models import Game, Hardware
+from utils.catalog_version import get_catalog_version, CAMPOS_VOLATILES
+
+# Segundos máximos que un worker muestra un stock modificado en otro worker
+STOCK_TTL = 30
+
+MODELOS_CACHEADOS = (Game, Hardware)
+
+
+def _clase_instantanea(modelo, metodos):
+    """Tupla inmutable con las columnas del modelo y sus métodos de solo lectura"""
+    campos = [columna.key for columna in modelo.__table__.columns]
+    base = namedtuple(f'{modelo.__name__}Snapshot', campos)
+    atributos = {'__slots__': ()}
+    atributos.update({metodo: getattr(modelo, metodo) for metodo in metodos})
+    return type(base.__name__, (base,), atributos)
+
+
+GameSnapshot = _clase_instantanea(Game, (
+    'get_requisitos_minimos', 'get_requisitos_recomendados', 'tiene_scores_requisitos', 'to_dict'
+))
+HardwareSnapshot = _clase_instantanea(Hardware, (
+    'get_especificaciones', 'get_ram_capacity_gb', 'get_vram_gb', 'to_dict'
+))
+
+
+def _agrupar(productos, campo):
+    """Diccionario valor -> tupla de productos, en orden de primera aparición"""
+    grupos = {}
+    for producto in productos:
+        grupos.setdefault(getattr(producto, campo), []).append(producto)
+    return {valor: tuple(lista) for valor, lista in grupos.items()}
+
+
+class CatalogSnapshot:
+    """Juegos y hardware de una versión del catálogo, ordenados por id"""
+
+    def __init__(self, version, juegos, hardware, creado=None):
+        self.version = version
+        self.creado = creado or time.monotonic()
+        # Última lectura del stock (se renueva sin reconstruir la instantánea)
+        self.stock_leido = time.monotonic()
+        self.juegos = tuple(juegos)
+        self.hardware = tuple(hardware)
+
+    def con_stock(self, cambios):
+        """
+        Instantánea con el stock y updated_at de algunas filas sustituidos
+        (la misma si no cambia nada)
+
+        Args:
+            cambios: modelo -> {id: (stock, updated_at)}
+        """
+        def aplicar(productos, filas):
+            return [
+                p._replace(stock=filas[p.id][0], updated_at=filas[p.id][1])
+                if p.id in filas and (p.stock, p.updated_at) != filas[p.id] else p
+                for p in productos
+            ]
+
+        juegos = aplicar(self.juegos, cambios.get(Game, {}))
+        hardware = aplicar(self.hardware, cambios.get(Hardware, {}))
+        if all(a is b for a, b in zip(juegos, self.juegos)) and all(a is b for a, b in zip(hardware, self.hardware)):
+            self.stock_leido = time.monotonic()
+            return self
+        return CatalogSnapshot(self.version, juegos, hardware, creado=self.creado)
+
+    @cached_property
+    def hardware_por_tipo(self):
+        return _agrupar(self.hardware, 'tipo')
+
+    @cached_property
+    def juegos_por_genero(self):
+        return _agrupar(self.juegos, 'genero')
+
+    @cached_property
+    def tipos_hardware(self):
+        return sorted(self.hardware_por_tipo)
+
+    @cached_property
+    def _juegos_por_id(self):
+        return {juego.id: juego for juego in self.juegos}
+
+    @cached_property
+    def _hardware_por_id(self):
+        return {componente.id: componente for componente in self.hardware}
+
+    def juego(self, juego_id):
+        """Juego por id (None si no existe)"""
+        return self._juegos_por_id.get(juego_id)
+
+    def componente(self, hardware_id):
+        """Componente por id (None si no existe)"""
+        return self._hardware_por_id.get(hardware_id)
+
+    def hardware_de_tipo(self, tipo):
+        return self.hardware_por_tipo.get(tipo, ())
+
+
+_lock = threading.Lock()
+_actual = {'snapshot': None}
+
+# (modelo, id) con stock confirmado en este worker y aún no releído
+_lock_pendientes = threading.Lock()
+_pendientes = set()
+
+
+def init_catalog_cache(app):
+    """Registrar los cambios de stock confirmados para actualizar la instantánea"""
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
+    app.logger.info('✅ Caché de catálogo habilitada')
+
+
+def registrar_cambio_stock(modelo, ids, session=None):
+    """
+    Anotar productos cuyo stock cambia fuera del ORM (UPDATE masivos, como el
+    descuento del checkout); al hacer commit se releen solo esas filas.
+    Los demás cambios de productos mueven el sello de versión del catálogo.
+    """
+    session = session or db.session
+    session.info.setdefault('catalog_cache_stock', set()).update((modelo, i) for i in ids)
+
+
+def get_catalog_snapshot():
+    """Instantánea vigente (se reconstruye si cambió el catálogo; el stock se actualiza por filas)"""
+    version = get_catalog_version()
+    snapshot = _actual['snapshot']
+    if _vigente(snapshot, version) and not _pendientes:
+        return snapshot
+
+    with _lock:
+        snapshot = _actual['snapshot']
+        if snapshot is None or snapshot.version != version:
+            # La carga completa ya incluye el stock pendiente
+            _tomar_pendientes()
+            snapshot = CatalogSnapshot(
+                version,
+                _cargar(Game, GameSnapshot),
+                _cargar(Hardware, HardwareSnapshot)
+            )
+        elif not _vigente(snapshot, version):
+            _tomar_pendientes()
+            snapshot = snapshot.con_stock(_leer_stock())
+        elif _pendientes:
+            snapshot = snapshot.con_stock(_leer_stock(_tomar_pendientes()))
+        _actual['snapshot'] = snapshot
+    return snapshot
+
+
+def _vigente(snapshot, version):
+    return (
+        snapshot is not None and snapshot.version == version and
+        time.monotonic() - snapshot.stock_leido < STOCK_TTL
+    )
+
+
+def _tomar_pendientes():
+    with _lock_pendientes:
+        pendientes = set(_pendientes)
+        _pendientes.clear()
+    return pendientes
+
+
+def _leer_stock(pendientes=None):
+    """Stock y updated_at de las filas pendientes (de todas si es None)"""
+    cambios = {}
+    for modelo in MODELOS_CACHEADOS:
+        tabla = modelo.__table__
+        consulta = select(tabla.c.id, tabla.c.stock, tabla.c.updated_at)
+        if pendientes is not None:
+            ids = [i for m, i in pendientes if m is modelo]
+            if not ids:
+                continue
+            consulta = consulta.where(tabla.c.id.in_(ids))
+        cambios[modelo] = {fila.id: (fila.stock, fila.updated_at) for fila in db.session.execute(consulta)}
+    return cambios
+
+
+def _cargar(modelo, clase):
+    """Todas las filas de la tabla como tuplas (sin instancias del ORM)"""
+    tabla = modelo.__table__
+    filas = db.session.execute(select(tabla).order_by(tabla.c.id))
+    return [clase(*fila) for fila in filas]
+
+
+def _after_flush(session, flush_context):
+    # Altas, bajas y otros cambios mueven el sello; aquí solo interesa el stock
+    for obj in session.dirty:
+        if isinstance(obj, MODELOS_CACHEADOS):
+            modificados = {attr.key for attr in inspect(obj).attrs if attr.history.has_changes()}
+            if modificados and modificados <= CAMPOS_VOLATILES:
+                registrar_cambio_stock(type(obj), [obj.id], session)
+
+
+def _after_commit(session):
+    cambios = session.info.pop('catalog_cache_stock', None)
+    if cambios:
+        with _lock_pendientes:
+            _pendientes.update(cambios)
+
+
+def _after_rollback(session):
+    session.info.pop('catalog_cache_stock', None)
@@ -0,0 +1,131 @@
+"""
+Sello de versión del catálogo de productos
+Se incrementa en la misma transacción en la que cambian juegos, hardware o
+requisitos de juegos, de modo que las cachés derivadas de todos los workers
+se invaliden al detectar un sello distinto.
+"""
+import logging
+import threading
+import time
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models.database_models import CatalogVersion, Game, Hardware, GameRequirements
+
+# Segundos durante los que un worker reutiliza el sello leído de la base de datos
+VERSION_TTL = 1.0
+
+MODELOS_CATALOGO = (Game, Hardware, GameRequirements)
+
+# Cambios que no invalidan el catálogo (p. ej. el stock baja en cada compra)
+CAMPOS_VOLATILES = {'stock', 'updated_at'}
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_estado = {
+    'tabla': False,    # la tabla catalog_version está disponible
+    'version': 0,      # último sello leído de la base de datos
+    'leido': 0.0,      # momento (monotonic) de la última lectura
+    'local': 0         # contador local si no hay tabla disponible
+}
+
+
+def init_catalog_version(app):
+    """Crear la fila del sello si no existe y registrar los eventos de sesión"""
+    with app.app_context():
+        try:
+            CatalogVersion.__table__.create(bind=db.engine, checkfirst=True)
+            with db.engine.begin() as conn:
+                conn.execute(text("""
+                    INSERT INTO catalog_version (id, version, updated_at)
+                    SELECT 1, 1, CURRENT_TIMESTAMP
+                    WHERE NOT EXISTS (SELECT 1 FROM catalog_version WHERE id = 1)
+                """))
+            _estado['tabla'] = True
+        except SQLAlchemyError as e:
+            app.logger.warning(f'⚠️  Sello de catálogo solo local (sin tabla catalog_version): {e}')
+
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
+    app.logger.info('✅ Versionado de catálogo habilitado')
+
+
+def get_catalog_version():
+    """Sello actual del catálogo (se relee de la base de datos cada VERSION_TTL segundos)"""
+    if not _estado['tabla']:
+        return _estado['local']
+
+    ahora = time.monotonic()
+    if ahora - _estado['leido'] >= VERSION_TTL:
+        try:
+            with db.engine.connect() as conn:
+                version = conn.execute(
+                    text('SELECT version FROM catalog_version WHERE id = 1')
+                ).scalar()
+            with _lock:
+                _estado['version'] = version or 0
+                _estado['leido'] = ahora
+        except SQLAlchemyError as e:
+            logger.warning(f'No se pudo leer el sello de catálogo: {e}')
+    return _estado['version']
+
+
+def bump_catalog_version(session=None):
+    """
+    Incrementar el sello a mano dentro de la transacción de `session`, para
+    cambios de catálogo que no pasan por el ORM (p. ej. inserciones masivas
+    con db.session.execute). Se hace efectivo al hacer commit.
+    """
+    session = session or db.session
+    session.info['catalog_changed'] = True
+    if _estado['tabla']:
+        session.execute(text("""
+            UPDATE catalog_version
+            SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+            WHERE id = 1
+        """))
+
+
+def _campos_modificados(obj):
+    """Nombres de los atributos con cambios pendientes"""
+    return {attr.key for attr in inspect(obj).attrs if attr.history.has_changes()}
+
+
+def _hay_cambios_de_catalogo(session):
+    """True si el flush agrega, borra o modifica productos del catálogo"""
+    for obj in session.new | session.deleted:
+        if isinstance(obj, MODELOS_CATALOGO):
+            return True
+    for obj in session.dirty:
+        if isinstance(obj, MODELOS_CATALOGO) and _campos_modificados(obj) - CAMPOS_VOLATILES:
+            return True
+    return False
+
+
+def _after_flush(session, flush_context):
+    # En after_flush las listas new/dirty/deleted aún reflejan el estado previo al flush
+    if session.info.get('catalog_changed') or not _hay_cambios_de_catalogo(session):
+        return
+    session.info['catalog_changed'] = True
+    if _estado['tabla']:
+        session.connection().execute(text("""
+            UPDATE catalog_version
+            SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+            WHERE id = 1
+        """))
+
+
+def _after_commit(session):
+    if session.info.pop('catalog_changed', False):
+        with _lock:
+            _estado['local'] += 1
+            _estado['leido'] = 0.0  # forzar la relectura del sello en este worker
+
+
+def _after_rollback(session):
+    session.info.pop('catalog_changed', None)
@@ -0,0 +1,91 @@
+"""
+Creación de órdenes con descuento de stock atómico
+En vez de leer el stock, comprobarlo en Python y escribir el nuevo valor, cada
+producto se descuenta con un UPDATE condicional
+    UPDATE ... SET stock = stock - :q WHERE id = :id AND stock >= :q
+que la base de datos evalúa sobre la fila bloqueada: si no afecta a ninguna
+fila no había stock y la orden se cancela. Los productos se actualizan
+siempre en el mismo orden (tipo, id) para que dos compras simultáneas no se
+bloqueen mutuamente, y las líneas de la orden se insertan en un solo lote.
+"""
+from sqlalchemy import insert, update
+
+from extensions import db
+from models.database_models import CartItem, Order, OrderItem
+from utils.catalog_cache import registrar_cambio_stock
+from utils.product_loader import MODELOS
+
+
+class StockInsuficiente(Exception):
+    """No queda stock para una línea del carrito (la orden no se crea)"""
+
+    def __init__(self, linea):
+        super().__init__(f'Stock insuficiente para {linea.nombre}')
+        self.linea = linea
+
+
+def _descontar_stock(carrito):
+    """UPDATE condicional por producto, en orden (tipo, id)"""
+    lineas = {}
+    cantidades = {}
+    for linea in carrito:
+        clave = (linea.product_type, linea.product_id)
+        lineas.setdefault(clave, linea)
+        cantidades[clave] = cantidades.get(clave, 0) + linea.quantity
+
+    for clave in sorted(cantidades):
+        product_type, product_id = clave
+        modelo = MODELOS[product_type]
+        cantidad = cantidades[clave]
+        resultado = db.session.execute(
+            update(modelo)
+            .where(modelo.id == product_id, modelo.stock >= cantidad)
+            .values(stock=modelo.stock - cantidad)
+            .execution_options(synchronize_session=False)
+        )
+        if resultado.rowcount != 1:
+            raise StockInsuficiente(lineas[clave])
+        # La caché del catálogo relee solo estas filas tras el commit
+        registrar_cambio_stock(modelo, [product_id])
+
+
+def crear_orden(user_id, carrito):
+    """
+    Crear la orden de un carrito, descontar el stock y vaciar el carrito
+    en una sola transacción
+
+    Args:
+        user_id: dueño del carrito
+        carrito: CarritoVista con las líneas y precios a cobrar
+
+    Returns:
+        Order confirmada
+
+    Raises:
+        StockInsuficiente: si algún producto no tiene stock (se hace rollback)
+    """
+    try:
+        _descontar_stock(carrito)
+
+        order = Order(user_id=user_id, total=carrito.total, status='completed')
+        db.session.add(order)
+        db.session.flush()  # Para obtener el ID de la orden
+
+        db.session.execute(insert(OrderItem), [
+            {
+                'order_id': order.id,
+                'product_type': linea.product_type,
+                'product_id': linea.product_id,
+                'product_name': linea.nombre,
+                'quantity': linea.quantity,
+                'price': linea.producto.precio
+            }
+            for linea in carrito
+        ])
+
+        CartItem.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return order
@@ -0,0 +1,255 @@
+"""
+Índice de facetas para la navegación de /tienda
+Cada valor de faceta (género, desarrollador, tramo de precio, tipo, marca)
+guarda un bitmap (entero de Python, un bit por producto). Los filtros activos
+se combinan con OR dentro de una faceta y AND entre facetas, y los conteos
+son popcounts del bitmap de cada valor contra los filtros de las *otras*
+facetas, sin GROUP BY por petición. El índice se reconstruye cuando cambia el
+sello de versión del catálogo.
+"""
+import threading
+from collections import defaultdict
+
+import numpy as np
+from sqlalchemy import and_, false, or_
+
+from extensions import db
+from models.database_models import Game, Hardware
+from utils.catalog_version import get_catalog_version
+
+# Tramos de precio: (clave, etiqueta, mínimo incluido, máximo excluido)
+RANGOS_PRECIO_JUEGOS = (
+    ('gratis', 'Gratis', 0, 0.01),
+    ('0-20', 'Menos de $20', 0.01, 20),
+    ('20-40', '$20 - $40', 20, 40),
+    ('40-60', '$40 - $60', 40, 60),
+    ('60+', '$60 o más', 60, None)
+)
+RANGOS_PRECIO_HARDWARE = (
+    ('0-100', 'Menos de $100', 0, 100),
+    ('100-300', '$100 - $300', 100, 300),
+    ('300-600', '$300 - $600', 300, 600),
+    ('600+', '$600 o más', 600, None)
+)
+
+# Catálogo -> modelo, parámetro de la URL -> columna, y parámetro de precio
+CATALOGOS = {
+    'juegos': {
+        'modelo': Game,
+        'facetas': {'genero': 'genero', 'desarrollador': 'desarrollador'},
+        'precio': ('precio', RANGOS_PRECIO_JUEGOS)
+    },
+    'hardware': {
+        'modelo': Hardware,
+        'facetas': {'tipo': 'tipo', 'marca': 'marca'},
+        'precio': ('precio_hw', RANGOS_PRECIO_HARDWARE)
+    }
+}
+
+# Valores mostrados por faceta (los más frecuentes, más los seleccionados)
+MAX_VALORES_FACETA = 15
+
+
+def _bitmap(posiciones, n):
+    """Entero con los bits de las posiciones dadas activos"""
+    bits = bytearray((n + 7) // 8)
+    for p in posiciones:
+        bits[p >> 3] |= 1 << (p & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _bitmap_mascara(mascara):
+    """Entero a partir de un array booleano de numpy"""
+    return int.from_bytes(np.packbits(mascara, bitorder='little').tobytes(), 'little')
+
+
+class _Faceta:
+    """Bitmaps de los valores de una faceta, ordenados por frecuencia"""
+
+    def __init__(self, parametro, bitmaps, etiquetas=None, orden_fijo=False):
+        self.parametro = parametro
+        self.bitmaps = bitmaps
+        self.etiquetas = etiquetas or {}
+        self.orden_fijo = orden_fijo
+        if orden_fijo:
+            self.valores = list(bitmaps)
+        else:
+            self.valores = sorted(bitmaps, key=lambda v: (-bitmaps[v].bit_count(), v))
+
+    def filtro(self, seleccion):
+        """OR de los valores seleccionados (None si no hay selección válida)"""
+        bitmap = 0
+        for valor in seleccion:
+            bitmap |= self.bitmaps.get(valor, 0)
+        return bitmap if seleccion else None
+
+
+class _CatalogoFacetado:
+    """Bitmaps de un catálogo (juegos o hardware)"""
+
+    def __init__(self, config, filas):
+        """
+        Args:
+            config: entrada de CATALOGOS
+            filas: tuplas (precio, valor de cada faceta...) en orden de id
+        """
+        self.n = len(filas)
+        self.todos = (1 << self.n) - 1
+        self.precios = np.array([fila[0] or 0 for fila in filas], dtype=np.float64)
+
+        self.facetas = {}
+        for k, parametro in enumerate(config['facetas'], start=1):
+            posiciones = defaultdict(list)
+            for p, fila in enumerate(filas):
+                if fila[k]:
+                    posiciones[fila[k]].append(p)
+            self.facetas[parametro] = _Faceta(
+                parametro, {valor: _bitmap(pos, self.n) for valor, pos in posiciones.items()}
+            )
+
+        parametro, rangos = config['precio']
+        self.facetas[parametro] = _Faceta(
+            parametro,
+            {clave: self._rango(minimo, maximo) for clave, _, minimo, maximo in rangos},
+            etiquetas={clave: etiqueta for clave, etiqueta, _, _ in rangos},
+            orden_fijo=True
+        )
+
+    def _rango(self, minimo=None, maximo=None, maximo_incluido=False):
+        """Bitmap de los productos con precio en [minimo, maximo)"""
+        mascara = np.ones(self.n, dtype=bool)
+        if minimo is not None:
+            mascara &= self.precios >= minimo
+        if maximo is not None:
+            mascara &= (self.precios <= maximo) if maximo_incluido else (self.precios < maximo)
+        return _bitmap_mascara(mascara)
+
+    def contar(self, seleccion, precio_min=None, precio_max=None):
+        """
+        Total filtrado y conteos por valor de cada faceta
+
+        Args:
+            seleccion: dict parámetro -> lista de valores seleccionados
+            precio_min, precio_max: límites libres de precio (incluidos)
+
+        Returns:
+            dict con 'total' y 'facetas' (parámetro -> lista de
+            {'valor', 'etiqueta', 'conteo', 'activo'})
+        """
+        base = self.todos
+        if precio_min is not None or precio_max is not None:
+            base = self._rango(precio_min, precio_max, maximo_incluido=True)
+
+        filtros = {}
+        for parametro, faceta in self.facetas.items():
+            filtro = faceta.filtro(seleccion.get(parametro) or [])
+            if filtro is not None:
+                filtros[parametro] = filtro
+
+        total = base
+        for filtro in filtros.values():
+            total &= filtro
+
+        facetas = {}
+        for parametro, faceta in self.facetas.items():
+            # Cada faceta cuenta con los filtros de las demás, no con los suyos
+            resto = base
+            for otro, filtro in filtros.items():
+                if otro != parametro:
+                    resto &= filtro
+
+            activos = set(seleccion.get(parametro) or [])
+            valores = faceta.valores
+            if not faceta.orden_fijo:
+                valores = valores[:MAX_VALORES_FACETA] + [
+                    v for v in valores[MAX_VALORES_FACETA:] if v in activos
+                ]
+
+            lista = []
+            for valor in valores:
+                conteo = (resto & faceta.bitmaps[valor]).bit_count()
+                if conteo or valor in activos or faceta.orden_fijo:
+                    lista.append({
+                        'valor': valor,
+                        'etiqueta': faceta.etiquetas.get(valor, valor),
+                        'conteo': conteo,
+                        'activo': valor in activos
+                    })
+            facetas[parametro] = lista
+        return {'total': total.bit_count(), 'facetas': facetas}
+
+
+class FacetIndex:
+    """Bitmaps de juegos y hardware para una versión del catálogo"""
+
+    def __init__(self, version, filas_por_catalogo):
+        self.version = version
+        self.catalogos = {
+            nombre: _CatalogoFacetado(CATALOGOS[nombre], filas)
+            for nombre, filas in filas_por_catalogo.items()
+        }
+
+    def contar(self, catalogo, seleccion, precio_min=None, precio_max=None):
+        return self.catalogos[catalogo].contar(seleccion, precio_min, precio_max)
+
+
+def aplicar_filtros(query, catalogo, seleccion):
+    """
+    Aplicar a una query del catálogo los mismos filtros que usan los
+    conteos (OR dentro de cada faceta, AND entre facetas)
+    """
+    config = CATALOGOS[catalogo]
+    modelo = config['modelo']
+    for parametro, columna in config['facetas'].items():
+        valores = seleccion.get(parametro)
+        if valores:
+            query = query.filter(getattr(modelo, columna).in_(valores))
+
+    parametro, rangos = config['precio']
+    claves = set(seleccion.get(parametro) or [])
+    condiciones = []
+    for clave, _, minimo, maximo in rangos:
+        if clave in claves:
+            condicion = modelo.precio >= minimo
+            if maximo is not None:
+                condicion = and_(condicion, modelo.precio < maximo)
+            condiciones.append(condicion)
+    if claves:
+        # Un tramo desconocido no debe devolver todo el catálogo
+        query = query.filter(or_(*condiciones) if condiciones else false())
+    return query
+
+
+def parametros_facetas(catalogo):
+    """Parámetros de la URL que usa un catálogo"""
+    config = CATALOGOS[catalogo]
+    return list(config['facetas']) + [config['precio'][0]]
+
+
+_lock = threading.Lock()
+_actual = {'indice': None}
+
+
+def get_facet_index():
+    """Índice vigente (se reconstruye si cambió el catálogo)"""
+    version = get_catalog_version()
+    indice = _actual['indice']
+    if indice is not None and indice.version == version:
+        return indice
+
+    with _lock:
+        indice = _actual['indice']
+        if indice is None or indice.version != version:
+            indice = FacetIndex(version, _cargar_filas())
+            _actual['indice'] = indice
+    return indice
+
+
+def _cargar_filas():
+    """Una consulta ligera por catálogo con el precio y las columnas facetadas"""
+    filas = {}
+    for nombre, config in CATALOGOS.items():
+        modelo = config['modelo']
+        columnas = [getattr(modelo, columna) for columna in config['facetas'].values()]
+        filas[nombre] = db.session.query(modelo.precio, *columnas).order_by(modelo.id).all()
+    return filas
@@ -0,0 +1,37 @@
+"""
+Caché de fragmentos HTML compartidos entre usuarios
+Las plantillas envuelven las partes que no dependen del usuario (rejillas de
+productos, listas de categorías) en
+    {% call cache_fragmento('nombre') %} ... {% endcall %}
+y el HTML renderizado se reutiliza por ruta, argumentos de la URL y versión
+del catálogo (el stock mostrado se renueva con el TTL). Lo propio de cada
+usuario (barra de navegación, contador del carrito, mensajes) queda fuera de
+los fragmentos y se renderiza en cada petición, así que visitantes anónimos y
+usuarios con sesión comparten la misma caché.
+"""
+from flask import request
+from markupsafe import Markup
+
+from utils.catalog_cache import STOCK_TTL
+from utils.catalog_version import get_catalog_version
+from utils.result_cache import ResultCache
+
+# Los fragmentos pueden mostrar stock: como mucho STOCK_TTL segundos desactualizado
+fragment_cache = ResultCache('fragmentos', maxsize=1024, ttl=STOCK_TTL)
+
+
+def cache_fragmento(nombre, *partes, caller):
+    """Global de Jinja: HTML cacheado del cuerpo del bloque {% call %}"""
+    # Los cambios de solo stock no cambian la clave (cada compra no vacía la caché)
+    clave = (
+        nombre,
+        request.path,
+        tuple(sorted(request.args.items(multi=True))),
+        get_catalog_version()
+    ) + partes
+    return Markup(fragment_cache.get_or_set(clave, lambda: str(caller())))
+
+
+def init_fragment_cache(app):
+    """Registrar cache_fragmento en las plantillas"""
+    app.jinja_env.globals['cache_fragmento'] = cache_fragmento
@@ -0,0 +1,92 @@
+"""
+Peticiones condicionales (ETag / Last-Modified)
+El decorador `condicional` calcula los validadores de una ruta antes de
+ejecutarla; si el cliente ya tiene esa versión (If-None-Match o, en su
+defecto, If-Modified-Since) responde 304 sin renderizar plantillas ni
+serializar JSON. Las páginas HTML incluyen además el estado del usuario que
+muestra la barra de navegación, y se renuevan cada RENOVACION_CSRF segundos
+para que el token CSRF de la página no caduque.
+"""
+import time
+from datetime import timezone
+from functools import wraps
+
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+from werkzeug.http import generate_etag
+
+from utils.cart_count import contador_carrito
+
+# Segundos tras los que una página HTML se vuelve a renderizar aunque no cambie
+# (el token CSRF de la etiqueta <meta> caduca a la hora)
+RENOVACION_CSRF = 1800
+
+# Cache-Control de las APIs públicas de catálogo
+MAX_AGE_API = 30
+
+
+def partes_de_usuario():
+    """Parte del validador que depende de quién ve la página"""
+    usuario = current_user.get_id() if current_user.is_authenticated else None
+    return usuario, contador_carrito(), int(time.time() // RENOVACION_CSRF)
+
+
+def _segundos(fecha):
+    """Fecha en UTC con precisión de segundos (la de la cabecera HTTP)"""
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return fecha.replace(microsecond=0)
+
+
+def _no_modificado(etag, modificado):
+    if request.if_none_match:
+        # If-None-Match tiene prioridad sobre If-Modified-Since (RFC 9110)
+        return request.if_none_match.contains(etag)
+    if modificado is not None and request.if_modified_since is not None:
+        return modificado <= request.if_modified_since
+    return False
+
+
+def condicional(validador, publico=False, max_age=MAX_AGE_API):
+    """
+    Responder 304 si el cliente tiene la versión actual de la ruta
+
+    Args:
+        validador: función con los argumentos de la vista que devuelve
+            (partes, ultima_modificacion) o None para no usar validadores
+            (p. ej. si el producto no existe y la vista debe dar 404)
+        publico: respuesta cacheable por proxies durante max_age segundos;
+            si no, privada y revalidada en cada uso
+        max_age: segundos de frescura de las respuestas públicas
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            # Con mensajes flash pendientes la página debe renderizarse
+            validadores = None if session.get('_flashes') else validador(*args, **kwargs)
+            if validadores is None:
+                return vista(*args, **kwargs)
+
+            partes, modificado = validadores
+            etag = generate_etag(repr(partes).encode())
+            modificado = _segundos(modificado) if modificado else None
+
+            if _no_modificado(etag, modificado):
+                respuesta = current_app.response_class(status=304)
+            else:
+                respuesta = make_response(vista(*args, **kwargs))
+                if respuesta.status_code != 200:
+                    return respuesta
+
+            respuesta.set_etag(etag)
+            if modificado is not None:
+                respuesta.last_modified = modificado
+            if publico:
+                respuesta.cache_control.public = True
+                respuesta.cache_control.max_age = max_age
+            else:
+                respuesta.cache_control.private = True
+                respuesta.cache_control.no_cache = True
+            return respuesta
+        return envoltura
+    return decorador
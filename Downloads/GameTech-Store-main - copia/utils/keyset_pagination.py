@@ -0,0 +1,128 @@
+"""
+Paginación por clave (keyset / seek) con cursores opacos
+En lugar de OFFSET + COUNT(*), cada página filtra por la última clave vista
+(columna de orden, id) y recorre el índice compuesto desde ahí, de modo que
+la página 1000 cuesta lo mismo que la primera. El cursor es la clave
+codificada en base64; un cursor inválido o de otro orden vuelve al inicio.
+"""
+import base64
+import binascii
+import json
+
+from sqlalchemy import tuple_
+
+# Orden de la URL -> (columna, descendente)
+ORDENES_JUEGOS = {
+    'nombre': ('nombre', False),
+    'precio_asc': ('precio', False),
+    'precio_desc': ('precio', True)
+}
+ORDENES_HARDWARE = {
+    'tipo': ('tipo', False)
+}
+
+MAX_POR_PAGINA = 100
+
+
+def codificar_cursor(datos):
+    """Cursor opaco para la URL"""
+    crudo = json.dumps(datos, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor):
+    """Datos del cursor o None si falta o no es válido"""
+    if not cursor:
+        return None
+    try:
+        crudo = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        datos = json.loads(crudo)
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(datos, dict) or not {'c', 'v', 'id', 'd'} <= set(datos):
+        return None
+    if not isinstance(datos['v'], (str, int, float)) or not isinstance(datos['id'], int):
+        return None
+    return datos
+
+
+class KeysetPage:
+    """Página de resultados con los cursores de la anterior y la siguiente"""
+
+    def __init__(self, items, siguiente, anterior, per_page, total=None):
+        self.items = items
+        self.siguiente = siguiente
+        self.anterior = anterior
+        self.per_page = per_page
+        # Total aproximado (no se cuenta en cada página)
+        self.total = total
+
+    @property
+    def has_next(self):
+        return self.siguiente is not None
+
+    @property
+    def has_prev(self):
+        return self.anterior is not None
+
+
+def paginar(query, modelo, columna, descendente=False, cursor=None, per_page=12, total=None):
+    """
+    Página de `query` ordenada por (columna, id)
+
+    Args:
+        query: query sin ORDER BY, ya filtrada
+        modelo: modelo con la columna y el id
+        columna: nombre de la columna de orden
+        descendente: orden descendente (también para el id)
+        cursor: cursor opaco recibido en la URL
+        per_page: elementos por página (acotado a MAX_POR_PAGINA)
+        total: total aproximado a exponer en la página
+
+    Returns:
+        KeysetPage
+    """
+    per_page = max(1, min(per_page or 12, MAX_POR_PAGINA))
+    columna_orden = getattr(modelo, columna)
+    datos = decodificar_cursor(cursor)
+    if datos is not None and datos['c'] != f'{columna}:{int(descendente)}':
+        datos = None
+
+    atras = datos is not None and datos['d'] == 'prev'
+    # Hacia atrás se recorre el índice en sentido contrario y se invierte
+    ascendente = descendente == atras
+    if datos is not None:
+        valor, ultimo_id = datos['v'], datos['id']
+        # Comparación de filas: el motor busca directamente en el índice (columna, id)
+        clave = tuple_(columna_orden, modelo.id)
+        limite = tuple_(valor, ultimo_id)
+        query = query.filter(clave > limite if ascendente else clave < limite)
+
+    if ascendente:
+        query = query.order_by(columna_orden.asc(), modelo.id.asc())
+    else:
+        query = query.order_by(columna_orden.desc(), modelo.id.desc())
+
+    items = query.limit(per_page + 1).all()
+    hay_mas = len(items) > per_page
+    items = items[:per_page]
+    if atras:
+        items.reverse()
+
+    def cursor_de(item, direccion):
+        return codificar_cursor({
+            'c': f'{columna}:{int(descendente)}',
+            'v': getattr(item, columna),
+            'id': item.id,
+            'd': direccion
+        })
+
+    siguiente = anterior = None
+    if items:
+        if atras:
+            siguiente = cursor_de(items[-1], 'next')
+            anterior = cursor_de(items[0], 'prev') if hay_mas else None
+        else:
+            siguiente = cursor_de(items[-1], 'next') if hay_mas else None
+            anterior = cursor_de(items[0], 'prev') if datos is not None else None
+    return KeysetPage(items, siguiente, anterior, per_page, total)
@@ -2,6 +2,14 @@
 Calculadora de rendimiento de juegos
 Determina si un sistema puede correr un juego y a qué calidad
 """
+import numpy as np
+
+# Códigos de calidad del modo por lotes (índice -> nombre)
+QUALITY_LEVELS = ('none', 'low', 'medium', 'high', 'ultra')
+QUALITY_NONE, QUALITY_LOW, QUALITY_MEDIUM, QUALITY_HIGH, QUALITY_ULTRA = range(5)
+
+# Códigos de componente limitante del modo por lotes (índice -> nombre)
+LIMITING_COMPONENTS = (None, 'cpu', 'gpu', 'ram')
 
 class PerformanceCalculator:
     """Calcula el rendimiento esperado para juegos"""
@@ -20,9 +28,7 @@ class PerformanceCalculator:
         Returns:
             dict con información de rendimiento
         """
-        cpu_score = cpu.benchmark_score or 0
-        gpu_score = gpu.benchmark_score or 0
-        ram_gb = PerformanceCalculator._get_ram_gb(ram)
+        cpu_score, gpu_score, ram_gb = PerformanceCalculator.component_scores(cpu, gpu, ram)
         
         # Verificar requisitos mínimos
         can_run_min = (
@@ -59,6 +65,101 @@ class PerformanceCalculator:
             'reason': ''
         }
     
+    @staticmethod
+    def component_scores(cpu, gpu, ram):
+        """Obtener (cpu_score, gpu_score, ram_gb) de los componentes"""
+        return (
+            cpu.benchmark_score or 0,
+            gpu.benchmark_score or 0,
+            PerformanceCalculator._get_ram_gb(ram)
+        )
+    
+    @staticmethod
+    def calculate_batch(cpu, gpu, ram, reqs):
+        """
+        Calcular el rendimiento de todos los juegos a la vez
+        
+        Args:
+            cpu: Hardware CPU
+            gpu: Hardware GPU
+            ram: Hardware RAM
+            reqs: dict campo -> array con los requisitos de N juegos
+                  (min/rec/ultra de cpu_score, gpu_score y ram_gb)
+        
+        Returns:
+            dict de arrays de N elementos: can_run, quality, fps_estimate, bottleneck
+        """
+        cpu_score, gpu_score, ram_gb = PerformanceCalculator.component_scores(cpu, gpu, ram)
+        return PerformanceCalculator.calculate_batch_scores(cpu_score, gpu_score, ram_gb, reqs)
+    
+    @staticmethod
+    def calculate_batch_scores(cpu_score, gpu_score, ram_gb, reqs):
+        """
+        Versión por lotes de calculate_game_performance sobre scores numéricos.
+        Los scores pueden ser escalares o arrays que se propagan (broadcast)
+        contra los requisitos; los resultados son idénticos al cálculo escalar.
+        """
+        c = np.asarray(cpu_score, dtype=np.float64)
+        g = np.asarray(gpu_score, dtype=np.float64)
+        r = np.asarray(ram_gb, dtype=np.float64)
+        
+        min_cpu, min_gpu, min_ram = reqs['min_cpu_score'], reqs['min_gpu_score'], reqs['min_ram_gb']
+        rec_cpu, rec_gpu, rec_ram = reqs['rec_cpu_score'], reqs['rec_gpu_score'], reqs['rec_ram_gb']
+        ultra_cpu, ultra_gpu, ultra_ram = reqs['ultra_cpu_score'], reqs['ultra_gpu_score'], reqs['ultra_ram_gb']
+        med_cpu, med_gpu = min_cpu * 1.2, min_gpu * 1.2
+        
+        cannot_run = ~((c >= min_cpu) & (g >= min_gpu) & (r >= min_ram))
+        ultra = (c >= ultra_cpu) & (g >= ultra_gpu) & (r >= ultra_ram)
+        high = (c >= rec_cpu) & (g >= rec_gpu) & (r >= rec_ram)
+        medium = (c >= med_cpu) & (g >= med_gpu)
+        niveles = [cannot_run, ultra, high, medium]
+        
+        estimate = PerformanceCalculator._estimate_fps_batch
+        quality = np.select(niveles, [QUALITY_NONE, QUALITY_ULTRA, QUALITY_HIGH, QUALITY_MEDIUM], QUALITY_LOW)
+        fps = np.select(niveles, [
+            0,
+            estimate(c, g, ultra_cpu, ultra_gpu, 90),
+            estimate(c, g, rec_cpu, rec_gpu, 60),
+            estimate(c, g, med_cpu, med_gpu, 45)
+        ], estimate(c, g, min_cpu, min_gpu, 30))
+        
+        # Igual que en el cálculo escalar: medium y low se comparan con los recomendados
+        limiting = PerformanceCalculator._find_limiting_batch
+        bottleneck = np.select([cannot_run, ultra], [
+            limiting(c, g, r, min_cpu, min_gpu, min_ram),
+            limiting(c, g, r, ultra_cpu, ultra_gpu, ultra_ram)
+        ], limiting(c, g, r, rec_cpu, rec_gpu, rec_ram))
+        
+        return {
+            'can_run': ~cannot_run,
+            'quality': np.asarray(QUALITY_LEVELS, dtype=object)[quality],
+            'quality_code': quality,
+            'fps_estimate': fps.astype(np.int64),
+            'bottleneck': np.asarray(LIMITING_COMPONENTS, dtype=object)[bottleneck]
+        }
+    
+    @staticmethod
+    def _estimate_fps_batch(cpu_score, gpu_score, req_cpu, req_gpu, base_fps):
+        """Versión por lotes de _estimate_fps"""
+        sin_requisito = (req_cpu == 0) | (req_gpu == 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            limiting_ratio = np.minimum(cpu_score / req_cpu, gpu_score / req_gpu)
+            estimated_fps = np.clip(np.trunc(base_fps * limiting_ratio), 15, 240)
+        return np.where(sin_requisito, base_fps, estimated_fps)
+    
+    @staticmethod
+    def _find_limiting_batch(cpu_score, gpu_score, ram_gb, req_cpu, req_gpu, req_ram):
+        """Versión por lotes de _find_limiting_component (devuelve códigos)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cpu_ratio = np.where(req_cpu > 0, cpu_score / req_cpu, 999)
+            gpu_ratio = np.where(req_gpu > 0, gpu_score / req_gpu, 999)
+        return np.select([
+            (req_cpu == 0) | (req_gpu == 0),
+            ram_gb < req_ram,
+            cpu_ratio < gpu_ratio * 0.7,
+            gpu_ratio < cpu_ratio * 0.7
+        ], [0, 3, 1, 2], 0)
+    
     @staticmethod
     def _determine_quality_level(cpu_score, gpu_score, ram_gb, req):
         """Determinar nivel de calidad y FPS estimado"""
@@ -0,0 +1,82 @@
+"""
+Cargador de productos por lotes con alcance de petición (estilo DataLoader)
+Acumula claves (product_type, product_id) y las resuelve con una sola
+consulta IN (...) por tipo; los resultados se memorizan durante la petición.
+"""
+from flask import g, has_app_context
+
+from models.database_models import Game, Hardware
+
+MODELOS = {
+    'game': Game,
+    'hardware': Hardware
+}
+
+
+class ProductLoader:
+    """Resuelve productos de juegos y hardware por lotes"""
+
+    def __init__(self):
+        self._productos = {}      # (tipo, id) -> producto o None si no existe
+        self._pendientes = set()
+
+    def prime(self, product_type, product_id):
+        """Registrar una clave para resolverla en el próximo lote"""
+        key = self._clave(product_type, product_id)
+        if key is not None and key not in self._productos:
+            self._pendientes.add(key)
+        return key
+
+    def prime_many(self, keys):
+        """Registrar varias claves (product_type, product_id)"""
+        for product_type, product_id in keys:
+            self.prime(product_type, product_id)
+
+    def get(self, product_type, product_id):
+        """Obtener un producto (None si no existe o la clave es inválida)"""
+        key = self.prime(product_type, product_id)
+        if key is None:
+            return None
+        self._resolver()
+        return self._productos.get(key)
+
+    def get_many(self, product_type, product_ids):
+        """Obtener productos de un tipo en el orden dado, omitiendo los que no existen"""
+        ids = list(product_ids)
+        self.prime_many((product_type, pid) for pid in ids)
+        productos = (self.get(product_type, pid) for pid in ids)
+        return [producto for producto in productos if producto is not None]
+
+    def _resolver(self):
+        """Una consulta IN (...) por tipo de producto con claves pendientes"""
+        if not self._pendientes:
+            return
+
+        por_tipo = {}
+        for product_type, product_id in self._pendientes:
+            por_tipo.setdefault(product_type, []).append(product_id)
+        self._pendientes.clear()
+
+        for product_type, ids in por_tipo.items():
+            modelo = MODELOS[product_type]
+            encontrados = {p.id: p for p in modelo.query.filter(modelo.id.in_(ids)).all()}
+            for product_id in ids:
+                self._productos[(product_type, product_id)] = encontrados.get(product_id)
+
+    @staticmethod
+    def _clave(product_type, product_id):
+        if product_type not in MODELOS:
+            return None
+        try:
+            return product_type, int(product_id)
+        except (TypeError, ValueError):
+            return None
+
+
+def get_product_loader():
+    """Cargador de la petición actual (uno nuevo fuera de contexto de aplicación)"""
+    if not has_app_context():
+        return ProductLoader()
+    if 'product_loader' not in g:
+        g.product_loader = ProductLoader()
+    return g.product_loader
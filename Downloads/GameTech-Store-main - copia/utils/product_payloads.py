@@ -0,0 +1,93 @@
+"""
+Fragmentos JSON precodificados de juegos y hardware
+Cada producto se serializa una sola vez por versión (id + updated_at): se
+guarda un fragmento ya codificado por campo ("nombre":"...") y las respuestas
+de listado se montan uniendo bytes, sin volver a pasar por json.loads de los
+requisitos/especificaciones ni por json.dumps de cada diccionario.
+Las APIs aceptan ?fields=id,nombre,precio para enviar solo esos campos.
+"""
+import json
+
+from flask import current_app, request
+
+from utils.result_cache import ResultCache
+
+# Campos disponibles por tipo (los de to_dict más los derivados)
+CAMPOS = {
+    'game': (
+        'id', 'nombre', 'descripcion', 'precio', 'imagen', 'genero', 'desarrollador',
+        'fecha_lanzamiento', 'requisitos_minimos', 'requisitos_recomendados', 'stock'
+    ),
+    'hardware': (
+        'id', 'tipo', 'marca', 'modelo', 'precio', 'descripcion', 'imagen',
+        'especificaciones', 'stock', 'capacidad'
+    )
+}
+
+# Las entradas de versiones antiguas caen por LRU o por TTL
+payload_cache = ResultCache('payloads', maxsize=20000, ttl=3600)
+
+
+class CampoInvalido(ValueError):
+    """?fields= con campos que el tipo no tiene"""
+
+
+class JSONCrudo(bytes):
+    """JSON ya codificado que respuesta_json inserta tal cual"""
+
+
+def _codificar(valor):
+    return json.dumps(valor, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def _datos(tipo, producto):
+    datos = producto.to_dict()
+    # 'capacidad' solo existe en la RAM (la usan los selects del configurador)
+    if tipo == 'hardware' and producto.tipo == 'RAM':
+        datos['capacidad'] = datos['especificaciones'].get('capacidad')
+    return datos
+
+
+def _fragmentos(tipo, producto):
+    """Campo -> b'"campo":valor' del producto (cacheado por id y updated_at)"""
+    def calcular():
+        return {
+            campo: _codificar(campo) + b':' + _codificar(valor)
+            for campo, valor in _datos(tipo, producto).items()
+        }
+    return payload_cache.get_or_set((tipo, producto.id, producto.updated_at), calcular)
+
+
+def campos_solicitados(tipo, por_defecto=None):
+    """
+    Campos pedidos en ?fields= (o por_defecto / todos si no se indica)
+
+    Raises:
+        CampoInvalido: si algún campo no existe para el tipo
+    """
+    parametro = request.args.get('fields', '')
+    if not parametro.strip():
+        return tuple(por_defecto or CAMPOS[tipo])
+    campos = tuple(dict.fromkeys(c.strip() for c in parametro.split(',') if c.strip()))
+    desconocidos = [c for c in campos if c not in CAMPOS[tipo]]
+    if desconocidos:
+        raise CampoInvalido(f'Campos no válidos: {", ".join(desconocidos)}')
+    return campos
+
+
+def serializar_productos(tipo, productos, campos):
+    """Lista JSON de los productos con los campos dados (los ausentes se omiten)"""
+    partes = []
+    for producto in productos:
+        fragmentos = _fragmentos(tipo, producto)
+        partes.append(b'{' + b','.join(fragmentos[c] for c in campos if c in fragmentos) + b'}')
+    return JSONCrudo(b'[' + b','.join(partes) + b']')
+
+
+def respuesta_json(datos, status=200):
+    """Como jsonify, pero los valores JSONCrudo se copian sin recodificar"""
+    cuerpo = b','.join(
+        _codificar(clave) + b':' + (valor if isinstance(valor, JSONCrudo) else _codificar(valor))
+        for clave, valor in datos.items()
+    )
+    return current_app.response_class(b'{' + cuerpo + b'}', status=status, mimetype='application/json')
@@ -0,0 +1,291 @@
+"""
+Productos relacionados precalculados
+Cada juego o componente guarda en related_products sus K_RELACIONADOS
+vecinos más cercanos: primero los del mismo género/tipo y, dentro de ellos,
+los de precio (y en hardware benchmark_score) más parecido. Las páginas de
+detalle hacen una sola consulta indexada. Al guardar un producto solo se
+recalculan las listas a las que entra o de las que puede salir.
+Cada lista guarda además una fila marcador (posicion MARCADOR) para
+distinguir "calculada pero vacía" de "aún sin calcular".
+"""
+import logging
+
+import numpy as np
+from sqlalchemy import func, insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from extensions import db
+from models.database_models import Game, Hardware, RelatedProduct
+
+logger = logging.getLogger(__name__)
+
+K_RELACIONADOS = 6
+
+# Distancia = PESO_GRUPO si el género/tipo es distinto + diferencias relativas
+# de precio y score (cada una entre 0 y 1). PESO_GRUPO supera la suma máxima
+# de las demás, así que los del mismo grupo siempre van primero.
+PESO_GRUPO = 3.0
+PESO_PRECIO = 1.0
+PESO_SCORE = 1.0
+
+TIPOS = {
+    'game': {'modelo': Game, 'grupo': 'genero', 'score': None},
+    'hardware': {'modelo': Hardware, 'grupo': 'tipo', 'score': 'benchmark_score'}
+}
+
+# Filas por bloque al reconstruir todo (bloque × tamaño del grupo distancias)
+FILAS_POR_BLOQUE = 256
+
+# Posición de la fila que marca una lista ya calculada (apunta al propio producto)
+MARCADOR = -1
+
+# Productos del mismo grupo (los de precio más cercano) con los que se calcula
+# al vuelo la lista de un producto que aún no la tiene
+CANDIDATOS_AL_VUELO = 200
+
+
+def _diferencia_relativa(a, b):
+    return np.abs(a - b) / np.maximum(np.maximum(a, b), 1.0)
+
+
+def _columnas(config):
+    modelo = config['modelo']
+    columnas = [modelo.id, getattr(modelo, config['grupo']), modelo.precio]
+    if config['score']:
+        columnas.append(getattr(modelo, config['score']))
+    return columnas
+
+
+class _Catalogo:
+    """Ids, grupo, precio y score de los productos de un tipo (todos o los dados)"""
+
+    def __init__(self, tipo, filas=None):
+        config = TIPOS[tipo]
+        if filas is None:
+            filas = db.session.query(*_columnas(config)).order_by(config['modelo'].id).all()
+
+        self.ids = np.array([f[0] for f in filas], dtype=np.int64)
+        codigos = {}
+        self.grupos = np.array([codigos.setdefault(f[1], len(codigos)) for f in filas], dtype=np.int64)
+        self.precios = np.array([f[2] or 0 for f in filas], dtype=np.float64)
+        self.scores = None
+        if config['score']:
+            self.scores = np.array([f[3] or 0 for f in filas], dtype=np.float64)
+        self.posicion = {producto_id: i for i, producto_id in enumerate(self.ids.tolist())}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def distancias(self, filas, columnas):
+        """Matriz de distancias entre los índices `filas` y `columnas`"""
+        filas = np.asarray(filas)[:, None]
+        d = PESO_GRUPO * (self.grupos[filas] != self.grupos[columnas])
+        d = d + PESO_PRECIO * _diferencia_relativa(self.precios[filas], self.precios[columnas])
+        if self.scores is not None:
+            a, b = self.scores[filas], self.scores[columnas]
+            # Sin score en alguno de los dos: diferencia neutra
+            d = d + PESO_SCORE * np.where((a > 0) & (b > 0), _diferencia_relativa(a, b), 0.5)
+        # Un producto nunca es vecino de sí mismo
+        d[filas == np.asarray(columnas)[None, :]] = np.inf
+        return d
+
+    def vecinos(self, filas, columnas):
+        """Por cada fila, lista de (id, distancia) de sus vecinos ordenados"""
+        columnas = np.asarray(columnas)
+        d = self.distancias(filas, columnas)
+        k = min(K_RELACIONADOS, len(columnas))
+        if k == 0:
+            return [[] for _ in range(len(d))]
+        # Distancia del k-ésimo vecino de cada fila; los empates se deciden por id
+        kesimas = np.partition(d, k - 1, axis=1)[:, k - 1]
+
+        resultado = []
+        for fila, kesima in zip(d, kesimas):
+            cand = np.flatnonzero(fila <= kesima)
+            ids = self.ids[columnas[cand]]
+            distancias = fila[cand]
+            orden = np.lexsort((ids, distancias))[:k]
+            resultado.append([
+                (producto_id, distancia)
+                for producto_id, distancia in zip(ids[orden].tolist(), distancias[orden].tolist())
+                if distancia != np.inf
+            ])
+        return resultado
+
+
+def _guardar(tipo, listas):
+    """Reemplazar las listas de vecinos de los productos dados ({id: vecinos})"""
+    if not listas:
+        return
+    RelatedProduct.query.filter(
+        RelatedProduct.product_type == tipo,
+        RelatedProduct.product_id.in_(list(listas))
+    ).delete(synchronize_session=False)
+    filas = [
+        {
+            'product_type': tipo,
+            'product_id': producto_id,
+            'related_id': related_id,
+            'posicion': posicion,
+            'distancia': distancia
+        }
+        for producto_id, vecinos in listas.items()
+        for posicion, (related_id, distancia) in enumerate([(producto_id, 0.0)] + vecinos, start=MARCADOR)
+    ]
+    db.session.execute(insert(RelatedProduct.__table__), filas)
+
+
+def _recalcular(catalogo, tipo, producto_ids):
+    """Recalcular contra todo el catálogo las listas de algunos productos"""
+    indices = [catalogo.posicion[p] for p in producto_ids if p in catalogo.posicion]
+    listas = {}
+    todos = np.arange(len(catalogo))
+    for inicio in range(0, len(indices), FILAS_POR_BLOQUE):
+        bloque = indices[inicio:inicio + FILAS_POR_BLOQUE]
+        for i, vecinos in zip(bloque, catalogo.vecinos(bloque, todos)):
+            listas[int(catalogo.ids[i])] = vecinos
+    _guardar(tipo, listas)
+
+
+def reconstruir_relacionados(tipo):
+    """
+    Recalcular las listas de todos los productos de un tipo. Dentro de un
+    grupo con al menos K_RELACIONADOS + 1 productos basta comparar con el
+    propio grupo; los grupos pequeños se comparan con todo el catálogo.
+    Devuelve el número de productos procesados.
+    """
+    catalogo = _Catalogo(tipo)
+    RelatedProduct.query.filter_by(product_type=tipo).delete(synchronize_session=False)
+
+    todos = np.arange(len(catalogo))
+    for grupo in np.unique(catalogo.grupos).tolist():
+        miembros = np.flatnonzero(catalogo.grupos == grupo)
+        columnas = miembros if len(miembros) > K_RELACIONADOS else todos
+        for inicio in range(0, len(miembros), FILAS_POR_BLOQUE):
+            bloque = miembros[inicio:inicio + FILAS_POR_BLOQUE]
+            listas = dict(zip(catalogo.ids[bloque].tolist(), catalogo.vecinos(bloque, columnas)))
+            _guardar(tipo, listas)
+    db.session.commit()
+    return len(catalogo)
+
+
+def actualizar_relacionados(tipo, producto_id):
+    """
+    Actualizar los vecinos tras crear, editar o eliminar un producto:
+    - su propia lista (o borrarla si ya no existe),
+    - las listas en las que aparecía (puede haber dejado de ser vecino),
+    - las listas cuya peor distancia mejora con el producto (entra en ellas).
+    """
+    try:
+        catalogo = _Catalogo(tipo)
+        afectados = {
+            fila.product_id for fila in db.session.query(RelatedProduct.product_id).filter_by(
+                product_type=tipo, related_id=producto_id
+            )
+        }
+
+        if producto_id in catalogo.posicion:
+            afectados.add(producto_id)
+            # Listas en las que el producto supera al peor vecino (en distancia
+            # o, si empata, en id). Los productos sin lista se calculan al
+            # verlos; con un catálogo tan pequeño que ninguna lista está
+            # completa se recalculan todas.
+            completas = len(catalogo) > K_RELACIONADOS + 1
+            peores = np.full(len(catalogo), -np.inf if completas else np.inf)
+            peores_ids = np.zeros(len(catalogo), dtype=np.int64)
+            # Las listas guardadas con menos de K vecinos (p. ej. calculadas al
+            # vuelo en un grupo pequeño) admiten cualquier producto
+            for (otro_id,) in db.session.query(RelatedProduct.product_id).filter_by(
+                product_type=tipo, posicion=MARCADOR
+            ):
+                if otro_id in catalogo.posicion:
+                    peores[catalogo.posicion[otro_id]] = np.inf
+            for otro_id, related_id, distancia in db.session.query(
+                RelatedProduct.product_id, RelatedProduct.related_id, RelatedProduct.distancia
+            ).filter_by(product_type=tipo, posicion=K_RELACIONADOS - 1):
+                if otro_id in catalogo.posicion:
+                    peores[catalogo.posicion[otro_id]] = distancia
+                    peores_ids[catalogo.posicion[otro_id]] = related_id
+            distancias = catalogo.distancias([catalogo.posicion[producto_id]], np.arange(len(catalogo)))[0]
+            entra = (distancias < peores) | ((distancias == peores) & (producto_id < peores_ids))
+            afectados.update(catalogo.ids[entra].tolist())
+        else:
+            RelatedProduct.query.filter_by(
+                product_type=tipo, product_id=producto_id
+            ).delete(synchronize_session=False)
+
+        _recalcular(catalogo, tipo, sorted(afectados))
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logger.warning(f'⚠️  No se pudieron actualizar los relacionados de {tipo} {producto_id}: {e}')
+
+
+def _calcular_al_vuelo(tipo, producto):
+    """
+    Lista de un producto sin calcular, comparándolo solo con los
+    CANDIDATOS_AL_VUELO productos de su grupo con el precio más cercano
+    (la reconstrucción completa la afina con todo el catálogo)
+    """
+    config = TIPOS[tipo]
+    modelo = config['modelo']
+    grupo = getattr(modelo, config['grupo'])
+    filas = (
+        db.session.query(*_columnas(config))
+        .filter(grupo == getattr(producto, config['grupo']), modelo.id != producto.id)
+        .order_by(func.abs(modelo.precio - (producto.precio or 0)), modelo.id)
+        .limit(CANDIDATOS_AL_VUELO)
+        .all()
+    )
+    propia = db.session.query(*_columnas(config)).filter(modelo.id == producto.id).first()
+    if propia is None:
+        return
+    catalogo = _Catalogo(tipo, sorted([propia] + filas, key=lambda fila: fila[0]))
+    vecinos = catalogo.vecinos([catalogo.posicion[producto.id]], np.arange(len(catalogo)))[0]
+    _guardar(tipo, {producto.id: vecinos})
+
+
+def productos_relacionados(tipo, producto, limite=3):
+    """
+    Productos relacionados con una consulta indexada. Si el producto aún no
+    tiene lista se calcula con los de su grupo y se guarda (también si queda
+    vacía); si la tabla no existe se usa el mismo género/tipo.
+    """
+    config = TIPOS[tipo]
+    modelo = config['modelo']
+
+    def consultar():
+        # La fila marcador (posición MARCADOR) indica que la lista existe
+        filas = (
+            db.session.query(modelo, RelatedProduct.posicion)
+            .join(RelatedProduct, RelatedProduct.related_id == modelo.id)
+            .filter(RelatedProduct.product_type == tipo, RelatedProduct.product_id == producto.id)
+            .order_by(RelatedProduct.posicion)
+            .limit(limite + 1)
+            .all()
+        )
+        if not filas:
+            return None
+        return [relacionado for relacionado, posicion in filas if posicion != MARCADOR][:limite]
+
+    try:
+        relacionados = consultar()
+        if relacionados is None:
+            _calcular_al_vuelo(tipo, producto)
+            db.session.commit()
+            relacionados = consultar() or []
+        return relacionados
+    except IntegrityError:
+        # Otra petición guardó la lista a la vez
+        db.session.rollback()
+        return consultar() or []
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logger.warning(f'⚠️  Relacionados no disponibles, se usa el mismo {config["grupo"]}: {e}')
+        grupo = getattr(modelo, config['grupo'])
+        return (
+            modelo.query
+            .filter(grupo == getattr(producto, config['grupo']), modelo.id != producto.id)
+            .limit(limite)
+            .all()
+        )
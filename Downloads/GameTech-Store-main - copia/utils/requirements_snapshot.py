@@ -0,0 +1,88 @@
+"""
+Instantánea inmutable de juegos con sus requisitos de sistema
+Se carga con una sola consulta (games JOIN game_requirements) y se reconstruye
+solo cuando cambia el sello de versión del catálogo.
+"""
+import threading
+from collections import namedtuple
+from functools import cached_property
+
+import numpy as np
+
+from extensions import db
+from models.database_models import Game, GameRequirements
+from utils.catalog_version import get_catalog_version
+
+CAMPOS_REQUISITOS = (
+    'min_cpu_score', 'min_gpu_score', 'min_ram_gb',
+    'rec_cpu_score', 'rec_gpu_score', 'rec_ram_gb',
+    'ultra_cpu_score', 'ultra_gpu_score', 'ultra_ram_gb'
+)
+
+# Fila de la instantánea; expone los mismos atributos que GameRequirements
+# que usa PerformanceCalculator, además de los datos del juego a mostrar
+GameRequirementRow = namedtuple(
+    'GameRequirementRow',
+    ('game_id', 'nombre', 'imagen', 'precio') + CAMPOS_REQUISITOS
+)
+
+
+class RequirementsSnapshot:
+    """Tabla en memoria de juegos con requisitos para una versión del catálogo"""
+
+    def __init__(self, version, filas):
+        self.version = version
+        self.filas = tuple(filas)
+
+    @cached_property
+    def arrays(self):
+        """Requisitos en formato struct-of-arrays (campo -> array de N juegos)"""
+        return {
+            campo: np.array([getattr(fila, campo) or 0 for fila in self.filas], dtype=np.float64)
+            for campo in CAMPOS_REQUISITOS
+        }
+
+    def __iter__(self):
+        return iter(self.filas)
+
+    def __len__(self):
+        return len(self.filas)
+
+
+_lock = threading.Lock()
+_actual = {'snapshot': None}
+
+
+def get_requirements_snapshot():
+    """Instantánea vigente (se reconstruye si cambió el catálogo)"""
+    version = get_catalog_version()
+    snapshot = _actual['snapshot']
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _lock:
+        snapshot = _actual['snapshot']
+        if snapshot is None or snapshot.version != version:
+            snapshot = RequirementsSnapshot(version, _cargar_filas())
+            _actual['snapshot'] = snapshot
+    return snapshot
+
+
+def _cargar_filas():
+    """Una sola consulta con los juegos y sus requisitos"""
+    columnas = [getattr(GameRequirements, campo) for campo in CAMPOS_REQUISITOS]
+    query = (
+        db.session.query(Game.id, Game.nombre, Game.imagen, Game.precio, *columnas)
+        .join(GameRequirements, GameRequirements.game_id == Game.id)
+        .order_by(Game.id, GameRequirements.id)
+    )
+
+    filas = []
+    ultimo_id = None
+    for row in query:
+        # Si un juego tiene varias filas de requisitos se usa la primera
+        if row[0] == ultimo_id:
+            continue
+        ultimo_id = row[0]
+        filas.append(GameRequirementRow(*row))
+    return filas
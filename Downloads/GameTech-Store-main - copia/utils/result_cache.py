@@ -0,0 +1,80 @@
+"""
+Caché en memoria acotada (LRU + TTL) para resultados calculados
+Cada caché se registra por nombre para poder consultar sus estadísticas
+"""
+import threading
+import time
+from collections import OrderedDict
+
+# Registro de cachés creadas en el proceso (nombre -> ResultCache)
+CACHES = {}
+
+_MISSING = object()
+
+
+class ResultCache:
+    """Caché LRU con expiración por tiempo y contadores de aciertos/fallos"""
+
+    def __init__(self, nombre, maxsize=256, ttl=300):
+        self.nombre = nombre
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        CACHES[nombre] = self
+
+    def get(self, key, default=None):
+        """Obtener un valor si existe y no ha expirado"""
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._datos.get(key, _MISSING)
+            if entrada is not _MISSING:
+                expira, valor = entrada
+                if expira > ahora:
+                    self._datos.move_to_end(key)
+                    self.hits += 1
+                    return valor
+                del self._datos[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, valor):
+        """Guardar un valor, descartando el menos usado si se supera maxsize"""
+        with self._lock:
+            self._datos[key] = (time.monotonic() + self.ttl, valor)
+            self._datos.move_to_end(key)
+            while len(self._datos) > self.maxsize:
+                self._datos.popitem(last=False)
+
+    def get_or_set(self, key, calcular):
+        """Obtener un valor o calcularlo con calcular() y guardarlo"""
+        valor = self.get(key, _MISSING)
+        if valor is _MISSING:
+            valor = calcular()
+            self.set(key, valor)
+        return valor
+
+    def clear(self):
+        """Vaciar la caché (los contadores se conservan)"""
+        with self._lock:
+            self._datos.clear()
+
+    def stats(self):
+        """Estadísticas para ajustar tamaño y TTL"""
+        total = self.hits + self.misses
+        return {
+            'nombre': self.nombre,
+            'entradas': len(self._datos),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0
+        }
+
+
+def get_cache_stats():
+    """Estadísticas de todas las cachés registradas"""
+    return [cache.stats() for cache in CACHES.values()]
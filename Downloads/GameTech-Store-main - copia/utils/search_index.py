@@ -0,0 +1,259 @@
+"""
+Índice de búsqueda de texto completo para juegos y hardware
+- SQLite: tablas FTS5 de contenido externo, sincronizadas con triggers y
+  ordenadas por BM25.
+- PostgreSQL: columna tsvector generada con índice GIN (ordenada con
+  ts_rank_cd) e índice de trigramas sobre el nombre para búsquedas aproximadas.
+Si el motor no está disponible se usa la búsqueda ILIKE original.
+"""
+import logging
+import re
+import threading
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+# Tabla -> columnas indexadas y su peso (de mayor a menor relevancia en PostgreSQL)
+INDICES = {
+    'games': {
+        'fts': 'games_fts',
+        'columnas': ('nombre', 'desarrollador', 'genero', 'descripcion'),
+        'pesos': (10.0, 3.0, 2.0, 1.0),
+        'trigramas': 'nombre'
+    },
+    'hardware': {
+        'fts': 'hardware_fts',
+        'columnas': ('modelo', 'marca', 'tipo', 'descripcion'),
+        'pesos': (10.0, 5.0, 2.0, 1.0),
+        'trigramas': 'modelo'
+    }
+}
+
+# Pesos de tsvector en el mismo orden que las columnas
+PESOS_TSVECTOR = ('A', 'B', 'C', 'D')
+
+_lock = threading.Lock()
+_estado = {
+    'comprobado': False,  # ya se intentó preparar el índice en este proceso
+    'motor': None,        # 'sqlite' | 'postgresql' | None (búsqueda ILIKE)
+    'trigramas': False    # pg_trgm disponible
+}
+
+
+def _tokens(consulta):
+    """Palabras de la consulta en minúsculas (sin operadores ni comillas)"""
+    return re.findall(r'\w+', (consulta or '').lower())
+
+
+# ----------------------------------------------------------------------
+# Creación del índice
+# ----------------------------------------------------------------------
+def crear_indice_busqueda(conn):
+    """
+    Crear (si no existen) las estructuras de búsqueda del motor actual.
+    Devuelve el nombre del motor o None si no es compatible.
+    """
+    dialecto = conn.dialect.name
+    if dialecto == 'sqlite':
+        for tabla, config in INDICES.items():
+            _crear_fts5(conn, tabla, config)
+        return 'sqlite'
+    if dialecto == 'postgresql':
+        for tabla, config in INDICES.items():
+            _crear_tsvector(conn, tabla, config)
+        return 'postgresql'
+    return None
+
+
+def _crear_fts5(conn, tabla, config):
+    fts = config['fts']
+    columnas = config['columnas']
+    existia = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :nombre"), {'nombre': fts}
+    ).first() is not None
+
+    lista = ', '.join(columnas)
+    nuevos = ', '.join(f'new.{c}' for c in columnas)
+    viejos = ', '.join(f'old.{c}' for c in columnas)
+    conn.execute(text(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {lista},
+            content='{tabla}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    """))
+    # Triggers: el índice se actualiza en la misma transacción que el producto
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {tabla} BEGIN
+            INSERT INTO {fts}(rowid, {lista}) VALUES (new.id, {nuevos});
+        END
+    """))
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {tabla} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {lista}) VALUES ('delete', old.id, {viejos});
+        END
+    """))
+    # Solo los cambios en columnas indexadas (no stock ni precio) reindexan la fila
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {lista} ON {tabla} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {lista}) VALUES ('delete', old.id, {viejos});
+            INSERT INTO {fts}(rowid, {lista}) VALUES (new.id, {nuevos});
+        END
+    """))
+    if not existia:
+        conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def _crear_tsvector(conn, tabla, config):
+    vector = ' || '.join(
+        f"setweight(to_tsvector('simple', coalesce({columna}, '')), '{peso}')"
+        for columna, peso in zip(config['columnas'], PESOS_TSVECTOR)
+    )
+    conn.execute(text(f"""
+        ALTER TABLE {tabla} ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS ({vector}) STORED
+    """))
+    conn.execute(text(
+        f'CREATE INDEX IF NOT EXISTS ix_{tabla}_search_vector ON {tabla} USING GIN (search_vector)'
+    ))
+    try:
+        with conn.begin_nested():
+            conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+            columna = config['trigramas']
+            conn.execute(text(
+                f'CREATE INDEX IF NOT EXISTS ix_{tabla}_{columna}_trgm ON {tabla} USING GIN ({columna} gin_trgm_ops)'
+            ))
+    except SQLAlchemyError as e:
+        # Sin permisos para la extensión: se busca solo con tsvector
+        logger.warning(f'⚠️  pg_trgm no disponible para {tabla}: {e}')
+
+
+def _preparar():
+    """Detectar o crear el índice la primera vez que se busca en este proceso"""
+    if _estado['comprobado']:
+        return _estado['motor']
+
+    with _lock:
+        if _estado['comprobado']:
+            return _estado['motor']
+        try:
+            tablas = set(inspect(db.engine).get_table_names())
+            if not set(INDICES) <= tablas:
+                # La base de datos aún no está creada: se vuelve a intentar más tarde
+                return None
+
+            dialecto = db.engine.dialect.name
+            if dialecto == 'sqlite':
+                with db.engine.begin() as conn:
+                    _estado['motor'] = crear_indice_busqueda(conn)
+            elif dialecto == 'postgresql':
+                # En PostgreSQL la columna generada la crea la migración (reescribe la tabla)
+                columnas = {c['name'] for c in inspect(db.engine).get_columns('games')}
+                if 'search_vector' in columnas:
+                    _estado['motor'] = 'postgresql'
+                    indices = {i['name'] for i in inspect(db.engine).get_indexes('games')}
+                    _estado['trigramas'] = 'ix_games_nombre_trgm' in indices
+                else:
+                    logger.warning('⚠️  Sin columna search_vector: ejecuta migrations/add_search_index.py')
+        except SQLAlchemyError as e:
+            logger.warning(f'⚠️  Índice de búsqueda no disponible, se usa ILIKE: {e}')
+            _estado['motor'] = None
+        _estado['comprobado'] = True
+        return _estado['motor']
+
+
+# ----------------------------------------------------------------------
+# Consultas
+# ----------------------------------------------------------------------
+def buscar_ids(tabla, consulta, limite=50):
+    """
+    Ids de `tabla` ('games' o 'hardware') que coinciden con la consulta,
+    ordenados por relevancia. Devuelve None si no hay índice disponible
+    (el llamador debe usar su búsqueda alternativa).
+    """
+    motor = _preparar()
+    if motor is None:
+        return None
+
+    tokens = _tokens(consulta)
+    if not tokens:
+        return []
+
+    config = INDICES[tabla]
+    try:
+        if motor == 'sqlite':
+            return _buscar_fts5(config, tokens, limite)
+        return _buscar_tsvector(tabla, config, tokens, limite)
+    except SQLAlchemyError as e:
+        logger.warning(f'Búsqueda en {tabla} falló, se usa ILIKE: {e}')
+        db.session.rollback()
+        return None
+
+
+def _buscar_fts5(config, tokens, limite):
+    fts = config['fts']
+    # Todas las palabras (AND); la última como prefijo: "rtx 406" encuentra "RTX 4060"
+    expresion = ' '.join([f'"{token}"' for token in tokens[:-1]] + [f'"{tokens[-1]}"*'])
+    pesos = ', '.join(str(peso) for peso in config['pesos'])
+    # rank con los pesos de las columnas: FTS5 ordena por BM25 todas las
+    # coincidencias y con LIMIT solo conserva las `limite` mejores
+    sql = f"""
+        SELECT rowid FROM {fts}
+        WHERE {fts} MATCH :expresion AND rank MATCH 'bm25({pesos})'
+        ORDER BY rank, rowid
+    """
+    if not limite:
+        return [fila[0] for fila in db.session.execute(text(sql), {'expresion': expresion})]
+
+    sql += ' LIMIT :limite'
+    # Primero las coincidencias en la columna principal (nombre / modelo)
+    principal = '{' + config['columnas'][0] + '}: ' + expresion
+    ids = []
+    for consulta in (principal, expresion):
+        ids = [fila[0] for fila in db.session.execute(text(sql), {'expresion': consulta, 'limite': limite})]
+        if len(ids) >= limite:
+            break
+    return ids
+
+
+def _buscar_tsvector(tabla, config, tokens, limite):
+    expresion = ' & '.join(f'{token}:*' for token in tokens)
+    # El índice GIN da las coincidencias; se ordenan todas por relevancia y
+    # con LIMIT el sort de PostgreSQL solo conserva las mejores (top-N heapsort)
+    sql = f"""
+        SELECT id FROM {tabla}
+        WHERE search_vector @@ to_tsquery('simple', :expresion)
+        ORDER BY ts_rank_cd(search_vector, to_tsquery('simple', :expresion)) DESC, id
+    """
+    parametros = {'expresion': expresion}
+    if limite:
+        sql += ' LIMIT :limite'
+        parametros['limite'] = limite
+    ids = [fila[0] for fila in db.session.execute(text(sql), parametros)]
+
+    if not ids and _estado['trigramas']:
+        # Sin coincidencias exactas: nombres parecidos (errores de escritura)
+        columna = config['trigramas']
+        sql = f"""
+            SELECT id FROM {tabla}
+            WHERE {columna} % :consulta
+            ORDER BY similarity({columna}, :consulta) DESC, id
+        """
+        parametros = {'consulta': ' '.join(tokens)}
+        if limite:
+            sql += ' LIMIT :limite'
+            parametros['limite'] = limite
+        ids = [fila[0] for fila in db.session.execute(text(sql), parametros)]
+    return ids
+
+
+def cargar_en_orden(modelo, ids):
+    """Cargar instancias de `modelo` conservando el orden de relevancia de `ids`"""
+    if not ids:
+        return []
+    por_id = {obj.id: obj for obj in modelo.query.filter(modelo.id.in_(ids)).all()}
+    return [por_id[i] for i in ids if i in por_id]
@@ -0,0 +1,156 @@
+"""
+Índice de prefijos en memoria para el autocompletado (/api/suggest)
+Los nombres de juegos y los textos "marca modelo" del hardware se normalizan
+y se guardan en un array ordenado; cada palabra del nombre es también punto
+de entrada ("4060" encuentra "NVIDIA RTX 4060"). Las respuestas se resuelven
+con bisect sobre el array, sin consultar la base de datos, y se ordenan por
+popularidad (unidades vendidas).
+"""
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import namedtuple
+
+from flask import url_for
+from sqlalchemy import func
+
+from extensions import db
+from models.database_models import Game, Hardware, OrderItem
+from utils.catalog_version import get_catalog_version
+
+# Prefijos cortos con la respuesta precalculada (cubren los rangos más grandes)
+LONGITUD_PRECALCULADA = 2
+# Prefijos más largos cuya respuesta se memoriza si su rango supera este tamaño
+RANGO_MEMORIZADO = 256
+MAX_SUGERENCIAS = 10
+
+# Segundos tras los que se recalcula la popularidad aunque el catálogo no cambie
+POPULARIDAD_TTL = 600
+
+Sugerencia = namedtuple('Sugerencia', ['tipo', 'id', 'label', 'url', 'popularidad'])
+
+
+def normalizar(texto):
+    """Minúsculas, sin acentos y solo letras/dígitos separados por un espacio"""
+    texto = unicodedata.normalize('NFKD', texto or '')
+    texto = ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+    return ' '.join(re.findall(r'\w+', texto))
+
+
+class SuggestIndex:
+    """Array ordenado de claves normalizadas -> productos"""
+
+    def __init__(self, version, productos):
+        """
+        Args:
+            version: sello del catálogo con el que se construyó
+            productos: lista de Sugerencia
+        """
+        self.version = version
+        self.creado = time.monotonic()
+        # Ordenados por popularidad: la posición de un producto es su ranking
+        self.productos = sorted(productos, key=lambda p: (-p.popularidad, p.label))
+
+        entradas = []
+        for posicion, producto in enumerate(self.productos):
+            palabras = normalizar(producto.label).split()
+            # Una clave por palabra inicial: "nvidia rtx 4060", "rtx 4060", "4060"
+            for inicio in range(len(palabras)):
+                entradas.append((' '.join(palabras[inicio:]), posicion))
+        entradas.sort()
+        self.claves = [clave for clave, _ in entradas]
+        self.posiciones = [posicion for _, posicion in entradas]
+
+        self._memoria = self._precalcular()
+
+    def _precalcular(self):
+        """Respuesta de cada prefijo de hasta LONGITUD_PRECALCULADA caracteres"""
+        prefijos = {
+            clave[:longitud]
+            for clave in self.claves
+            for longitud in range(1, min(LONGITUD_PRECALCULADA, len(clave)) + 1)
+        }
+        return {prefijo: self._buscar_rango(prefijo)[0] for prefijo in prefijos}
+
+    def _buscar_rango(self, prefijo, limite=MAX_SUGERENCIAS):
+        """
+        Mejores posiciones entre las claves que empiezan por el prefijo (las
+        claves con un mismo prefijo son contiguas en el array ordenado).
+        Devuelve también el tamaño del rango.
+        """
+        inicio = bisect_left(self.claves, prefijo)
+        fin = bisect_left(self.claves, prefijo + '\uffff', inicio)
+        return heapq.nsmallest(limite, set(self.posiciones[inicio:fin])), fin - inicio
+
+    def sugerir(self, consulta, limite=MAX_SUGERENCIAS):
+        """Productos cuyo nombre (o alguna palabra) empieza por la consulta"""
+        prefijo = normalizar(consulta)
+        if not prefijo:
+            return []
+
+        posiciones = self._memoria.get(prefijo)
+        if posiciones is None:
+            if len(prefijo) <= LONGITUD_PRECALCULADA:
+                return []
+            posiciones, tamano = self._buscar_rango(prefijo)
+            if tamano > RANGO_MEMORIZADO:
+                # Prefijo muy común: la próxima vez se responde sin recorrer el rango
+                self._memoria[prefijo] = posiciones
+        return [self.productos[p] for p in posiciones[:limite]]
+
+
+_lock = threading.Lock()
+_actual = {'indice': None}
+
+
+def get_suggest_index():
+    """
+    Índice vigente. Se reconstruye si cambió el catálogo o caducó la
+    popularidad; mientras un hilo lo reconstruye, el resto sigue usando el
+    anterior.
+    """
+    version = get_catalog_version()
+    indice = _actual['indice']
+    vigente = (
+        indice is not None and indice.version == version and
+        time.monotonic() - indice.creado < POPULARIDAD_TTL
+    )
+    if vigente:
+        return indice
+
+    if not _lock.acquire(blocking=indice is None):
+        return indice
+    try:
+        if _actual['indice'] is indice:
+            _actual['indice'] = SuggestIndex(version, _cargar_productos())
+        return _actual['indice']
+    finally:
+        _lock.release()
+
+
+def _cargar_productos():
+    """Juegos y hardware con sus unidades vendidas (tres consultas)"""
+    vendidos = dict(
+        ((tipo, producto_id), unidades)
+        for tipo, producto_id, unidades in db.session.query(
+            OrderItem.product_type, OrderItem.product_id, func.sum(OrderItem.quantity)
+        ).group_by(OrderItem.product_type, OrderItem.product_id)
+    )
+
+    productos = []
+    for game_id, nombre in db.session.query(Game.id, Game.nombre):
+        productos.append(Sugerencia(
+            'game', game_id, nombre,
+            url_for('store.juego_detalle', juego_id=game_id),
+            int(vendidos.get(('game', game_id), 0))
+        ))
+    for hardware_id, marca, modelo in db.session.query(Hardware.id, Hardware.marca, Hardware.modelo):
+        productos.append(Sugerencia(
+            'hardware', hardware_id, f'{marca} {modelo}',
+            url_for('store.hardware_detalle', hardware_id=hardware_id),
+            int(vendidos.get(('hardware', hardware_id), 0))
+        ))
+    return productos
@@ -0,0 +1,213 @@
+"""
+Planificador de mejoras para un build existente
+Busca el cambio de uno o dos componentes más barato que sube más juegos al
+siguiente nivel de calidad de PerformanceCalculator. Cada candidato solo
+reevalúa su propia columna (su score se propaga contra los requisitos de
+todos los juegos), sin repetir el análisis completo.
+"""
+from itertools import combinations
+
+import numpy as np
+
+from utils.build_optimizer import BuildOptimizer
+from utils.performance_calculator import PerformanceCalculator, QUALITY_LEVELS, QUALITY_ULTRA
+from utils.requirements_snapshot import get_requirements_snapshot
+
+COMPONENTES = ('cpu', 'gpu', 'ram')
+TIPOS = {'cpu': 'CPU', 'gpu': 'GPU', 'ram': 'RAM'}
+
+MAX_OPCIONES = 20
+
+
+class _Candidatos:
+    """Piezas que mejoran un componente: scores, costes y piezas alineados"""
+
+    def __init__(self, componente, piezas, extras=None):
+        self.componente = componente
+        self.piezas = piezas
+        self.extras = extras or [None] * len(piezas)
+        self.scores = np.array([p.score for p in piezas], dtype=np.float64)
+        self.costes = np.array(
+            [p.precio + (extra.precio if extra else 0) for p, extra in zip(piezas, self.extras)],
+            dtype=np.float64
+        )
+
+    def __len__(self):
+        return len(self.piezas)
+
+
+class UpgradePlanner:
+    """Recomienda mejoras concretas del catálogo para un build"""
+
+    @staticmethod
+    def plan(cpu, gpu, ram, game_ids=None, limite=5):
+        """
+        Mejores cambios de uno o dos componentes
+
+        Args:
+            cpu, gpu, ram: Hardware del build actual
+            game_ids: juegos a considerar (por defecto, todos con requisitos)
+            limite: número de opciones a devolver
+
+        Returns:
+            dict con los juegos considerados y las opciones ordenadas por
+            juegos mejorados (desc), coste (asc) y número de piezas (asc)
+        """
+        snapshot = get_requirements_snapshot()
+        filas, reqs = UpgradePlanner._requisitos(snapshot, game_ids)
+        actual = PerformanceCalculator.component_scores(cpu, gpu, ram)
+
+        calidad = PerformanceCalculator.calculate_batch_scores(*actual, reqs)['quality_code']
+        # Los juegos que ya corren en ultra no pueden subir de nivel
+        mejorables = calidad < QUALITY_ULTRA
+        filas = [fila for fila, m in zip(filas, mejorables.tolist()) if m]
+        reqs = {campo: valores[mejorables] for campo, valores in reqs.items()}
+        calidad = calidad[mejorables]
+
+        resultado = {'juegos_considerados': len(mejorables), 'juegos_mejorables': len(filas), 'opciones': []}
+        if not filas:
+            return resultado
+
+        candidatos = UpgradePlanner._candidatos(cpu, gpu, ram, actual)
+        opciones = []
+        for cambio in [(c,) for c in range(3)] + list(combinations(range(3), 2)):
+            if all(len(candidatos[i]) for i in cambio):
+                opciones.extend(UpgradePlanner._evaluar(cambio, candidatos, actual, reqs, calidad, limite))
+
+        opciones.sort(key=lambda o: (-o[0], o[1], len(o[2])))
+        for mejorados, coste, eleccion in opciones[:limite]:
+            resultado['opciones'].append(
+                UpgradePlanner._detalle(eleccion, candidatos, actual, coste, filas, reqs, calidad)
+            )
+        return resultado
+
+    @staticmethod
+    def _requisitos(snapshot, game_ids):
+        """Filas y arrays de requisitos, filtrados a los juegos pedidos"""
+        if not game_ids:
+            return list(snapshot.filas), snapshot.arrays
+        ids = np.array([fila.game_id for fila in snapshot.filas], dtype=np.int64)
+        seleccion = np.isin(ids, np.asarray(list(game_ids), dtype=np.int64))
+        filas = [fila for fila, s in zip(snapshot.filas, seleccion.tolist()) if s]
+        return filas, {campo: valores[seleccion] for campo, valores in snapshot.arrays.items()}
+
+    @staticmethod
+    def _candidatos(cpu, gpu, ram, actual):
+        """
+        Piezas con mejor score que la actual y en la frontera precio/score
+        (una pieza más cara y no mejor que otra nunca sube más juegos). Una
+        CPU de otro socket incluye en su coste la placa más barata compatible.
+        """
+        piezas = BuildOptimizer.cargar_piezas()
+        actuales = (cpu, gpu, ram)
+        socket_actual = next((p.socket for p in piezas['CPU'] if p.id == cpu.id), None)
+
+        placas = {}
+        for placa in piezas['Motherboard']:
+            if placa.socket and (placa.socket not in placas or placa.precio < placas[placa.socket].precio):
+                placas[placa.socket] = placa
+
+        candidatos = []
+        for i, componente in enumerate(COMPONENTES):
+            mejores = [
+                p for p in piezas[TIPOS[componente]]
+                if p.score > actual[i] and p.id != actuales[i].id
+            ]
+            extras = [None] * len(mejores)
+            if componente == 'cpu':
+                seleccion = []
+                for p in mejores:
+                    if not (p.socket and socket_actual) or p.socket == socket_actual:
+                        seleccion.append((p, None))
+                    elif p.socket in placas:
+                        seleccion.append((p, placas[p.socket]))
+                mejores = [p for p, _ in seleccion]
+                extras = [placa for _, placa in seleccion]
+            candidatos.append(UpgradePlanner._frontera(_Candidatos(componente, mejores, extras)))
+        return candidatos
+
+    @staticmethod
+    def _frontera(candidatos):
+        """Quedarse con los candidatos estrictamente mejores que todos los más baratos"""
+        if not len(candidatos):
+            return candidatos
+        orden = np.lexsort((-candidatos.scores, candidatos.costes))
+        scores = candidatos.scores[orden]
+        previo = np.maximum.accumulate(np.concatenate(([-np.inf], scores[:-1])))
+        orden = orden[scores > previo].tolist()
+        return _Candidatos(
+            candidatos.componente,
+            [candidatos.piezas[k] for k in orden],
+            [candidatos.extras[k] for k in orden]
+        )
+
+    @staticmethod
+    def _evaluar(cambio, candidatos, actual, reqs, calidad, limite):
+        """
+        Juegos que suben de nivel para todas las combinaciones de un cambio.
+        Cada componente cambiado aporta un eje; el resto queda como escalar.
+        """
+        ejes = len(cambio)
+        scores = list(actual)
+        costes = 0
+        for eje, i in enumerate(cambio):
+            forma = [1] * (ejes + 1)
+            forma[eje] = -1
+            scores[i] = candidatos[i].scores.reshape(forma)
+            costes = costes + candidatos[i].costes.reshape(forma[:-1])
+
+        nueva = PerformanceCalculator.calculate_batch_scores(*scores, reqs)['quality_code']
+        mejorados = (nueva > calidad).sum(axis=-1)
+        costes = np.broadcast_to(costes, mejorados.shape)
+
+        # Solo las mejores `limite` combinaciones de este cambio pasan al ranking
+        orden = np.lexsort((costes.ravel(), -mejorados.ravel()))[:limite]
+        opciones = []
+        for plano in orden.tolist():
+            indices = np.unravel_index(plano, mejorados.shape)
+            if mejorados[indices] > 0:
+                eleccion = tuple(zip(cambio, (int(k) for k in indices)))
+                opciones.append((int(mejorados[indices]), float(costes[indices]), eleccion))
+        return opciones
+
+    @staticmethod
+    def _detalle(eleccion, candidatos, actual, coste, filas, reqs, calidad):
+        """Piezas de una opción y los juegos que suben de nivel con ella"""
+        scores = list(actual)
+        piezas = []
+        for i, k in eleccion:
+            pieza = candidatos[i].piezas[k]
+            scores[i] = pieza.score
+            piezas.append(UpgradePlanner._pieza_data(COMPONENTES[i], pieza))
+            extra = candidatos[i].extras[k]
+            if extra is not None:
+                piezas.append(UpgradePlanner._pieza_data('motherboard', extra))
+
+        nueva = PerformanceCalculator.calculate_batch_scores(*scores, reqs)['quality_code']
+        juegos = [
+            {
+                'id': fila.game_id,
+                'nombre': fila.nombre,
+                'calidad_actual': QUALITY_LEVELS[antes],
+                'calidad_nueva': QUALITY_LEVELS[despues]
+            }
+            for fila, antes, despues in zip(filas, calidad.tolist(), nueva.tolist())
+            if despues > antes
+        ]
+        return {
+            'componentes': piezas,
+            'coste': round(coste, 2),
+            'juegos_mejorados': len(juegos),
+            'juegos': juegos
+        }
+
+    @staticmethod
+    def _pieza_data(componente, pieza):
+        return {
+            'componente': componente,
+            'id': pieza.id,
+            'marca': pieza.marca,
+            'modelo': pieza.modelo,
+            'precio': pieza.precio,
+            'score': pieza.score
+        }